@@ -2,7 +2,12 @@
 
 from __future__ import annotations
 
-from typing import Any
+import json
+import platform
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable
 
 import httpx
 import pytest
@@ -76,7 +81,13 @@ SAMPLE_PROGRAM_RAW: dict[str, Any] = {
 }
 
 
-def make_search_response(items: list[dict[str, Any]] | None = None, *, total: int | None = None, size: int = 20, page: int = 0) -> dict[str, Any]:
+def make_search_response(
+    items: list[dict[str, Any]] | None = None,
+    *,
+    total: int | None = None,
+    size: int = 20,
+    page: int = 0,
+) -> dict[str, Any]:
     items = items if items is not None else [SAMPLE_PROGRAM_RAW]
     total = total if total is not None else len(items)
     total_pages = max(1, (total + size - 1) // size) if size else 1
@@ -125,38 +136,109 @@ def _mock_handler(request: httpx.Request) -> httpx.Response:
     if path == "/api/tercih-kilavuz/universite-iller":
         return httpx.Response(200, json=SAMPLE_CITIES)
     if path == "/api/tercih-kilavuz/search":
-        import json as _json
         body = request.content
         try:
-            payload = _json.loads(body) if body else {}
+            payload = json.loads(body) if body else {}
         except Exception:
             payload = {}
         filters = payload.get("filters") or {}
         kilavuz = filters.get("kilavuzKodu")
         if kilavuz:
             if int(kilavuz) == SAMPLE_PROGRAM_RAW["kilavuzKodu"]:
-                return httpx.Response(200, json=make_search_response([SAMPLE_PROGRAM_RAW], total=1, size=payload.get("size", 20)))
-            return httpx.Response(200, json=make_search_response([], total=0, size=payload.get("size", 20)))
-        return httpx.Response(200, json=make_search_response(size=payload.get("size", 20), page=payload.get("page", 0)))
+                return httpx.Response(
+                    200,
+                    json=make_search_response(
+                        [SAMPLE_PROGRAM_RAW], total=1, size=payload.get("size", 20)
+                    ),
+                )
+            return httpx.Response(
+                200, json=make_search_response([], total=0, size=payload.get("size", 20))
+            )
+        return httpx.Response(
+            200,
+            json=make_search_response(size=payload.get("size", 20), page=payload.get("page", 0)),
+        )
     return httpx.Response(404, json={"error": "not found", "path": path})
 
 
+def make_paged_handler(total: int, *, calls: list[dict[str, Any]] | None = None):
+    """Search handler serving ``total`` synthetic programs with distinct kılavuz kodları."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path != "/api/tercih-kilavuz/search":
+            return _mock_handler(request)
+        payload = json.loads(request.content)
+        if calls is not None:
+            calls.append(payload)
+        page, size = payload["page"], payload["size"]
+        start = page * size
+        items = [
+            {**SAMPLE_PROGRAM_RAW, "kilavuzKodu": 100000000 + i, "basariSirasi": i + 1}
+            for i in range(start, min(start + size, total))
+        ]
+        return httpx.Response(
+            200, json=make_search_response(items, total=total, size=size, page=page)
+        )
+
+    return handler
+
+
+def make_http_client(
+    settings: Settings, handler: Callable[[httpx.Request], Any] = _mock_handler, **kwargs: Any
+) -> HttpClient:
+    """``HttpClient`` over an ``httpx.MockTransport`` serving ``handler``."""
+    inner = httpx.Client(base_url=str(settings.base_url), transport=httpx.MockTransport(handler))
+    return HttpClient(settings=settings, client=inner, **kwargs)
+
+
+def make_async_http_client(
+    settings: Settings, handler: Callable[[httpx.Request], Any] = _mock_handler, **kwargs: Any
+) -> AsyncHttpClient:
+    """``AsyncHttpClient`` over an ``httpx.MockTransport`` serving ``handler`` (sync or async)."""
+    inner = httpx.AsyncClient(
+        base_url=str(settings.base_url), transport=httpx.MockTransport(handler)
+    )
+    return AsyncHttpClient(settings=settings, client=inner, **kwargs)
+
+
+def make_client(
+    settings: Settings, handler: Callable[[httpx.Request], Any] = _mock_handler, **kwargs: Any
+) -> YokAtlasClient:
+    """``YokAtlasClient`` whose requests are served by ``handler``; ``kwargs`` go to the HttpClient."""
+    return YokAtlasClient(settings=settings, http=make_http_client(settings, handler, **kwargs))
+
+
+def make_async_client(
+    settings: Settings, handler: Callable[[httpx.Request], Any] = _mock_handler, **kwargs: Any
+) -> AsyncYokAtlasClient:
+    """Async counterpart of :func:`make_client`."""
+    return AsyncYokAtlasClient(
+        settings=settings, http=make_async_http_client(settings, handler, **kwargs)
+    )
+
+
 @pytest.fixture()
 def settings() -> Settings:
-    return Settings(base_url="https://yokatlas.example.test", timeout=5.0, verify_ssl=False, lookup_cache_ttl=60)
+    return Settings(
+        base_url="https://yokatlas.example.test", timeout=5.0, verify_ssl=False, lookup_cache_ttl=60
+    )
 
 
 @pytest.fixture()
 def http_client(settings: Settings) -> HttpClient:
     transport = httpx.MockTransport(_mock_handler)
-    inner = httpx.Client(base_url=str(settings.base_url).rstrip("/"), transport=transport, headers=settings.headers())
+    inner = httpx.Client(
+        base_url=str(settings.base_url).rstrip("/"), transport=transport, headers=settings.headers()
+    )
     return HttpClient(settings=settings, client=inner)
 
 
 @pytest.fixture()
 def async_http_client(settings: Settings) -> AsyncHttpClient:
     transport = httpx.MockTransport(_mock_handler)
-    inner = httpx.AsyncClient(base_url=str(settings.base_url).rstrip("/"), transport=transport, headers=settings.headers())
+    inner = httpx.AsyncClient(
+        base_url=str(settings.base_url).rstrip("/"), transport=transport, headers=settings.headers()
+    )
     return AsyncHttpClient(settings=settings, client=inner)
 
 
@@ -168,3 +250,98 @@ def client(settings: Settings, http_client: HttpClient) -> YokAtlasClient:
 @pytest.fixture()
 def async_client(settings: Settings, async_http_client: AsyncHttpClient) -> AsyncYokAtlasClient:
     return AsyncYokAtlasClient(settings=settings, http=async_http_client)
+
+
+# ---------------------------------------------------------------------------
+# Benchmark baselines
+# ---------------------------------------------------------------------------
+
+BENCHMARK_BASELINE = Path(__file__).with_name("benchmark_baseline.json")
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup("benchmark", "yokatlas-py offline benchmarks")
+    group.addoption(
+        "--benchmark-save",
+        metavar="PATH",
+        help="Write the numbers recorded by benchmark tests to PATH (JSON).",
+    )
+    group.addoption(
+        "--benchmark-compare",
+        metavar="PATH",
+        nargs="?",
+        const=str(BENCHMARK_BASELINE),
+        help="Fail benchmarks that regressed against the baseline in PATH (default: tests/benchmark_baseline.json).",
+    )
+    group.addoption(
+        "--benchmark-threshold",
+        type=float,
+        default=0.25,
+        help="Allowed relative regression before a compared benchmark fails (default 0.25 = 25%%).",
+    )
+
+
+class BenchmarkRecorder:
+    """Collects benchmark numbers and checks them against a stored baseline.
+
+    Baselines are machine-specific: save one on the machine that will run the
+    comparison (e.g. before and after upgrading this library).
+    """
+
+    def __init__(self, baseline: dict[str, Any] | None, threshold: float) -> None:
+        self.baseline = (baseline or {}).get("results", {})
+        self.threshold = threshold
+        self.results: dict[str, dict[str, Any]] = {}
+
+    def record(self, name: str, value: float, *, unit: str, higher_is_better: bool) -> None:
+        self.results[name] = {
+            "value": round(value, 4),
+            "unit": unit,
+            "higher_is_better": higher_is_better,
+        }
+        base = self.baseline.get(name)
+        if base is None or not base["value"]:
+            return
+        change = (value - base["value"]) / base["value"]
+        regression = -change if higher_is_better else change
+        if regression > self.threshold:
+            pytest.fail(
+                f"benchmark {name} regressed {regression:.0%}: {value:,.4g} {unit} vs baseline "
+                f"{base['value']:,.4g} {unit} (threshold {self.threshold:.0%})"
+            )
+
+    def dump(self, path: Path) -> None:
+        meta = {
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        }
+        path.write_text(
+            json.dumps({"meta": meta, "results": dict(sorted(self.results.items()))}, indent=2)
+            + "\n"
+        )
+
+
+_recorder_key = pytest.StashKey[BenchmarkRecorder]()
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    compare = config.getoption("--benchmark-compare")
+    baseline = json.loads(Path(compare).read_text()) if compare else None
+    config.stash[_recorder_key] = BenchmarkRecorder(
+        baseline, config.getoption("--benchmark-threshold")
+    )
+
+
+def pytest_sessionfinish(session: pytest.Session) -> None:
+    target = session.config.getoption("--benchmark-save")
+    recorder = session.config.stash.get(_recorder_key, None)
+    if target and recorder is not None and recorder.results:
+        recorder.dump(Path(target))
+
+
+@pytest.fixture()
+def bench(request: pytest.FixtureRequest) -> BenchmarkRecorder:
+    """Record a benchmark number: ``bench.record(name, value, unit=..., higher_is_better=...)``."""
+    return request.config.stash[_recorder_key]
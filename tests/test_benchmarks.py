@@ -0,0 +1,535 @@
+"""Offline performance benchmarks (``pytest -m benchmark -s`` prints the numbers).
+
+Every benchmark also records its headline number through the ``bench``
+fixture. To check an upgrade for regressions on one machine::
+
+    pytest -m benchmark --benchmark-save before.json   # current version
+    pytest -m benchmark --benchmark-compare before.json  # after upgrading
+
+``--benchmark-compare`` without a path uses ``tests/benchmark_baseline.json``
+(reference numbers from the maintainers' machine); ``--benchmark-threshold``
+sets the allowed regression (default 25%).
+"""
+
+from __future__ import annotations
+
+import random
+import time
+from difflib import get_close_matches
+from typing import Any, Callable
+
+import pytest
+
+from yokatlas_py._lookup import LookupCache, normalize
+from yokatlas_py.exceptions import LookupError
+from yokatlas_py.models import (
+    _FLAT_TO_YEARLY,
+    _YEARLY_FIELD_TYPES,
+    Program,
+    SearchPage,
+    YearlyStats,
+    parse_search_page,
+)
+
+from .conftest import SAMPLE_PROGRAM_RAW, BenchmarkRecorder, make_search_response
+
+pytestmark = pytest.mark.benchmark
+
+_SYLLABLES = [
+    "ka",
+    "ra",
+    "de",
+    "niz",
+    "ta",
+    "şe",
+    "hir",
+    "ba",
+    "ğa",
+    "zi",
+    "çi",
+    "ye",
+    "dı",
+    "te",
+    "pe",
+    "gö",
+    "ü",
+    "sel",
+    "mar",
+    "ma",
+]
+_PROGRAM_WORDS = [
+    "Mühendisliği",
+    "Öğretmenliği",
+    "Bilimleri",
+    "Yönetimi",
+    "Tasarımı",
+    "Sistemleri",
+    "Teknolojisi",
+    "Programı",
+]
+
+
+def _word(rng: random.Random, n: int) -> str:
+    return "".join(rng.choice(_SYLLABLES) for _ in range(n)).capitalize()
+
+
+def synthetic_lookups(
+    *, universities: int = 200, programs: int = 1200, seed: int = 7
+) -> dict[str, list[dict[str, Any]]]:
+    """Deterministic lookup tables roughly the size of the real ones."""
+    rng = random.Random(seed)
+    unis = {
+        f"{_word(rng, 3)} {_word(rng, 2)} ÜNİVERSİTESİ".upper() for _ in range(universities * 2)
+    }
+    progs = {
+        f"{_word(rng, 3)} {_word(rng, 2)} {rng.choice(_PROGRAM_WORDS)}" for _ in range(programs * 2)
+    }
+    return {
+        "universities": [
+            {"universiteId": i, "universiteAdi": n}
+            for i, n in enumerate(sorted(unis)[:universities])
+        ],
+        "program_groups": [
+            {"birimGrupId": i, "birimGrupAdi": n, "puanTuru": "SAY"}
+            for i, n in enumerate(sorted(progs)[:programs])
+        ],
+        "cities": [{"ilKodu": i, "ilAdi": _word(rng, 3).upper()} for i in range(1, 82)],
+    }
+
+
+def _typo(rng: random.Random, text: str) -> str:
+    chars = list(text)
+    for _ in range(2):
+        i = rng.randrange(len(chars))
+        chars[i] = rng.choice("aeıioöuü")
+    return "".join(chars)
+
+
+def _linear_resolve(name: str, index: dict[str, object], cutoff: float = 0.6) -> object:
+    """The pre-index resolver: linear substring scan plus full-list difflib."""
+    key = normalize(name)
+    if key in index:
+        return index[key]
+    for k, v in index.items():
+        if key in k or k in key:
+            return v
+    keys = list(index.keys())
+    matches = get_close_matches(key, keys, n=5, cutoff=cutoff)
+    if matches:
+        return index[matches[0]]
+    get_close_matches(key, keys, n=3, cutoff=0.4)
+    raise LookupError(name, kind="program")
+
+
+def _best_seconds(fn: Callable[[], Any], *, repeat: int = 5) -> float:
+    """Fastest of ``repeat`` timed runs of ``fn``, so one noisy pass does not decide the number."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _per_call_us(fn: Callable[[str], object], names: list[str]) -> float:
+    def run() -> None:
+        for name in names:
+            try:
+                fn(name)
+            except LookupError:
+                pass
+
+    return _best_seconds(run, repeat=3) / len(names) * 1e6
+
+
+def test_bench_resolve_latency_indexed_vs_linear(bench: BenchmarkRecorder) -> None:
+    data = synthetic_lookups()
+    cache = LookupCache(ttl=0)
+    cache.populate(**data)
+    rng = random.Random(11)
+    names = [p["birimGrupAdi"] for p in data["program_groups"]]
+    queries = [_typo(rng, rng.choice(names)) for _ in range(40)] + ["zzzz qqqq"] * 10
+
+    before = _per_call_us(
+        lambda n: _linear_resolve(n, cache._snapshot.tables["program"][0]), queries
+    )
+    after = _per_call_us(cache.resolve_program, queries)
+    print(
+        f"\nresolve_program: linear {before:.1f} µs/call, trigram index {after:.1f} µs/call ({before / after:.1f}x)"
+    )
+    bench.record("lookup.resolve_program_fuzzy", after, unit="µs/call", higher_is_better=False)
+    bench.record(
+        "lookup.resolve_program_fuzzy_speedup", before / after, unit="x", higher_is_better=True
+    )
+
+
+def synthetic_page(rows: int = 1000, *, seed: int = 5) -> dict[str, Any]:
+    """A size=``rows`` search response with varied codes, ranks and scores."""
+    rng = random.Random(seed)
+    items = [
+        {
+            **SAMPLE_PROGRAM_RAW,
+            "kilavuzKodu": 100000000 + i,
+            "basariSirasi": rng.randint(1, 2_000_000),
+            "minPuan": round(rng.uniform(150, 560), 5),
+            "kontenjan": rng.randint(5, 200),
+        }
+        for i in range(rows)
+    ]
+    return make_search_response(items, total=rows, size=rows)
+
+
+def _rows_per_sec(fn: Callable[[], Any], rows: int, *, repeat: int = 3) -> float:
+    return rows / _best_seconds(fn, repeat=repeat)
+
+
+def _legacy_build_yearly_stats(data: dict[str, Any], suffix: str, year: int) -> YearlyStats:
+    """The pre-key-table builder: f-string keys and full validation per year."""
+    raw: dict[str, Any] = {"year": year}
+    for camel, snake in _FLAT_TO_YEARLY.items():
+        key_camel = f"{camel}{suffix}"
+        key_snake = f"{snake}{('_' + suffix) if suffix else ''}"
+        if key_camel in data:
+            raw[snake] = _YEARLY_FIELD_TYPES[snake](data[key_camel])
+        elif key_snake in data:
+            raw[snake] = _YEARLY_FIELD_TYPES[snake](data[key_snake])
+    return YearlyStats.model_validate(raw)
+
+
+def test_bench_search_page_parsing_rows_per_sec(
+    monkeypatch: pytest.MonkeyPatch, bench: BenchmarkRecorder
+) -> None:
+    import yokatlas_py.models as models
+
+    raw = synthetic_page(1000)
+    current = _rows_per_sec(lambda: parse_search_page(raw), 1000)
+    lazy = _rows_per_sec(lambda: parse_search_page(raw, lazy=True), 1000)
+    expected = parse_search_page(raw)
+
+    monkeypatch.setattr(
+        models,
+        "_build_yearly_stats",
+        lambda d, offset, y: _legacy_build_yearly_stats(d, str(offset or ""), y),
+    )
+    legacy = _rows_per_sec(lambda: SearchPage[Program].model_validate(raw), 1000)
+    assert SearchPage[Program].model_validate(raw) == expected
+
+    print(
+        f"\nSearchPage[Program] size=1000: legacy {legacy:,.0f} rows/s, "
+        f"key tables {current:,.0f} rows/s ({current / legacy:.1f}x), lazy {lazy:,.0f} rows/s"
+    )
+    bench.record("parse.search_page", current, unit="rows/s", higher_is_better=True)
+    bench.record("parse.search_page_lazy", lazy, unit="rows/s", higher_is_better=True)
+    bench.record("parse.search_page_speedup", current / legacy, unit="x", higher_is_better=True)
+    bench.record("parse.search_page_lazy_speedup", lazy / current, unit="x", higher_is_better=True)
+
+
+def test_bench_json_decode_large_page(bench: BenchmarkRecorder) -> None:
+    from yokatlas_py._json import get_codec
+
+    body = get_codec("json").dumps(synthetic_page(1000))
+    stdlib = get_codec("json")
+    fast = get_codec("auto")
+    if fast.name == "json":
+        pytest.skip("no fast JSON codec installed")
+    assert fast.loads(body) == stdlib.loads(body)
+
+    def per_call_ms(codec: Any) -> float:
+        return _best_seconds(lambda: codec.loads(body), repeat=10) * 1000
+
+    base, best = per_call_ms(stdlib), per_call_ms(fast)
+    print(
+        f"\ndecode {len(body) / 1e6:.1f} MB page: json {base:.1f} ms, {fast.name} {best:.1f} ms ({base / best:.1f}x)"
+    )
+    bench.record(f"json.decode_1000_rows.{fast.name}", best, unit="ms", higher_is_better=False)
+    bench.record(
+        f"json.decode_1000_rows_speedup.{fast.name}", base / best, unit="x", higher_is_better=True
+    )
+
+
+def test_bench_local_atlas_query_latency(tmp_path: Any, bench: BenchmarkRecorder) -> None:
+    from yokatlas_py._cache import canonical_key
+    from yokatlas_py.local import LocalAtlas
+
+    rng = random.Random(11)
+    rows = [
+        {
+            **row,
+            "kilavuzKodu": 100000000 + i,
+            "puanTuru": rng.choice(["SAY", "EA", "SÖZ", "DİL", "TYT"]),
+            "ilKodu": rng.randint(1, 81),
+        }
+        for i, row in enumerate(synthetic_page(20000)["content"])
+    ]
+    atlas = LocalAtlas(tmp_path / "atlas.sqlite")
+    with atlas._conn:
+        atlas._write_rows(atlas._conn, ((row, canonical_key(row)) for row in rows))
+
+    queries = [
+        {"puan_turu": rng.choice(["SAY", "EA"]), "il_kodu": [rng.randint(1, 81)]}
+        for _ in range(200)
+    ]
+
+    def run() -> None:
+        for filters in queries:
+            atlas.search(filters, size=20)
+
+    per_query_ms = _best_seconds(run, repeat=3) * 1000 / len(queries)
+    print(f"\nLocalAtlas.search over {len(rows):,} programs: {per_query_ms:.2f} ms/query")
+    bench.record("local.search_20k", per_query_ms, unit="ms/query", higher_is_better=False)
+
+
+def _serve_with_latency(port_queue: Any, handshake: float, latency: float) -> None:
+    """Local HTTP/1.1 server: each new connection costs ``handshake`` s, each response ``latency`` s."""
+    import asyncio
+    import json
+
+    async def main() -> None:
+        connections = 0
+
+        async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+            nonlocal connections
+            connections += 1
+            await asyncio.sleep(handshake)
+            try:
+                while True:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                    await asyncio.sleep(latency)
+                    body = json.dumps(
+                        {"connections": connections}
+                        if head.startswith(b"GET /stats")
+                        else {"ok": True}
+                    )
+                    payload = body.encode()
+                    writer.write(
+                        b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\nContent-Length: %d\r\n\r\n%s"
+                        % (len(payload), payload)
+                    )
+                    await writer.drain()
+            except (asyncio.IncompleteReadError, ConnectionError):
+                pass
+            finally:
+                writer.close()
+
+        server = await asyncio.start_server(handle, "127.0.0.1", 0, backlog=2048)
+        port_queue.put(server.sockets[0].getsockname()[1])
+        await server.serve_forever()
+
+    asyncio.run(main())
+
+
+def test_bench_keepalive_pool_against_local_server() -> None:
+    """Report-only: loopback wall-clock times and connection counts are too noisy to gate on."""
+    import asyncio
+    import multiprocessing
+
+    from yokatlas_py.config import Settings
+    from yokatlas_py.http_client import AsyncHttpClient
+
+    port_queue: Any = multiprocessing.Queue()
+    server = multiprocessing.Process(
+        target=_serve_with_latency, args=(port_queue, 0.05, 0.02), daemon=True
+    )
+    server.start()
+    port = port_queue.get(timeout=10)
+
+    async def fan_out(keepalive: int, *, width: int = 100, waves: int = 3) -> tuple[int, float]:
+        settings = Settings(
+            base_url=f"http://127.0.0.1:{port}",
+            pool_max_connections=width,
+            pool_max_keepalive=keepalive,
+            retry_attempts=0,
+        )
+        async with AsyncHttpClient(settings=settings) as http:
+            before = (await http.get_json("/stats"))["connections"]
+            start = time.perf_counter()
+            for _ in range(waves):
+                await asyncio.gather(*(http.get_json("/") for _ in range(width)))
+                await asyncio.sleep(0.01)
+            elapsed = time.perf_counter() - start
+            opened = (await http.get_json("/stats"))["connections"] - before
+        return opened, elapsed
+
+    try:
+        results = {keepalive: asyncio.run(fan_out(keepalive)) for keepalive in (20, 100)}
+    finally:
+        server.terminate()
+
+    print("\n100-way async fan-out x3 waves (50 ms handshake, 20 ms latency per request):")
+    for keepalive, (opened, elapsed) in results.items():
+        print(
+            f"  pool_max_keepalive={keepalive:>3}: {opened:>4} connections opened, {elapsed * 1000:,.0f} ms"
+        )
+
+
+def test_bench_metrics_overhead_per_search(bench: BenchmarkRecorder) -> None:
+    from yokatlas_py.config import Settings
+
+    from .conftest import make_client
+
+    def per_call_us(metrics: bool, calls: int = 300) -> float:
+        client = make_client(Settings(base_url="https://yokatlas.example.test", metrics=metrics))
+        client.search({"puan_turu": "SAY"})
+        start = time.perf_counter()
+        for _ in range(calls):
+            client.search({"puan_turu": "SAY"})
+        return (time.perf_counter() - start) / calls * 1e6
+
+    # Interleave the runs so both settings see the same machine load.
+    runs = [(per_call_us(False), per_call_us(True)) for _ in range(5)]
+    off, on = min(r[0] for r in runs), min(r[1] for r in runs)
+    print(f"\nsearch over a mock transport: metrics off {off:.0f} us/call, on {on:.0f} us/call")
+    bench.record("client.search_mock", off, unit="µs/call", higher_is_better=False)
+    bench.record("client.search_mock_metrics", on, unit="µs/call", higher_is_better=False)
+    bench.record("client.search_mock_metrics_overhead", on / off, unit="x", higher_is_better=False)
+
+
+# ---------------------------------------------------------------------------
+# End-to-end throughput and memory over a mock transport
+# ---------------------------------------------------------------------------
+
+
+def _prebuilt_search_handler(total: int, size: int) -> Callable[[Any], Any]:
+    """Search handler replaying pre-encoded pages, so the benchmark measures the client, not the fixture."""
+    import json
+
+    import httpx
+
+    rows = synthetic_page(total)["content"]
+    pages = [
+        json.dumps(
+            make_search_response(rows[start : start + size], total=total, size=size, page=number)
+        ).encode()
+        for number, start in enumerate(range(0, total, size))
+    ]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        number = json.loads(request.content)["page"]
+        return httpx.Response(
+            200, content=pages[number], headers={"Content-Type": "application/json"}
+        )
+
+    return handler
+
+
+def test_bench_end_to_end_pages_per_sec_sync_vs_async(bench: BenchmarkRecorder) -> None:
+    import asyncio
+
+    from yokatlas_py.config import Settings
+
+    from .conftest import make_async_client, make_client
+
+    total, size = 20_000, 100
+    pages = total // size
+    settings = Settings(base_url="https://yokatlas.example.test")
+    handler = _prebuilt_search_handler(total, size)
+
+    def sync_run() -> int:
+        with make_client(settings, handler) as client:
+            return len(client.search_all(size=size, smart_search=False))
+
+    async def async_run() -> int:
+        async with make_async_client(settings, handler) as client:
+            return len(await client.search_all(size=size, smart_search=False))
+
+    def pages_per_sec(run: Callable[[], int]) -> float:
+        best = float("inf")
+        for _ in range(2):
+            start = time.perf_counter()
+            assert run() == total
+            best = min(best, time.perf_counter() - start)
+        return pages / best
+
+    sync = pages_per_sec(sync_run)
+    asynchronous = pages_per_sec(lambda: asyncio.run(async_run()))
+    print(
+        f"\nsearch_all of {total:,} programs ({pages} pages of {size}): "
+        f"sync {sync:,.0f} pages/s ({sync * size:,.0f} rows/s), async {asynchronous:,.0f} pages/s"
+    )
+    bench.record("client.search_all_sync", sync, unit="pages/s", higher_is_better=True)
+    bench.record("client.search_all_async", asynchronous, unit="pages/s", higher_is_better=True)
+
+
+def _peak_mib(fn: Callable[[], Any]) -> float:
+    import gc
+    import tracemalloc
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return peak / 2**20
+
+
+def test_bench_peak_memory(bench: BenchmarkRecorder) -> None:
+    from yokatlas_py.columns import programs_to_columns
+
+    raw = synthetic_page(1000)
+    eager = _peak_mib(lambda: parse_search_page(raw))
+    lazy = _peak_mib(lambda: parse_search_page(raw, lazy=True))
+    columns = _peak_mib(lambda: programs_to_columns(raw["content"]))
+    print(
+        f"\npeak memory for 1000 rows: Program {eager:.1f} MiB, LazyProgram {lazy:.1f} MiB, columns {columns:.1f} MiB"
+    )
+    bench.record("memory.parse_1000_rows", eager, unit="MiB", higher_is_better=False)
+    bench.record("memory.parse_1000_rows_lazy", lazy, unit="MiB", higher_is_better=False)
+    bench.record("memory.columns_1000_rows", columns, unit="MiB", higher_is_better=False)
+    assert lazy < eager
+
+
+def _python_trends(programs: list[Program]) -> list[tuple[Any, ...]]:
+    """Fill rate, kontenjan deltas and rank volatility with loops over ``all_years``."""
+    import statistics
+
+    out = []
+    for program in programs:
+        years = program.all_years
+        fill = [
+            s.yerlesen / s.kontenjan if s.yerlesen is not None and s.kontenjan else None
+            for s in years
+        ]
+        delta = [
+            (
+                a.kontenjan - b.kontenjan
+                if a.kontenjan is not None and b.kontenjan is not None
+                else None
+            )
+            for a, b in zip(years, years[1:])
+        ]
+        ranks = [s.basari_sirasi for s in years if s.basari_sirasi is not None]
+        out.append((fill, delta, statistics.pstdev(ranks) if len(ranks) >= 2 else None))
+    return out
+
+
+def test_bench_history_trends_vectorized_vs_loops(bench: BenchmarkRecorder) -> None:
+    pytest.importorskip("numpy")
+    from yokatlas_py.history import history_tensor
+
+    raw = synthetic_page(1000)["content"]
+    rows = [{**row, "kilavuzKodu": 100000000 + i} for i, row in enumerate(raw * 25)]
+    programs = parse_search_page(
+        make_search_response(rows, total=len(rows), size=len(rows))
+    ).content
+
+    def vectorized() -> Any:
+        return tensor.fill_rate(), tensor.yoy_delta("kontenjan"), tensor.rank_volatility()
+
+    tensor = history_tensor(rows)
+    build = len(rows) / _rows_per_sec(lambda: history_tensor(rows), len(rows))
+    loops = len(rows) / _rows_per_sec(lambda: _python_trends(programs), len(rows))  # type: ignore[arg-type]
+    fast = len(rows) / _rows_per_sec(vectorized, len(rows))
+    fill, _, volatility = vectorized()
+    reference = _python_trends(programs)  # type: ignore[arg-type]
+    assert volatility[7] == pytest.approx(reference[7][2])
+    assert fill[7, 0] == pytest.approx(reference[7][0][0])
+    print(
+        f"\ntrend metrics for {len(rows):,} programs: loops {loops * 1000:.0f} ms, "
+        f"vectorized {fast * 1000:.1f} ms ({loops / fast:.0f}x), tensor build {build * 1000:.0f} ms"
+    )
+    bench.record("history.trends_25k", fast * 1000, unit="ms", higher_is_better=False)
+    bench.record("history.build_25k", build * 1000, unit="ms", higher_is_better=False)
+    bench.record("history.trends_25k_speedup", loops / fast, unit="x", higher_is_better=True)
@@ -0,0 +1,122 @@
+"""Tests for the tiered search response cache."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+
+from yokatlas_py._cache import ResponseCache, canonical_key
+from yokatlas_py.config import Settings
+
+from .conftest import make_async_client, make_client, make_paged_handler
+
+
+def test_canonical_key_ignores_key_order() -> None:
+    a = {"filters": {"puanTuru": "SAY", "ilKodu": [6]}, "page": 0, "size": 20}
+    b = {"size": 20, "page": 0, "filters": {"ilKodu": [6], "puanTuru": "SAY"}}
+    assert canonical_key(a) == canonical_key(b)
+    assert canonical_key(a) != canonical_key({**a, "page": 1})
+
+
+def test_memory_tier_evicts_least_recently_used() -> None:
+    cache = ResponseCache(maxsize=2, ttl=60)
+    cache.set("a", {"v": 1})
+    cache.set("b", {"v": 2})
+    assert cache.get("a") == {"v": 1}
+    cache.set("c", {"v": 3})
+    assert cache.get("b") is None
+    assert cache.get("a") == {"v": 1}
+    stats = cache.stats
+    assert (stats.memory_hits, stats.misses, stats.evictions, stats.size) == (2, 1, 1, 2)
+
+
+def test_memory_tier_honors_ttl(monkeypatch: pytest.MonkeyPatch) -> None:
+    import yokatlas_py._cache as mod
+
+    now = [1000.0]
+    monkeypatch.setattr(mod.time, "monotonic", lambda: now[0])
+    cache = ResponseCache(maxsize=10, ttl=5)
+    cache.set("a", {"v": 1})
+    now[0] += 4
+    assert cache.get("a") == {"v": 1}
+    now[0] += 2
+    assert cache.get("a") is None
+
+
+def test_disk_tier_survives_new_instance_and_promotes(tmp_path) -> None:
+    ResponseCache(maxsize=0, ttl=60, path=tmp_path).set("k", {"v": 1})
+    cache = ResponseCache(maxsize=4, ttl=60, path=tmp_path, disk_ttl=60)
+    assert cache.get("k") == {"v": 1}
+    assert cache.get("k") == {"v": 1}
+    assert (cache.stats.disk_hits, cache.stats.memory_hits) == (1, 1)
+
+
+def test_disk_tier_expires_entries(tmp_path) -> None:
+    import json
+
+    (tmp_path / "k.json").write_text(json.dumps({"stored_at": 0, "value": {"v": 1}}))
+    cache = ResponseCache(maxsize=4, ttl=60, path=tmp_path, disk_ttl=60)
+    assert cache.get("k") is None
+    assert not (tmp_path / "k.json").exists()
+
+
+def test_cache_disabled_by_default(settings: Settings) -> None:
+    assert ResponseCache.from_settings(settings) is None
+
+
+def _caching_settings(settings: Settings) -> Settings:
+    return settings.model_copy(update={"response_cache_size": 8})
+
+
+def test_sync_client_serves_repeated_search_from_cache(settings: Settings) -> None:
+    calls: list[dict[str, Any]] = []
+    settings = _caching_settings(settings)
+    client = make_client(settings, make_paged_handler(30, calls=calls))
+
+    first = client.search({"puan_turu": "SAY"}, size=10)
+    second = client.search({"puan_turu": "SAY"}, size=10)
+    client.search({"puan_turu": "SAY"}, size=10, page=1)
+
+    assert first == second
+    assert len(calls) == 2
+    assert client.response_cache is not None
+    assert client.response_cache.stats.hits == 1
+
+
+@pytest.mark.asyncio
+async def test_async_client_serves_repeated_search_from_cache(settings: Settings) -> None:
+    calls: list[dict[str, Any]] = []
+    settings = _caching_settings(settings)
+    client = make_async_client(settings, make_paged_handler(30, calls=calls))
+
+    await client.search(size=10)
+    await client.search(size=10)
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_async_disk_tier_runs_off_the_event_loop(
+    tmp_path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    import threading
+
+    import yokatlas_py._cache as cache_module
+
+    threads: list[int] = []
+    cache = ResponseCache(maxsize=0, ttl=60, path=tmp_path)
+    read, write = cache._disk_get, cache_module.atomic_write_json
+    monkeypatch.setattr(
+        cache, "_disk_get", lambda key: threads.append(threading.get_ident()) or read(key)
+    )
+    monkeypatch.setattr(
+        cache_module,
+        "atomic_write_json",
+        lambda *a: threads.append(threading.get_ident()) or write(*a),
+    )
+
+    assert await cache.aget("k") is None
+    await cache.aset("k", {"v": 1})
+    assert await cache.aget("k") == {"v": 1}
+    assert len(threads) == 3 and threading.get_ident() not in threads
+    assert (cache.stats.disk_hits, cache.stats.misses) == (1, 1)
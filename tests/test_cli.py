@@ -0,0 +1,115 @@
+"""Tests for the ``yokatlas`` command-line tool."""
+
+from __future__ import annotations
+
+import csv
+import io
+import json
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from yokatlas_py.cli import main
+from yokatlas_py.client import YokAtlasClient
+from yokatlas_py.columns import COLUMN_TYPES
+from yokatlas_py.config import Settings
+
+from .conftest import SAMPLE_PROGRAM_RAW, make_client, make_paged_handler
+
+
+def test_search_formats(client: YokAtlasClient, capsys: pytest.CaptureFixture[str]) -> None:
+    assert main(["search", "--universite", "medeniyet", "--size", "5"], client=client) == 0
+    page = json.loads(capsys.readouterr().out)
+    assert page["total_elements"] == 1
+    assert page["content"][0]["kilavuz_kodu"] == SAMPLE_PROGRAM_RAW["kilavuzKodu"]
+
+    assert main(["search", "--format", "csv"], client=client) == 0
+    header, row = csv.reader(io.StringIO(capsys.readouterr().out))
+    assert header == list(COLUMN_TYPES)
+    assert row[header.index("kilavuz_kodu")] == str(SAMPLE_PROGRAM_RAW["kilavuzKodu"])
+
+
+def test_get_reports_missing_codes(
+    client: YokAtlasClient, capsys: pytest.CaptureFixture[str]
+) -> None:
+    assert main(["get", str(SAMPLE_PROGRAM_RAW["kilavuzKodu"]), "1"], client=client) == 1
+    captured = capsys.readouterr()
+    (line,) = captured.out.splitlines()
+    assert json.loads(line)["birim_adi"] == SAMPLE_PROGRAM_RAW["birimAdi"]
+    assert "not found: 1" in captured.err
+
+
+def test_lookups(client: YokAtlasClient, capsys: pytest.CaptureFixture[str]) -> None:
+    assert main(["lookups", "cities", "--format", "csv"], client=client) == 0
+    rows = list(csv.reader(io.StringIO(capsys.readouterr().out)))
+    assert rows[0] == ["il_kodu", "il_adi"]
+    assert ["6", "ANKARA"] in rows
+
+
+def test_export_ndjson_and_csv(
+    settings: Settings, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    client = make_client(settings, make_paged_handler(250))
+    assert main(["export", "--puan-turu", "SAY"], client=client) == 0
+    lines = capsys.readouterr().out.splitlines()
+    assert [json.loads(line)["kilavuz_kodu"] for line in lines] == [
+        100000000 + i for i in range(250)
+    ]
+
+    assert main(["export", "--raw", "--size", "50"], client=client) == 0
+    assert json.loads(capsys.readouterr().out.splitlines()[-1])["kilavuzKodu"] == 100000249
+
+    target = tmp_path / "all.csv"
+    assert main(["export", "--format", "csv", "-o", str(target)], client=client) == 0
+    rows = list(csv.DictReader(target.open(encoding="utf-8")))
+    assert len(rows) == 250 and rows[0]["universite_adi"] == SAMPLE_PROGRAM_RAW["universiteAdi"]
+
+
+def test_export_streams_pages_as_they_arrive(
+    settings: Settings, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    calls: list[dict[str, Any]] = []
+    client = make_client(settings, make_paged_handler(1000, calls=calls))
+    out = io.StringIO()
+    requested_at_flush: list[int] = []
+    monkeypatch.setattr(out, "flush", lambda: requested_at_flush.append(len(calls)))
+    monkeypatch.setattr("sys.stdout", out)
+
+    assert main(["export", "--size", "10", "--concurrency", "2"], client=client) == 0
+    assert len(out.getvalue().splitlines()) == 1000
+    # Page n is written while at most ``concurrency`` later pages have been requested.
+    assert all(n <= page + 3 for page, n in enumerate(requested_at_flush))
+
+
+def test_invalid_filters_exit_with_usage_error(
+    client: YokAtlasClient, capsys: pytest.CaptureFixture[str]
+) -> None:
+    with pytest.raises(SystemExit) as exc:
+        main(["search", "--il", "izmir", "--il-kodu", "35"], client=client)
+    assert exc.value.code == 2
+    assert "cannot be set together" in capsys.readouterr().err
+
+
+@pytest.mark.parametrize(
+    "argv",
+    [
+        ["export", "--concurrency", "0"],
+        ["get", "1", "--concurrency", "-2"],
+        ["export", "--concurrency", "x"],
+    ],
+)
+def test_invalid_concurrency_exits_with_usage_error(
+    client: YokAtlasClient, capsys: pytest.CaptureFixture[str], argv: list[str]
+) -> None:
+    with pytest.raises(SystemExit) as exc:
+        main(argv, client=client)
+    assert exc.value.code == 2
+    assert "--concurrency" in capsys.readouterr().err
+
+
+def test_lookup_errors_are_reported(
+    client: YokAtlasClient, capsys: pytest.CaptureFixture[str]
+) -> None:
+    assert main(["export", "--universite", "zzzz qqqq"], client=client) == 1
+    assert capsys.readouterr().err.startswith("yokatlas: error: Could not resolve university")
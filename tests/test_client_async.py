@@ -2,12 +2,25 @@
 
 from __future__ import annotations
 
+import asyncio
+import json
+from typing import Any
+
+import httpx
 import pytest
 
 from yokatlas_py.client import AsyncYokAtlasClient
+from yokatlas_py.config import Settings
 from yokatlas_py.exceptions import LookupError
 from yokatlas_py.models import SearchFilters
 
+from .conftest import (
+    SAMPLE_PROGRAM_RAW,
+    make_async_client,
+    make_paged_handler,
+    make_search_response,
+)
+
 
 @pytest.mark.asyncio
 async def test_async_search(async_client: AsyncYokAtlasClient) -> None:
@@ -50,3 +63,163 @@ async def test_async_smart_search_unknown(async_client: AsyncYokAtlasClient) ->
 async def test_async_close_idempotent(async_client: AsyncYokAtlasClient) -> None:
     await async_client.aclose()
     await async_client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_async_iter_programs_walks_every_page_in_order(settings: Settings) -> None:
+    client = make_async_client(settings, make_paged_handler(45))
+    codes = [p.kilavuz_kodu async for p in client.iter_programs(size=10, concurrency=3)]
+    assert codes == [100000000 + i for i in range(45)]
+
+
+@pytest.mark.asyncio
+async def test_async_iter_programs_rejects_invalid_concurrency_before_any_request(
+    settings: Settings,
+) -> None:
+    calls: list[dict[str, Any]] = []
+    client = make_async_client(settings, make_paged_handler(25, calls=calls))
+    with pytest.raises(ValueError):
+        client.iter_programs(size=10, concurrency=0)
+    with pytest.raises(ValueError):
+        await client.search_all(size=10, concurrency=0)
+    assert calls == []
+
+
+@pytest.mark.asyncio
+async def test_async_search_all_unordered(settings: Settings) -> None:
+    client = make_async_client(settings, make_paged_handler(45))
+    programs = await client.search_all(size=10, ordered=False)
+    assert sorted(p.kilavuz_kodu for p in programs) == [100000000 + i for i in range(45)]
+
+
+@pytest.mark.asyncio
+async def test_async_lookup_cache_file_io_runs_off_the_event_loop(
+    settings: Settings, tmp_path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    import threading
+
+    import yokatlas_py._lookup as lookup_module
+
+    threads: list[int] = []
+    read, write = lookup_module.read_json, lookup_module.atomic_write_json
+    monkeypatch.setattr(
+        lookup_module, "read_json", lambda *a: threads.append(threading.get_ident()) or read(*a)
+    )
+    monkeypatch.setattr(
+        lookup_module,
+        "atomic_write_json",
+        lambda *a: threads.append(threading.get_ident()) or write(*a),
+    )
+    persistent = settings.model_copy(update={"lookup_cache_path": tmp_path / "lookups.json"})
+
+    first = make_async_client(persistent, make_paged_handler(1))
+    await first.list_universities()  # load misses, then populate
+    reloaded = make_async_client(persistent, make_paged_handler(1))
+    await reloaded.search({"universite": "boğaziçi"})  # served from the file
+    assert reloaded._lookups.is_fresh()
+    assert len(threads) == 3 and threading.get_ident() not in threads
+
+
+def _counting_client(settings: Settings, counts: dict[str, int]) -> AsyncYokAtlasClient:
+    handler = make_paged_handler(5)
+
+    async def slow_handler(request: httpx.Request) -> httpx.Response:
+        counts[request.url.path] = counts.get(request.url.path, 0) + 1
+        await asyncio.sleep(0.01)
+        return handler(request)
+
+    return make_async_client(settings, slow_handler)
+
+
+@pytest.mark.asyncio
+async def test_async_concurrent_smart_searches_share_one_lookup_refresh(settings: Settings) -> None:
+    counts: dict[str, int] = {}
+    client = _counting_client(settings, counts)
+    pages = await asyncio.gather(
+        *(client.search(SearchFilters(universite="boğaziçi"), page=i) for i in range(10))
+    )
+    assert len(pages) == 10
+    assert counts["/api/tercih-kilavuz/universiteler"] == 1
+    assert counts["/api/tercih-kilavuz/universite-programlar"] == 1
+    assert counts["/api/tercih-kilavuz/universite-iller"] == 1
+    assert counts["/api/tercih-kilavuz/search"] == 10
+
+
+@pytest.mark.asyncio
+async def test_async_identical_inflight_searches_are_coalesced(settings: Settings) -> None:
+    counts: dict[str, int] = {}
+    client = _counting_client(settings, counts)
+    pages = await asyncio.gather(*(client.search({"puan_turu": "SAY"}) for _ in range(10)))
+    assert counts["/api/tercih-kilavuz/search"] == 1
+    assert all(p == pages[0] for p in pages)
+    assert pages[0] is not pages[1]
+
+    await client.search({"puan_turu": "SAY"})
+    assert counts["/api/tercih-kilavuz/search"] == 2
+
+
+@pytest.mark.asyncio
+async def test_async_cancelled_waiter_does_not_cancel_shared_search(settings: Settings) -> None:
+    counts: dict[str, int] = {}
+    client = _counting_client(settings, counts)
+    first = asyncio.ensure_future(client.search())
+    second = asyncio.ensure_future(client.search())
+    await asyncio.sleep(0)
+    first.cancel()
+    page = await second
+    assert page.total_elements == 5
+    assert counts["/api/tercih-kilavuz/search"] == 1
+
+
+@pytest.mark.asyncio
+async def test_async_get_programs_dedupes_and_bounds_concurrency(settings: Settings) -> None:
+    requested: list[int] = []
+    in_flight = [0, 0]  # current, peak
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        code = json.loads(request.content)["filters"]["kilavuzKodu"]
+        requested.append(code)
+        in_flight[0] += 1
+        in_flight[1] = max(in_flight)
+        await asyncio.sleep(0.01)
+        in_flight[0] -= 1
+        items = [{**SAMPLE_PROGRAM_RAW, "kilavuzKodu": code}] if code != 999 else []
+        return httpx.Response(200, json=make_search_response(items, total=len(items), size=1))
+
+    client = make_async_client(settings, handler)
+
+    codes = [5, 3, 999, 5, *range(10, 30)]
+    result = await client.get_programs(codes, concurrency=6)
+    assert list(result) == [5, 3, 999, *range(10, 30)]
+    assert len(requested) == len(result)
+    assert result[999] is None and result[3] is not None and result[3].kilavuz_kodu == 3
+    assert in_flight[1] == 6
+
+
+@pytest.mark.asyncio
+async def test_async_stale_lookups_refresh_in_background_task(settings: Settings) -> None:
+    swr = settings.model_copy(update={"lookup_cache_ttl": 60, "lookup_cache_max_stale": 600})
+    paged = make_paged_handler(1)
+    gate = asyncio.Event()
+    lookups: list[str] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if not request.url.path.endswith("/search"):
+            lookups.append(request.url.path)
+            if len(lookups) > 3:
+                await gate.wait()
+        return paged(request)
+
+    client = make_async_client(swr, handler)
+    await client.list_universities()
+    client._lookups._snapshot.fetched_at -= 120
+
+    # Both searches complete while the refresh is parked on the gate.
+    assert (await client.search(SearchFilters(universite="boğaziçi"))).content
+    assert (await client.search(SearchFilters(il="ankara"))).content
+    assert client._refresher is not None and not client._refresher.done()
+    assert len(lookups) == 6
+
+    gate.set()
+    await client.aclose()
+    assert client._lookups.is_fresh()
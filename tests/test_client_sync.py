@@ -2,11 +2,20 @@
 
 from __future__ import annotations
 
+import json
+import threading
+import warnings
+from typing import Any
+
+import httpx
 import pytest
 
 from yokatlas_py.client import YokAtlasClient
+from yokatlas_py.config import Settings
 from yokatlas_py.exceptions import LookupError
-from yokatlas_py.models import SearchFilters
+from yokatlas_py.models import LazyProgram, SearchFilters
+
+from .conftest import SAMPLE_PROGRAM_RAW, make_client, make_paged_handler, make_search_response
 
 
 def test_search_returns_search_page(client: YokAtlasClient) -> None:
@@ -75,3 +84,191 @@ def test_filters_dict_input_is_accepted(client: YokAtlasClient) -> None:
 def test_close_is_idempotent(client: YokAtlasClient) -> None:
     client.close()
     client.close()
+
+
+def test_iter_programs_walks_every_page_in_order(settings: Settings) -> None:
+    calls: list[dict[str, Any]] = []
+    client = make_client(settings, make_paged_handler(45, calls=calls))
+    codes = [
+        p.kilavuz_kodu for p in client.iter_programs({"puan_turu": "SAY"}, size=10, concurrency=3)
+    ]
+    assert codes == [100000000 + i for i in range(45)]
+    assert sorted(c["page"] for c in calls) == [0, 1, 2, 3, 4]
+    assert all(c["filters"]["puanTuru"] == "SAY" for c in calls)
+
+
+def test_iter_programs_unordered_yields_everything(settings: Settings) -> None:
+    client = make_client(settings, make_paged_handler(45))
+    codes = [p.kilavuz_kodu for p in client.iter_programs(size=10, ordered=False)]
+    assert sorted(codes) == [100000000 + i for i in range(45)]
+
+
+def test_iter_programs_resolves_smart_filters_once(settings: Settings) -> None:
+    calls: list[dict[str, Any]] = []
+    client = make_client(settings, make_paged_handler(25, calls=calls))
+    programs = client.search_all(SearchFilters(universite="boğaziçi"), size=10)
+    assert len(programs) == 25
+    assert all(c["filters"]["universiteId"] == [173500] for c in calls)
+
+
+def test_iter_programs_rejects_invalid_concurrency_before_any_request(settings: Settings) -> None:
+    calls: list[dict[str, Any]] = []
+    client = make_client(settings, make_paged_handler(25, calls=calls))
+    with pytest.raises(ValueError):
+        client.iter_programs(size=10, concurrency=0)
+    with pytest.raises(ValueError):
+        client.search_all(size=10, concurrency=0)
+    assert calls == []
+
+
+def test_lookup_cache_path_skips_refetch_in_new_client(settings: Settings, tmp_path) -> None:
+    requests: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request.url.path)
+        return make_paged_handler(1)(request)
+
+    persistent = settings.model_copy(update={"lookup_cache_path": tmp_path / "lookups.json"})
+
+    make_client(persistent, handler).list_universities()
+    fetched = len(requests)
+    assert fetched == 3
+
+    assert any(
+        u.universite_id == 173500 for u in make_client(persistent, handler).list_universities()
+    )
+    assert len(requests) == fetched
+
+
+def test_lazy_search_and_iter_programs(client: YokAtlasClient, settings: Settings) -> None:
+    page = client.search(lazy=True)
+    assert isinstance(page.content[0], LazyProgram)
+    assert page.content[0].current.year == 2025
+
+    programs = list(make_client(settings, make_paged_handler(15)).iter_programs(size=10, lazy=True))
+    assert len(programs) == 15
+    assert all(isinstance(p, LazyProgram) for p in programs)
+
+
+def test_get_programs_dedupes_and_fans_out(settings: Settings) -> None:
+    import threading
+    import time
+
+    requested: list[int] = []
+    in_flight = [0, 0]  # current, peak
+    lock = threading.Lock()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        code = json.loads(request.content)["filters"]["kilavuzKodu"]
+        with lock:
+            requested.append(code)
+            in_flight[0] += 1
+            in_flight[1] = max(in_flight)
+        time.sleep(0.02)
+        with lock:
+            in_flight[0] -= 1
+        items = [{**SAMPLE_PROGRAM_RAW, "kilavuzKodu": code}] if code % 2 == 0 else []
+        return httpx.Response(200, json=make_search_response(items, total=len(items), size=1))
+
+    client = make_client(settings, handler)
+
+    codes = [110, "107", 104, 110, 102, 101, 108, 106, 103, 104]
+    result = client.get_programs(codes, concurrency=4)
+    assert list(result) == [110, 107, 104, 102, 101, 108, 106, 103]
+    assert sorted(requested) == sorted(result)
+    assert all(
+        (p is not None and p.kilavuz_kodu == code) == (code % 2 == 0) for code, p in result.items()
+    )
+    assert 1 < in_flight[1] <= 4
+    assert client.get_programs([]) == {}
+    with pytest.raises(ValueError):
+        client.get_programs([1, "abc"])
+
+
+def _gated_lookup_client(
+    settings: Settings, requests: list[str], gate: threading.Event, *, fail: bool = False
+) -> tuple[YokAtlasClient, threading.Event]:
+    """Client whose lookup endpoints, once armed, block until ``gate`` is set (and fail if ``fail``).
+
+    The returned event is set when a lookup request reaches the gate.
+    """
+    paged = make_paged_handler(1)
+    armed = threading.Event()
+    entered = threading.Event()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request.url.path)
+        if armed.is_set() and not request.url.path.endswith("/search"):
+            entered.set()
+            gate.wait(5)
+            if fail:
+                return httpx.Response(503)
+        return paged(request)
+
+    client = make_client(settings, handler)
+    client.list_universities()
+    client._lookups._snapshot.fetched_at -= 120  # expired, but within max_stale
+    armed.set()
+    return client, entered
+
+
+def test_stale_lookups_are_served_while_refreshing_in_background(settings: Settings) -> None:
+    swr = settings.model_copy(update={"lookup_cache_ttl": 60, "lookup_cache_max_stale": 600})
+    requests: list[str] = []
+    gate = threading.Event()
+    client, entered = _gated_lookup_client(swr, requests, gate)
+
+    # Both searches return while the refresh is still blocked on the gate.
+    assert client.search({"universite": "boğaziçi"}).content
+    assert client.search({"il": "ankara"}).content
+    assert entered.wait(5)
+    assert client._refresher is not None and client._refresher.is_alive()
+    assert requests.count("/api/tercih-kilavuz/universiteler") == 2
+
+    gate.set()
+    client.close()
+    assert client._lookups.is_fresh()
+    assert requests.count("/api/tercih-kilavuz/universite-iller") == 2
+
+
+def test_lookups_beyond_max_stale_refresh_in_foreground(settings: Settings) -> None:
+    swr = settings.model_copy(update={"lookup_cache_ttl": 60, "lookup_cache_max_stale": 600})
+    requests: list[str] = []
+    gate = threading.Event()
+    gate.set()
+    client, _ = _gated_lookup_client(swr, requests, gate)
+    client._lookups._snapshot.fetched_at -= 600
+
+    client.search({"universite": "boğaziçi"})
+    assert client._refresher is None
+    assert requests.count("/api/tercih-kilavuz/universiteler") == 2
+    assert client._lookups.is_fresh()
+
+
+def test_failed_background_refresh_keeps_stale_tables(settings: Settings) -> None:
+    swr = settings.model_copy(
+        update={"lookup_cache_ttl": 60, "lookup_cache_max_stale": 600, "retry_attempts": 0}
+    )
+    gate = threading.Event()
+    gate.set()
+    client, _ = _gated_lookup_client(swr, [], gate, fail=True)
+
+    with pytest.warns(RuntimeWarning, match="Background lookup refresh failed"):
+        client.search({"universite": "boğaziçi"})
+        assert client._refresher is not None
+        client._refresher.join()
+    assert client._lookups.is_usable() and not client._lookups.is_fresh()
+
+    # Within the cooldown, later searches neither start a thread nor warn again.
+    failed = client._refresher
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        client.search({"il": "ankara"})
+    assert client._refresher is failed
+
+    assert client._refresh_failed_at is not None
+    client._refresh_failed_at -= 3600
+    with pytest.warns(RuntimeWarning, match="Background lookup refresh failed"):
+        client.search({"il": "ankara"})
+        assert client._refresher is not failed
+        client._refresher.join()
@@ -0,0 +1,76 @@
+"""Tests for the column-oriented export."""
+
+from __future__ import annotations
+
+import pytest
+
+from yokatlas_py.columns import COLUMN_TYPES, programs_to_columns
+from yokatlas_py.config import Settings
+from yokatlas_py.models import Program, SearchPage
+
+from .conftest import SAMPLE_PROGRAM_RAW, make_client, make_paged_handler, make_search_response
+
+
+def test_raw_rows_match_validated_programs() -> None:
+    sparse = {k: v for k, v in SAMPLE_PROGRAM_RAW.items() if not k.endswith(("2", "3"))}
+    rows = [SAMPLE_PROGRAM_RAW, sparse]
+    from_raw = programs_to_columns(rows)
+    from_models = programs_to_columns(Program.model_validate(r) for r in rows)
+    assert from_raw == from_models
+    assert set(from_raw) == set(COLUMN_TYPES)
+
+
+def test_column_layout_and_coercion() -> None:
+    cols = programs_to_columns([SAMPLE_PROGRAM_RAW])
+    assert cols["kilavuz_kodu"] == [105490029]
+    assert cols["sinav"] == ["YKS"]
+    assert cols["yerlesen_0"] == [55]
+    assert cols["kpss1_0"] == [pytest.approx(66.593874)]
+    assert cols["min_puan_1"] == [pytest.approx(397.21128)]
+    assert cols["basari_sirasi_3"] == [50044]
+    assert cols["kontenjan_2"] == [None]
+    assert COLUMN_TYPES["min_puan_0"] is float
+    assert COLUMN_TYPES["universite_adi"] is str
+    assert "current" not in cols and "history" not in cols
+
+
+def test_search_page_to_columns() -> None:
+    page = SearchPage[Program].model_validate(
+        make_search_response([SAMPLE_PROGRAM_RAW] * 3, total=3)
+    )
+    assert page.to_columns()["universite_id"] == [173496] * 3
+
+
+def test_unknown_format_rejected() -> None:
+    with pytest.raises(ValueError):
+        programs_to_columns([], format="parquet")  # type: ignore[arg-type]
+
+
+def test_numpy_format_masks_missing_values() -> None:
+    np = pytest.importorskip("numpy")
+    cols = programs_to_columns(
+        [SAMPLE_PROGRAM_RAW, {**SAMPLE_PROGRAM_RAW, "minPuan": None}], format="numpy"
+    )
+    assert cols["min_puan_0"].dtype == np.float64
+    assert cols["min_puan_0"].mask.tolist() == [False, True]
+    assert cols["kilavuz_kodu"].dtype == np.int64
+
+
+def test_arrow_format_builds_table() -> None:
+    pytest.importorskip("pyarrow")
+    table = programs_to_columns([SAMPLE_PROGRAM_RAW], format="arrow")
+    assert table.num_rows == 1
+    assert table.column("basari_sirasi_0").to_pylist() == [28226]
+
+
+def test_client_search_columns_skips_models(
+    settings: Settings, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    client = make_client(settings, make_paged_handler(25))
+
+    def fail(*args, **kwargs):  # noqa: ANN002, ANN003, ANN202
+        raise AssertionError("Program should not be validated")
+
+    monkeypatch.setattr("yokatlas_py.models._build_yearly_stats", fail)
+    cols = client.search_columns(size=10)
+    assert cols["kilavuz_kodu"] == [100000000 + i for i in range(25)]
@@ -0,0 +1,141 @@
+"""Tests for the multi-process sharded crawler."""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+import httpx
+import pytest
+
+from yokatlas_py.client import YokAtlasClient
+from yokatlas_py.config import Settings
+from yokatlas_py.crawl import crawl, partition_filters
+from yokatlas_py.models import SearchFilters
+
+from .conftest import SAMPLE_PROGRAM_RAW, _mock_handler, make_client, make_search_response
+
+PUAN_TURLERI = ("SAY", "SÖZ", "EA", "DİL", "TYT")
+
+# 60 programs spread over the three sample cities, every puan türü and both üniversite türleri.
+DATASET = [
+    {
+        **SAMPLE_PROGRAM_RAW,
+        "kilavuzKodu": 200000000 + i,
+        "basariSirasi": (i * 7919) % 1000 + 1,
+        "puanTuru": PUAN_TURLERI[i % 5],
+        "ilKodu": (34, 6, 35)[i % 3],
+        "universiteTuru": ("DEVLET", "VAKIF")[i % 2],
+    }
+    for i in range(60)
+]
+# A program in a city missing from the lookup table, out of reach of an il_kodu partition.
+ORPHAN = {**DATASET[0], "kilavuzKodu": 299999999, "ilKodu": 99}
+
+
+def _handler(rows: list[dict[str, Any]], *, ignore: tuple[str, ...] = ()):
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path != "/api/tercih-kilavuz/search":
+            return _mock_handler(request)
+        payload = json.loads(request.content)
+        f = payload["filters"]
+        matched = [
+            row
+            for row in rows
+            if (not f["puanTuru"] or "puanTuru" in ignore or row["puanTuru"] == f["puanTuru"])
+            and (not f["ilKodu"] or row["ilKodu"] in f["ilKodu"])
+            and (
+                not f["universiteTuru"]
+                or "universiteTuru" in ignore
+                or row["universiteTuru"] == f["universiteTuru"]
+            )
+        ]
+        page, size = payload["page"], payload["size"]
+        items = matched[page * size : (page + 1) * size]
+        return httpx.Response(
+            200, json=make_search_response(items, total=len(matched), size=size, page=page)
+        )
+
+    return handler
+
+
+# Factories are module-level so the process pool can pickle them by reference.
+def dataset_client(settings: Settings) -> YokAtlasClient:
+    return make_client(settings, _handler(DATASET))
+
+
+def orphan_client(settings: Settings) -> YokAtlasClient:
+    return make_client(settings, _handler([*DATASET, ORPHAN]))
+
+
+def leaky_client(settings: Settings) -> YokAtlasClient:
+    return make_client(settings, _handler(DATASET, ignore=("universiteTuru",)))
+
+
+def test_partition_filters_is_a_cartesian_product() -> None:
+    parts = partition_filters({"birim_turu_id": 46}, by=("puan_turu", "universite_turu"))
+    assert len(parts) == 10
+    assert {(p.puan_turu, p.universite_turu) for p in parts} == {
+        (pt, ut) for pt in PUAN_TURLERI for ut in ("DEVLET", "VAKIF")
+    }
+    assert all(p.birim_turu_id == 46 for p in parts)
+
+    restricted = partition_filters(
+        SearchFilters(puan_turu="SAY", il_kodu=[6, 34, 6]),
+        by=("puan_turu", "il_kodu"),
+        il_kodlari=[1, 2, 3],
+    )
+    assert [(p.puan_turu, p.il_kodu) for p in restricted] == [("SAY", [6]), ("SAY", [34])]
+
+
+def test_partition_filters_rejects_bad_input() -> None:
+    with pytest.raises(ValueError, match="il_kodlari"):
+        partition_filters(by=("il_kodu",))
+    with pytest.raises(ValueError, match="cannot partition"):
+        partition_filters(by=("kilavuz_kodu",))  # type: ignore[arg-type]
+    with pytest.raises(ValueError, match="resolved"):
+        partition_filters({"il": "izmir"}, by=("puan_turu",))
+
+
+def test_crawl_in_process_merges_every_partition(settings: Settings) -> None:
+    result = crawl(settings=settings, client_factory=dataset_client, processes=1, size=4)
+    assert len(result.partitions) == 15  # 5 puan türü x 3 cities
+    assert [p.kilavuz_kodu for p in result.programs] == sorted(
+        row["kilavuzKodu"] for row in DATASET
+    )
+    assert result.expected == 60 and result.complete and result.duplicates == 0
+    assert sum(part.fetched for part in result.partitions) == 60
+    assert all(part.fetched == part.total for part in result.partitions)
+
+
+def test_crawl_across_worker_processes(settings: Settings) -> None:
+    result = crawl(
+        {"il": "istanbul"},
+        partition_by=("puan_turu", "universite_turu"),
+        settings=settings,
+        client_factory=dataset_client,
+        processes=3,
+        size=2,
+    )
+    expected = sorted(row["kilavuzKodu"] for row in DATASET if row["ilKodu"] == 34)
+    assert [p.kilavuz_kodu for p in result.programs] == expected
+    assert all(part.filters.il_kodu == [34] for part in result.partitions)
+    assert result.complete
+
+
+def test_crawl_dedupes_overlapping_partitions(settings: Settings) -> None:
+    result = crawl(
+        partition_by=("universite_turu",),
+        settings=settings,
+        client_factory=leaky_client,
+        processes=2,
+    )
+    assert len(result.programs) == 60
+    assert result.duplicates == 60
+
+
+def test_crawl_warns_when_partitions_miss_rows(settings: Settings) -> None:
+    with pytest.warns(RuntimeWarning, match="cover 60 of 61"):
+        result = crawl(settings=settings, client_factory=orphan_client, processes=1)
+    assert result.expected == 61
+    assert not result.complete
@@ -0,0 +1,107 @@
+"""Tests for the multi-year history tensor."""
+
+from __future__ import annotations
+
+import statistics
+from typing import Any
+
+import pytest
+
+from yokatlas_py.models import LazyProgram, Program
+
+from .conftest import SAMPLE_PROGRAM_RAW
+
+np = pytest.importorskip("numpy")
+
+from yokatlas_py.history import METRICS, YEARS, history_tensor  # noqa: E402
+
+ROWS: list[dict[str, Any]] = [
+    SAMPLE_PROGRAM_RAW,
+    {
+        **SAMPLE_PROGRAM_RAW,
+        "kilavuzKodu": 1,
+        "kontenjan": 0,
+        "gkY": 0,
+        "basariSirasi": "40000",
+        "minPuan1": None,
+        "basariSirasi1": None,
+        "basariSirasi2": None,
+        "basariSirasi3": None,
+    },
+    {
+        **SAMPLE_PROGRAM_RAW,
+        "kilavuzKodu": 2,
+        "kontenjan1": 40,
+        "gkY1": 30,
+        "kontenjan3": 60,
+        "gkY3": 45,
+    },
+]
+
+
+def test_shape_index_maps_and_masks() -> None:
+    h = history_tensor(ROWS)
+    assert h.values.shape == (3, YEARS, len(METRICS)) == (3, 4, 13)
+    assert h.index == {SAMPLE_PROGRAM_RAW["kilavuzKodu"]: 0, 1: 1, 2: 2}
+    assert h.metric_index["basari_sirasi"] == METRICS.index("basari_sirasi")
+    assert h.years[0].tolist() == [2025, 2024, 2023, 2022]
+
+    ranks = h.metric("basari_sirasi")
+    assert ranks[0].tolist() == [28226, 35310, 43196, 50044]
+    assert ranks.mask[1].tolist() == [False, True, True, True]
+    assert (
+        np.isnan(h.values[1, 1, h.metric_index["min_puan"]])
+        and h.mask[1, 1, h.metric_index["min_puan"]]
+    )
+    assert h.row(1)[0, h.metric_index["basari_sirasi"]] == 40000
+    with pytest.raises(ValueError, match="unknown metric"):
+        h.metric("nope")
+
+
+def test_programs_raw_rows_and_lazy_programs_agree() -> None:
+    from_raw = history_tensor(ROWS)
+    programs = [Program.model_validate(row) for row in ROWS]
+    mixed = [programs[0], LazyProgram.model_validate(ROWS[1]), ROWS[2]]
+    for other in (history_tensor(programs), history_tensor(mixed)):
+        assert np.array_equal(from_raw.values, other.values, equal_nan=True)
+        assert from_raw.codes.tolist() == other.codes.tolist()
+    for program, row in zip(programs, from_raw.values):
+        for offset, stats in enumerate(program.all_years):
+            for i, name in enumerate(METRICS):
+                expected = getattr(stats, name)
+                assert (
+                    np.isnan(row[offset, i]) if expected is None else row[offset, i] == expected
+                ), (offset, name)
+
+
+def test_trend_helpers_match_python_loops() -> None:
+    h = history_tensor(ROWS)
+    programs = [Program.model_validate(row) for row in ROWS]
+
+    delta = h.yoy_delta("basari_sirasi")
+    assert delta.shape == (3, YEARS - 1)
+    years = programs[0].all_years
+    assert delta[0].tolist() == [a.basari_sirasi - b.basari_sirasi for a, b in zip(years, years[1:])]  # type: ignore[operator]
+    assert delta.mask[1].all()
+    relative = h.yoy_delta("basari_sirasi", relative=True)
+    assert relative[0, 0] == pytest.approx((28226 - 35310) / 35310)
+
+    volatility = h.rank_volatility()
+    assert volatility[0] == pytest.approx(statistics.pstdev(y.basari_sirasi for y in years))  # type: ignore[misc]
+    assert volatility.mask.tolist() == [False, True, False]
+    cv = h.rank_volatility(relative=True)
+    assert cv[0] == pytest.approx(volatility[0] / statistics.fmean(y.basari_sirasi for y in years))  # type: ignore[misc]
+
+    fill = h.fill_rate()
+    assert fill[0, 0] == pytest.approx(55 / 55)
+    assert fill.mask[1, 0]  # kontenjan 0
+    assert fill[2, 3] == pytest.approx(45 / 60)
+    assert fill[2, 1] == pytest.approx(30 / 40)
+    assert fill.mask[2, 2]  # kontenjan and yerlesen missing
+
+
+def test_rejects_duplicate_or_missing_codes() -> None:
+    with pytest.raises(ValueError, match="unique"):
+        history_tensor([ROWS[0], ROWS[0]])
+    with pytest.raises(ValueError, match="kilavuz_kodu"):
+        history_tensor([{k: v for k, v in ROWS[0].items() if k != "kilavuzKodu"}])
@@ -0,0 +1,129 @@
+"""Tests for the HTTP layer's pluggable JSON codecs."""
+
+from __future__ import annotations
+
+import importlib.util
+import json
+from typing import Any
+
+import httpx
+import pytest
+
+from yokatlas_py._json import get_codec
+from yokatlas_py.config import Settings
+from yokatlas_py.exceptions import APIError
+from yokatlas_py.http_client import AsyncHttpClient, HttpClient
+
+from .conftest import make_async_http_client, make_http_client
+
+
+def _codec_param(name: str) -> Any:
+    missing = name != "json" and importlib.util.find_spec(name) is None
+    return pytest.param(name, marks=pytest.mark.skipif(missing, reason=f"{name} not installed"))
+
+
+CODECS = [_codec_param(name) for name in ("json", "orjson", "msgspec")]
+
+BODY = {
+    "filters": {"universiteAdi": "İSTANBUL MEDENİYET ÜNİVERSİTESİ", "ilKodu": [34]},
+    "page": 0,
+    "size": 20,
+}
+
+
+def _echo(request: httpx.Request) -> httpx.Response:
+    if request.url.path == "/broken":
+        return httpx.Response(
+            200, content=b'{"content": [', headers={"Content-Type": "application/json"}
+        )
+    assert request.headers["Content-Type"] == "application/json"
+    return httpx.Response(
+        200, content=request.content, headers={"Content-Type": "application/json"}
+    )
+
+
+def _settings(codec: str) -> Settings:
+    return Settings(base_url="https://yokatlas.example.test", json_codec=codec)  # type: ignore[arg-type]
+
+
+@pytest.mark.parametrize("codec", CODECS)
+def test_codec_roundtrips_body_and_response(codec: str) -> None:
+    settings = _settings(codec)
+    with make_http_client(settings, _echo) as http:
+        assert http.codec.name == codec
+        assert http.post_json("/echo", json_body=BODY) == BODY
+        # Wire format matches what the stdlib would send.
+        assert json.loads(get_codec(codec).dumps(BODY)) == BODY
+
+
+@pytest.mark.parametrize("codec", CODECS)
+def test_malformed_response_raises_api_error(codec: str) -> None:
+    settings = _settings(codec)
+    with make_http_client(settings, _echo) as http:
+        with pytest.raises(APIError, match="Failed to decode JSON") as info:
+            http.get_json("/broken")
+    assert info.value.status_code == 200
+    assert info.value.body == '{"content": ['
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("codec", CODECS)
+async def test_async_client_uses_codec(codec: str) -> None:
+    settings = _settings(codec)
+    async with make_async_http_client(settings, _echo) as http:
+        assert await http.post_json("/echo", json_body=BODY) == BODY
+        with pytest.raises(APIError):
+            await http.get_json("/broken")
+
+
+def test_auto_prefers_installed_fast_codec() -> None:
+    expected = next(
+        (name for name in ("orjson", "msgspec") if importlib.util.find_spec(name)), "json"
+    )
+    assert get_codec("auto").name == expected
+
+
+def test_explicit_missing_codec_raises_import_error(monkeypatch: pytest.MonkeyPatch) -> None:
+    import yokatlas_py._json as mod
+
+    def unavailable() -> Any:
+        raise ImportError("No module named 'msgspec'")
+
+    monkeypatch.setitem(mod._FACTORIES, "msgspec", unavailable)
+    get_codec.cache_clear()
+    try:
+        with pytest.raises(ImportError, match=r"yokatlas-py\[msgspec\]"):
+            get_codec("msgspec")
+    finally:
+        get_codec.cache_clear()
+
+
+def test_pool_timeout_and_compression_settings_reach_httpx() -> None:
+    settings = Settings(
+        pool_max_connections=250,
+        pool_max_keepalive=200,
+        keepalive_expiry=30,
+        timeout=20,
+        connect_timeout=3,
+        compression=False,
+    )
+    http = HttpClient(settings=settings)
+    pool = http.client._transport._pool  # type: ignore[attr-defined]
+    assert (pool._max_connections, pool._max_keepalive_connections, pool._keepalive_expiry) == (
+        250,
+        200,
+        30,
+    )
+    assert http.client.timeout == httpx.Timeout(connect=3, read=20, write=20, pool=20)
+    assert http.client.headers["Accept-Encoding"] == "identity"
+    http.close()
+
+    defaults = AsyncHttpClient(settings=Settings())
+    assert defaults.client._transport._pool._max_keepalive_connections == 20  # type: ignore[attr-defined]
+    assert "gzip" in defaults.client.headers["Accept-Encoding"]
+
+
+@pytest.mark.skipif(importlib.util.find_spec("h2") is not None, reason="h2 is installed")
+def test_http2_without_h2_raises_helpful_import_error() -> None:
+    with pytest.raises(ImportError, match=r"yokatlas-py\[http2\]"):
+        HttpClient(settings=Settings(http2=True))
@@ -0,0 +1,77 @@
+"""Import-time cost: ``import yokatlas_py`` must not pull in the heavy dependencies."""
+
+from __future__ import annotations
+
+import subprocess
+import sys
+
+import pytest
+
+import yokatlas_py
+
+# ``-X importtime`` budget (µs) for the self time of the package's own modules.
+# Cumulative time is dominated by stdlib modules (typing, re, collections) whose
+# cost depends on the interpreter and on what ``site`` already imported.
+IMPORT_BUDGET_US = 5_000
+
+HEAVY = (
+    "httpx",
+    "pydantic",
+    "pydantic_settings",
+    "sqlite3",
+    "yokatlas_py.client",
+    "yokatlas_py.models",
+)
+
+
+def _run(code: str, *flags: str) -> subprocess.CompletedProcess[str]:
+    return subprocess.run(
+        [sys.executable, *flags, "-c", code], capture_output=True, text=True, check=True
+    )
+
+
+def _loaded(code: str) -> set[str]:
+    out = _run(f"import sys\n{code}\nprint(' '.join(sys.modules))").stdout.split()
+    return {name for name in HEAVY if name in out}
+
+
+def test_import_time_budget() -> None:
+    stderr = _run("import yokatlas_py", "-X", "importtime").stderr
+    self_us = 0
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        own, _, name = line[len("import time:") :].split("|")
+        if name.strip().split(".")[0] == "yokatlas_py":
+            self_us += int(own)
+    print(
+        f"\nimport yokatlas_py: {self_us / 1000:.1f} ms self time (budget {IMPORT_BUDGET_US / 1000:.0f} ms)"
+    )
+    assert 0 < self_us < IMPORT_BUDGET_US
+
+
+def test_bare_import_defers_dependencies_and_settings() -> None:
+    assert _loaded("import yokatlas_py") == set()
+    assert _loaded("from yokatlas_py import normalize, YokAtlasError") == set()
+    out = _run("import yokatlas_py.config as c\nprint(c._settings)").stdout.strip()
+    assert out == "None"
+
+
+def test_model_import_skips_http_stack() -> None:
+    assert _loaded("from yokatlas_py import Program, SearchFilters") == {
+        "pydantic",
+        "yokatlas_py.models",
+    }
+
+
+def test_lazy_exports_resolve_to_submodule_objects() -> None:
+    from yokatlas_py.client import YokAtlasClient
+    from yokatlas_py.config import get_settings
+
+    assert yokatlas_py.YokAtlasClient is YokAtlasClient
+    assert yokatlas_py.settings is get_settings()
+    assert set(dir(yokatlas_py)) >= set(yokatlas_py.__all__)
+    for name in yokatlas_py.__all__:
+        assert getattr(yokatlas_py, name) is not None
+    with pytest.raises(AttributeError):
+        yokatlas_py.does_not_exist  # noqa: B018
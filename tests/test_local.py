@@ -0,0 +1,242 @@
+"""Tests for the offline SQLite-backed LocalAtlas."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any
+
+import httpx
+import pytest
+
+from yokatlas_py.client import YokAtlasClient
+from yokatlas_py.config import Settings
+from yokatlas_py.local import LocalAtlas
+from yokatlas_py.models import LazyProgram, SearchFilters
+
+from .conftest import SAMPLE_PROGRAM_RAW, _mock_handler, make_client, make_search_response
+
+TOTAL = 45
+
+
+def _rows() -> list[dict[str, Any]]:
+    rows = []
+    for i in range(TOTAL):
+        rows.append(
+            {
+                **SAMPLE_PROGRAM_RAW,
+                "kilavuzKodu": 200000000 + i,
+                "puanTuru": ("SAY", "EA", "SÖZ")[i % 3],
+                "ilKodu": (34, 6)[i % 2],
+                "universiteId": 173496 if i < 20 else 173500,
+                "universiteTuru": "VAKIF" if i % 5 == 0 else "DEVLET",
+                "basariSirasi": None if i % 9 == 4 else (TOTAL - i) * 1000,
+            }
+        )
+    return rows
+
+
+def _synced_client(
+    settings: Settings,
+    calls: list[dict[str, Any]],
+    rows: list[dict[str, Any]] | None = None,
+    *,
+    short_page: int | None = None,
+) -> YokAtlasClient:
+    rows = _rows() if rows is None else rows
+    total = len(rows)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path != "/api/tercih-kilavuz/search":
+            return _mock_handler(request)
+        payload = json.loads(request.content)
+        calls.append(payload)
+        page, size = payload["page"], payload["size"]
+        items = rows[page * size : (page + 1) * size]
+        if page == short_page:
+            items = items[:-3]
+        return httpx.Response(
+            200, json=make_search_response(items, total=total, size=size, page=page)
+        )
+
+    return make_client(settings, handler)
+
+
+@pytest.fixture()
+def atlas(tmp_path: Path, settings: Settings) -> LocalAtlas:
+    calls: list[dict[str, Any]] = []
+    atlas = LocalAtlas(tmp_path / "atlas.sqlite", settings=settings)
+    with _synced_client(settings, calls) as client:
+        changes = atlas.sync(client, size=10)
+    assert len(calls) == 5
+    assert changes.total == TOTAL and len(changes.added) == TOTAL
+    assert (changes.changed, changes.removed, changes.pages, changes.pages_skipped) == (
+        [],
+        [],
+        5,
+        0,
+    )
+    return atlas
+
+
+def test_unsynced_store_is_empty(tmp_path: Path, settings: Settings) -> None:
+    with LocalAtlas(tmp_path / "empty.sqlite", settings=settings) as atlas:
+        assert atlas.synced_at is None
+        page = atlas.search()
+        assert page.total_elements == 0 and page.empty and page.content == []
+
+
+def test_search_sorts_by_basari_sirasi_with_nulls_last(atlas: LocalAtlas) -> None:
+    page = atlas.search(size=100)
+    ranks = [p.current.basari_sirasi for p in page.content]
+    ranked = [r for r in ranks if r is not None]
+    assert page.total_elements == TOTAL and page.yil == 2025
+    assert ranked == sorted(ranked)
+    assert ranks[len(ranked) :] == [None] * (TOTAL - len(ranked))
+
+    desc = [p.current.basari_sirasi for p in atlas.search(size=100, direction="desc").content]
+    assert [r for r in desc if r is not None] == sorted(ranked, reverse=True)
+    assert desc[-1] is None
+
+
+def test_search_paginates_like_the_api(atlas: LocalAtlas) -> None:
+    pages = [atlas.search(page=n, size=20) for n in range(3)]
+    assert [p.number_of_elements for p in pages] == [20, 20, 5]
+    assert pages[0].first and not pages[0].last and pages[2].last
+    assert all(p.total_pages == 3 for p in pages)
+    codes = [p.kilavuz_kodu for page in pages for p in page.content]
+    assert len(set(codes)) == TOTAL
+
+
+def test_search_applies_indexed_filters(atlas: LocalAtlas) -> None:
+    rows = _rows()
+    filters = SearchFilters(
+        puan_turu="SAY", il_kodu=[34], min_basari_sirasi=1, max_basari_sirasi=30000
+    )
+    expected = {
+        r["kilavuzKodu"]
+        for r in rows
+        if r["puanTuru"] == "SAY"
+        and r["ilKodu"] == 34
+        and r["basariSirasi"] is not None
+        and r["basariSirasi"] <= 30000
+    }
+    page = atlas.search(filters, size=100)
+    assert {p.kilavuz_kodu for p in page.content} == expected
+    assert atlas.count(filters) == len(expected)
+    assert atlas.count({"universite_turu": "VAKIF", "universite_id": [173500]}) == sum(
+        1 for r in rows if r["universiteTuru"] == "VAKIF" and r["universiteId"] == 173500
+    )
+
+
+def test_smart_filters_resolve_from_snapshot_lookups(atlas: LocalAtlas) -> None:
+    assert atlas.count({"universite": "boğaziçi"}) == TOTAL - 20
+    assert [u.universite_id for u in atlas.list_universities()][:2] == [173496, 173500]
+
+
+def test_sort_by_unindexed_field_and_invalid_sort(atlas: LocalAtlas) -> None:
+    page = atlas.search(sort_by="kilavuzKodu", direction="DESC", size=3)
+    assert [p.kilavuz_kodu for p in page.content] == [200000044, 200000043, 200000042]
+    assert atlas.search(sort_by="taban", size=5).number_of_elements == 5
+    with pytest.raises(ValueError):
+        atlas.search(sort_by="x; DROP TABLE programs")
+    with pytest.raises(ValueError):
+        atlas.search(direction="sideways")
+
+
+def test_get_program_iter_programs_and_lazy(atlas: LocalAtlas) -> None:
+    program = atlas.get_program("200000003")
+    assert program is not None and program.puan_turu == "SAY"
+    assert atlas.get_program(1) is None
+    assert {
+        code: p is not None
+        for code, p in atlas.get_programs([200000007, 1, "200000002", 200000007]).items()
+    } == {
+        200000007: True,
+        1: False,
+        200000002: True,
+    }
+    lazy = list(atlas.iter_programs({"puan_turu": "EA"}, lazy=True))
+    assert len(lazy) == TOTAL // 3 and all(isinstance(p, LazyProgram) for p in lazy)
+    assert isinstance(atlas.search(size=1, lazy=True).content[0], LazyProgram)
+
+
+def test_snapshot_persists_across_instances(atlas: LocalAtlas, settings: Settings) -> None:
+    reopened = LocalAtlas(atlas.path, settings=settings)
+    assert reopened.synced_at == atlas.synced_at
+    assert reopened.count() == TOTAL
+    assert reopened.count({"il": "ankara"}) == TOTAL // 2
+
+
+def test_resync_without_changes_skips_every_page(atlas: LocalAtlas, settings: Settings) -> None:
+    before = atlas.synced_at
+    with _synced_client(settings, []) as client:
+        changes = atlas.sync(client, size=10)
+    assert not changes.has_changes
+    assert (changes.pages_skipped, changes.unchanged, changes.total) == (5, TOTAL, TOTAL)
+    assert atlas.synced_at is not None and before is not None and atlas.synced_at >= before
+
+
+def test_incremental_sync_reports_and_applies_delta(atlas: LocalAtlas, settings: Settings) -> None:
+    rows = _rows()
+    rows[41]["kontenjan"] = 999  # changed, in the last page
+    removed = rows.pop(44)["kilavuzKodu"]  # removed, in the last page
+    rows.append({**rows[0], "kilavuzKodu": 200000100, "puanTuru": "DİL"})  # added, in the last page
+
+    with _synced_client(settings, [], rows) as client:
+        changes = atlas.sync(client, size=10)
+    assert changes.added == [200000100]
+    assert changes.changed == [200000041]
+    assert changes.removed == [removed]
+    assert changes.pages_skipped == 4
+    assert changes.unchanged == TOTAL - 2
+    assert changes.total == TOTAL
+
+    assert atlas.get_program(removed) is None
+    changed = atlas.get_program(200000041)
+    assert changed is not None and changed.current.kontenjan == 999
+    assert atlas.count({"puan_turu": "DİL"}) == 1
+
+
+def test_shifted_pages_only_write_changed_rows(atlas: LocalAtlas, settings: Settings) -> None:
+    rows = _rows()
+    removed = rows.pop(0)["kilavuzKodu"]  # every later page shifts by one row
+    with _synced_client(settings, [], rows) as client:
+        changes = atlas.sync(client, size=10)
+    assert changes.pages_skipped == 0
+    assert (changes.added, changes.changed, changes.removed) == ([], [], [removed])
+    assert changes.unchanged == TOTAL - 1
+
+
+def test_short_middle_page_keeps_stored_rows(atlas: LocalAtlas, settings: Settings) -> None:
+    rows = _rows()
+    rows[41]["kontenjan"] = 999
+    with _synced_client(settings, [], rows, short_page=2) as client:
+        changes = atlas.sync(client, size=10)
+    assert not changes.complete
+    assert changes.removed == []
+    assert changes.changed == [200000041]
+    assert changes.total == TOTAL
+    assert atlas.get_program(200000029) is not None
+
+    with _synced_client(settings, [], rows) as client:
+        changes = atlas.sync(client, size=10)
+    assert changes.complete and changes.removed == []
+    assert changes.pages_skipped == 4
+
+
+def test_store_from_other_schema_version_is_reset(tmp_path: Path, settings: Settings) -> None:
+    import sqlite3
+
+    path = tmp_path / "old.sqlite"
+    conn = sqlite3.connect(path)
+    conn.executescript(
+        "CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);"
+        "INSERT INTO meta VALUES ('schema_version', '1'), ('synced_at', '1.0');"
+        "CREATE TABLE programs (kilavuz_kodu INTEGER PRIMARY KEY, raw TEXT NOT NULL);"
+    )
+    conn.close()
+    with LocalAtlas(path, settings=settings) as atlas:
+        assert atlas.synced_at is None and atlas.count() == 0
+        with _synced_client(settings, []) as client:
+            assert len(atlas.sync(client).added) == TOTAL
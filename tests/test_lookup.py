@@ -85,3 +85,142 @@ def test_zero_ttl_means_fresh_forever() -> None:
         cities=[],
     )
     assert cache.is_fresh() is True
+
+
+def test_populate_persists_and_load_restores(tmp_path, populated_cache: LookupCache) -> None:
+    path = tmp_path / "lookups.json"
+    populated_cache.path = path
+    populated_cache.populate(
+        universities=populated_cache.universities,
+        program_groups=populated_cache.program_groups,
+        cities=populated_cache.cities,
+    )
+    assert path.exists()
+
+    other = LookupCache(ttl=60, path=path)
+    assert other.is_fresh() is False
+    assert other.load() is True
+    assert other.is_fresh() is True
+    assert other.resolve_university("boğaziçi").universite_id == 1
+    assert other.resolve_city("ankara").il_kodu == 6
+
+
+def test_load_ignores_expired_file(tmp_path) -> None:
+    import json
+
+    path = tmp_path / "lookups.json"
+    path.write_text(
+        json.dumps(
+            {
+                "format": 1,
+                "fetched_at": 0,
+                "universities": [{"universiteId": 1, "universiteAdi": "X"}],
+                "program_groups": [],
+                "cities": [],
+            }
+        )
+    )
+    cache = LookupCache(ttl=60, path=path)
+    assert cache.load() is False
+    assert cache.universities == []
+
+
+def test_stale_tables_stay_usable_within_max_stale(populated_cache: LookupCache) -> None:
+    populated_cache.max_stale = 600
+    populated_cache._snapshot.fetched_at -= 120
+    assert (populated_cache.is_fresh(), populated_cache.is_usable()) == (False, True)
+    assert populated_cache.resolve_city("ankara").il_kodu == 6
+    populated_cache._snapshot.fetched_at -= 600
+    assert populated_cache.is_usable() is False
+
+
+def test_load_ignores_corrupt_file(tmp_path) -> None:
+    path = tmp_path / "lookups.json"
+    path.write_text("{not json")
+    assert LookupCache(ttl=60, path=path).load() is False
+    assert LookupCache(ttl=60, path=tmp_path / "missing.json").load() is False
+
+
+def test_trigram_substring_stage_matches_linear_scan() -> None:
+    from yokatlas_py._lookup import _TrigramIndex
+
+    keys = [
+        normalize(n)
+        for n in (
+            "BOĞAZİÇİ ÜNİVERSİTESİ",
+            "ODTÜ",
+            "İSTANBUL ÜNİVERSİTESİ",
+            "İSTANBUL ÜNİVERSİTESİ-CERRAHPAŞA",
+            "Tıp",
+            "Bilgisayar Mühendisliği",
+        )
+    ]
+    index = _TrigramIndex(keys)
+    queries = [
+        "istanbul",
+        "universitesi",
+        "tip",
+        "ti",
+        "odtu ankara",
+        "bilgisayar muh",
+        "istanbul universitesi-cerrahpasa tip",
+        "",
+        "x",
+        "zzz",
+    ]
+    for q in queries:
+        expected = next((k for k in keys if q in k or k in q), None)
+        assert index.substring(q) == expected, q
+
+
+def test_resolve_many_returns_in_input_order(populated_cache: LookupCache) -> None:
+    cities = populated_cache.resolve_many("city", ["ankara", "İstanbul", "ANKARA"])
+    assert [c.il_kodu for c in cities] == [6, 34, 6]
+    with pytest.raises(ValueError):
+        populated_cache.resolve_many("country", ["x"])  # type: ignore[arg-type]
+    with pytest.raises(LookupError):
+        populated_cache.resolve_many("university", ["boğaziçi", "zzzzzzzzz"])
+
+
+def test_resolution_is_memoized_until_repopulated(
+    populated_cache: LookupCache, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    calls: list[str] = []
+    original = LookupCache._resolve
+
+    def counting(name, *args, **kwargs):  # noqa: ANN001, ANN202
+        calls.append(name)
+        return original(name, *args, **kwargs)
+
+    monkeypatch.setattr(LookupCache, "_resolve", staticmethod(counting))
+    assert populated_cache.resolve_program("bilgisayar").birim_grup_id == 100
+    assert populated_cache.resolve_program("  BİLGİSAYAR ").birim_grup_id == 100
+    assert calls == ["bilgisayar"]
+
+    populated_cache.populate(
+        universities=populated_cache.universities,
+        program_groups=[
+            {"birimGrupId": 300, "birimGrupAdi": "Bilgisayar Mühendisliği", "puanTuru": "SAY"}
+        ],
+        cities=populated_cache.cities,
+    )
+    assert populated_cache.resolve_program("bilgisayar").birim_grup_id == 300
+    assert len(calls) == 2
+
+
+@pytest.mark.parametrize(
+    ("query", "expected"), [("kras", "KARS"), ("rzie", "RİZE"), ("zmri", "İZMİR")]
+)
+def test_fuzzy_resolves_typos_without_shared_trigrams(query: str, expected: str) -> None:
+    cache = LookupCache(ttl=60)
+    cache.populate(
+        universities=[],
+        program_groups=[],
+        cities=[
+            {"ilKodu": 36, "ilAdi": "KARS"},
+            {"ilKodu": 53, "ilAdi": "RİZE"},
+            {"ilKodu": 35, "ilAdi": "İZMİR"},
+            {"ilKodu": 34, "ilAdi": "İSTANBUL"},
+        ],
+    )
+    assert cache.resolve_city(query).il_adi == expected
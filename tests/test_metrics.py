@@ -0,0 +1,152 @@
+"""Tests for the opt-in metrics registry and per-call stage timings."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import httpx
+import pytest
+
+from yokatlas_py.client import YokAtlasClient
+from yokatlas_py.config import Settings
+from yokatlas_py.metrics import CallTiming, Metrics, RequestEvent, stage
+
+from .conftest import (
+    SAMPLE_PROGRAM_RAW,
+    _mock_handler,
+    make_async_client,
+    make_client,
+    make_paged_handler,
+)
+
+SEARCH = "/api/tercih-kilavuz/search"
+
+
+@pytest.fixture()
+def metered() -> Settings:
+    return Settings(
+        base_url="https://yokatlas.example.test",
+        metrics=True,
+        response_cache_size=8,
+        retry_backoff=0.001,
+        retry_backoff_max=0.01,
+    )
+
+
+def test_metrics_disabled_by_default(client: YokAtlasClient) -> None:
+    assert client.metrics is None
+    assert stage("http") is stage("decode")  # the shared no-op context
+
+
+def test_search_records_request_cache_and_stage_breakdown(metered: Settings) -> None:
+    client = make_client(metered)
+    events: list[Any] = []
+    assert client.metrics is not None
+    client.metrics.add_hook(events.append)
+
+    client.search({"universite": "medeniyet"})
+    client.search({"universite": "medeniyet"})
+
+    snap = client.metrics.snapshot()
+    search = next(e for e in snap.endpoints if e.endpoint == SEARCH)
+    assert (search.method, search.requests, search.statuses) == ("POST", 1, {"200": 1})
+    assert search.sent_bytes > 0 and search.received_bytes > 0
+    assert len(snap.endpoints) == 4  # three lookup tables + search
+    assert snap.calls == {"search": 2}
+    assert snap.cache == {"lookup": {"hit": 1, "miss": 1}, "response": {"hit": 1, "miss": 1}}
+
+    timings = [e for e in events if isinstance(e, CallTiming)]
+    assert [t.operation for t in timings] == ["search", "search"]
+    first, cached = timings
+    assert {"coerce", "resolve", "build", "http", "decode", "validate"} <= set(first.stages)
+    assert "http" not in cached.stages
+    assert sum(first.stages.values()) <= first.seconds
+    assert sum(isinstance(e, RequestEvent) for e in events) == 4
+
+
+def test_retries_and_transport_errors_are_counted(metered: Settings) -> None:
+    outcomes: list[Any] = [503, httpx.ReadTimeout("slow")]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == SEARCH and outcomes:
+            outcome = outcomes.pop(0)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return httpx.Response(outcome)
+        return _mock_handler(request)
+
+    client = make_client(metered, handler)
+    assert client.get_program(SAMPLE_PROGRAM_RAW["kilavuzKodu"]) is not None
+    assert client.metrics is not None
+    snap = client.metrics.snapshot()
+    (search,) = snap.endpoints
+    assert search.statuses == {"503": 1, "ReadTimeout": 1, "200": 1}
+    assert search.retries == {"503": 1, "ReadTimeout": 1}
+    assert snap.calls == {"get_program": 1}
+    assert {s.stage for s in snap.stages} >= {"wait", "http", "decode", "validate"}
+
+
+def test_fan_out_folds_into_one_call_across_threads(metered: Settings) -> None:
+    client = make_client(metered, make_paged_handler(50))
+    assert len(client.search_all(size=10, concurrency=4)) == 50
+    assert client.metrics is not None
+    snap = client.metrics.snapshot()
+    assert snap.calls == {"search_all": 1}
+    stages = {s.stage: s for s in snap.stages}
+    # One ``search_all`` call; the five page fetches on worker threads all land in its trace.
+    assert stages["http"].count == 1
+    assert snap.endpoints[0].requests == 5
+
+
+def test_prometheus_exposition() -> None:
+    metrics = Metrics(buckets=(0.1, 1.0))
+    for seconds in (0.05, 0.5, 3.0):
+        metrics.observe_request(
+            endpoint="/x",
+            method="GET",
+            status="200",
+            seconds=seconds,
+            sent_bytes=0,
+            received_bytes=10,
+        )
+    metrics.record_retry(endpoint="/x", method="GET", reason="502")
+    metrics.record_cache('we"ird', hit=False)
+    with metrics.trace("search"):
+        with stage("build"):
+            pass
+
+    text = metrics.to_prometheus()
+    lines = text.splitlines()
+    assert "# TYPE yokatlas_request_duration_seconds histogram" in lines
+    assert 'yokatlas_requests_total{endpoint="/x",method="GET",status="200"} 3' in lines
+    assert (
+        'yokatlas_request_duration_seconds_bucket{endpoint="/x",method="GET",le="0.1"} 1' in lines
+    )
+    assert (
+        'yokatlas_request_duration_seconds_bucket{endpoint="/x",method="GET",le="1.0"} 2' in lines
+    )
+    assert (
+        'yokatlas_request_duration_seconds_bucket{endpoint="/x",method="GET",le="+Inf"} 3' in lines
+    )
+    assert 'yokatlas_request_duration_seconds_count{endpoint="/x",method="GET"} 3' in lines
+    assert 'yokatlas_response_received_bytes_total{endpoint="/x",method="GET"} 30' in lines
+    assert 'yokatlas_retries_total{endpoint="/x",method="GET",reason="502"} 1' in lines
+    assert 'yokatlas_cache_requests_total{cache="we\\"ird",result="miss"} 1' in lines
+    assert 'yokatlas_stage_duration_seconds_count{operation="search",stage="build"} 1' in lines
+    assert text.endswith("\n")
+
+    metrics.reset()
+    assert metrics.snapshot().endpoints == []
+
+
+@pytest.mark.asyncio
+async def test_async_client_metrics(metered: Settings) -> None:
+    shared = Metrics()
+    async with make_async_client(metered, metrics=shared) as client:
+        assert client.metrics is shared
+        found = await client.get_programs([SAMPLE_PROGRAM_RAW["kilavuzKodu"], 1, 2])
+    assert sum(p is not None for p in found.values()) == 1
+    snap = shared.snapshot()
+    assert snap.calls == {"get_programs": 1}
+    assert snap.endpoints[0].requests == 3
+    assert {s.stage for s in snap.stages} >= {"coerce", "build", "http", "decode", "validate"}
@@ -4,7 +4,14 @@ from __future__ import annotations
 
 import pytest
 
-from yokatlas_py.models import Program, SearchFilters, SearchPage, YearlyStats
+from yokatlas_py.models import (
+    LazyProgram,
+    Program,
+    SearchFilters,
+    SearchPage,
+    YearlyStats,
+    parse_search_page,
+)
 
 from .conftest import SAMPLE_PROGRAM_RAW, make_search_response
 
@@ -59,7 +66,9 @@ def test_yearly_stats_handles_missing_fields() -> None:
 
 
 def test_search_page_validates_spring_payload() -> None:
-    page = SearchPage[Program].model_validate(make_search_response([SAMPLE_PROGRAM_RAW], total=1, size=10))
+    page = SearchPage[Program].model_validate(
+        make_search_response([SAMPLE_PROGRAM_RAW], total=1, size=10)
+    )
     assert page.total_elements == 1
     assert page.total_pages == 1
     assert page.size == 10
@@ -103,3 +112,87 @@ def test_search_filters_rejects_smart_id_collision() -> None:
 def test_search_filters_rejects_unknown_fields() -> None:
     with pytest.raises(ValueError):
         SearchFilters.model_validate({"unknown_field": 1})
+
+
+def test_lazy_program_defers_yearly_stats(monkeypatch: pytest.MonkeyPatch) -> None:
+    import yokatlas_py.models as models
+
+    built: list[str] = []
+    original = models._build_yearly_stats
+
+    def counting(data, offset, year):  # noqa: ANN001, ANN202
+        built.append(offset)
+        return original(data, offset, year)
+
+    monkeypatch.setattr(models, "_build_yearly_stats", counting)
+    lazy = LazyProgram.model_validate(SAMPLE_PROGRAM_RAW)
+    assert lazy.universite_adi == "İSTANBUL MEDENİYET ÜNİVERSİTESİ"
+    assert built == []
+
+    assert lazy.current.basari_sirasi == 28226
+    assert built == [0]
+    assert [s.year for s in lazy.all_years] == [2025, 2024, 2023, 2022]
+    lazy.all_years
+    assert built == [0, 1, 2, 3]
+
+
+def test_lazy_program_matches_eager_program() -> None:
+    eager = Program.model_validate(SAMPLE_PROGRAM_RAW)
+    lazy = LazyProgram.model_validate(SAMPLE_PROGRAM_RAW)
+    assert lazy.current == eager.current
+    assert lazy.history == eager.history
+    assert lazy.to_program() == eager
+    assert isinstance(lazy.current, YearlyStats)
+
+
+def test_lazy_program_keeps_structured_yearly_stats() -> None:
+    eager = Program.model_validate(SAMPLE_PROGRAM_RAW)
+    for data in (eager.model_dump(), eager.model_dump(mode="json", by_alias=True)):
+        lazy = LazyProgram.model_validate(data)
+        assert lazy.current == eager.current
+        assert lazy.current.kontenjan == 55
+        assert lazy.history == eager.history
+        assert lazy.to_program() == eager
+
+
+def _varied_rows() -> list[dict]:
+    sparse = {k: v for k, v in SAMPLE_PROGRAM_RAW.items() if not k.endswith(("2", "3"))}
+    snake = {
+        "yil": 2024,
+        "kilavuz_kodu": 7,
+        "universite_id": 1,
+        "universite_adi": " X ",
+        "birim_adi": "Y",
+        "birim_turu_adi": "ONLISANS",
+        "puan_turu": "TYT",
+        "universite_turu": "VAKIF",
+        "min_puan_1": "250.5",
+    }
+    return [
+        SAMPLE_PROGRAM_RAW,
+        sparse,
+        snake,
+        {**SAMPLE_PROGRAM_RAW, "kontenjan": "", "kpss2": None},
+    ]
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_parse_search_page_matches_model_validate(lazy: bool) -> None:
+    raw = make_search_response(_varied_rows(), total=4, size=10)
+    page_cls = SearchPage[LazyProgram] if lazy else SearchPage[Program]
+    parsed = parse_search_page(raw, lazy=lazy)
+    assert type(parsed) is page_cls
+    assert parsed == page_cls.model_validate(raw)
+
+
+def test_yearly_stats_construct_matches_validation() -> None:
+    program = Program.model_validate(_varied_rows()[2])
+    assert program.universite_adi == "X"
+    assert program.history[0] == YearlyStats.model_validate({"year": 2023, "min_puan": 250.5})
+    assert program.history[0].model_fields_set == {"year", "min_puan"}
+    for stats in Program.model_validate(SAMPLE_PROGRAM_RAW).all_years:
+        assert stats == YearlyStats.model_validate(stats.model_dump(exclude_unset=True))
+        assert (
+            stats.model_fields_set
+            == YearlyStats.model_validate(stats.model_dump(exclude_unset=True)).model_fields_set
+        )
@@ -0,0 +1,221 @@
+"""Tests for the query planner and planned searches."""
+
+from __future__ import annotations
+
+import json
+import threading
+from typing import Any
+
+import httpx
+import pytest
+
+from yokatlas_py.config import Settings
+from yokatlas_py.models import SearchFilters
+from yokatlas_py.planner import Probe, QueryPlan, merge_sorted, plan_steps, run_plan
+
+from .conftest import (
+    SAMPLE_PROGRAM_RAW,
+    _mock_handler,
+    make_async_client,
+    make_client,
+    make_search_response,
+)
+
+PUAN_TURLERI = ("SAY", "SÖZ", "EA", "DİL", "TYT")
+
+
+def _row(i: int, *, rank: int | None) -> dict[str, Any]:
+    return {
+        **SAMPLE_PROGRAM_RAW,
+        "kilavuzKodu": 300000000 + i,
+        "puanTuru": PUAN_TURLERI[i % 5],
+        "ilKodu": (34, 6, 35)[i % 3],
+        "basariSirasi": rank,
+        "kontenjan": (i * 37) % 101,
+    }
+
+
+# 400 ranked programs plus a few without a başarı sırası (unreachable by rank bands).
+RANKED = [_row(i, rank=(i * 7919) % 5000 + 1) for i in range(400)]
+UNRANKED = [_row(1000 + i, rank=None) for i in range(6)]
+
+
+def _sort_key(row: dict[str, Any], field: str, descending: bool) -> tuple[Any, ...]:
+    value = row.get(field)
+    if value is None:
+        return (1, 0)
+    return (0, -value if descending else value)
+
+
+class _Api:
+    """Search endpoint honoring the filters and sort options the planner uses."""
+
+    def __init__(self, rows: list[dict[str, Any]]) -> None:
+        self.rows = rows
+        self.bodies: list[dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path != "/api/tercih-kilavuz/search":
+            return _mock_handler(request)
+        payload = json.loads(request.content)
+        with self._lock:
+            self.bodies.append(payload)
+        f = payload["filters"]
+        lo, hi = f["minBasariSirasi"], f["maxBasariSirasi"]
+        matched = [
+            row
+            for row in self.rows
+            if (not f["puanTuru"] or row["puanTuru"] == f["puanTuru"])
+            and (not f["ilKodu"] or row["ilKodu"] in f["ilKodu"])
+            and (lo is None or (row["basariSirasi"] is not None and row["basariSirasi"] >= lo))
+            and (hi is None or (row["basariSirasi"] is not None and row["basariSirasi"] <= hi))
+        ]
+        matched.sort(
+            key=lambda row: _sort_key(row, payload["sortBy"], payload["direction"] == "DESC")
+        )
+        page, size = payload["page"], payload["size"]
+        items = matched[page * size : (page + 1) * size]
+        return httpx.Response(
+            200, json=make_search_response(items, total=len(matched), size=size, page=page)
+        )
+
+    @property
+    def pages(self) -> list[dict[str, Any]]:
+        return [body for body in self.bodies if body["size"] > 1]
+
+
+def _matches(row: dict[str, Any], f: SearchFilters) -> bool:
+    rank = row["basariSirasi"]
+    return (
+        (f.puan_turu is None or row["puanTuru"] == f.puan_turu)
+        and (f.il_kodu is None or row["ilKodu"] in f.il_kodu)
+        and (f.min_basari_sirasi is None or (rank is not None and rank >= f.min_basari_sirasi))
+        and (f.max_basari_sirasi is None or (rank is not None and rank <= f.max_basari_sirasi))
+    )
+
+
+def _codes(
+    rows: list[dict[str, Any]], field: str = "basariSirasi", *, descending: bool = False
+) -> list[int]:
+    return [
+        row["kilavuzKodu"] for row in sorted(rows, key=lambda r: _sort_key(r, field, descending))
+    ]
+
+
+def test_plan_bisects_rank_bands_within_each_puan_turu(settings: Settings) -> None:
+    api = _Api(RANKED)
+    plan = make_client(settings, api).plan_query({"puan_turu": "SAY"}, max_rows=20)
+    assert plan.total == 80
+    assert sum(q.total for q in plan.queries) == 80
+    assert all(q.total <= 20 for q in plan.queries) and not plan.oversized
+    assert all(q.filters.puan_turu == "SAY" and q.filters.max_basari_sirasi for q in plan.queries)
+    bands = sorted((q.filters.min_basari_sirasi, q.filters.max_basari_sirasi) for q in plan.queries)
+    assert all(a[1] < b[0] for a, b in zip(bands, bands[1:]))  # disjoint
+    assert plan.probes == len(api.bodies)
+    assert all(body["size"] == 1 for body in api.bodies)
+
+
+def test_unranked_rows_make_the_planner_fall_back_to_cities(settings: Settings) -> None:
+    rows = RANKED + UNRANKED
+    plan = make_client(settings, _Api(rows)).plan_query(max_rows=40)
+    assert sum(q.total for q in plan.queries) == plan.total == len(rows)
+    # Every row is reached by exactly one sub-query: where a rank split would drop
+    # the unranked rows, the planner split by city instead.
+    assert all(sum(_matches(row, q.filters) for q in plan.queries) == 1 for row in rows)
+    assert any(q.filters.il_kodu for q in plan.queries)
+    assert any(q.filters.min_basari_sirasi for q in plan.queries)
+
+
+def test_unsplittable_query_stays_whole(settings: Settings) -> None:
+    rows = [_row(i, rank=None) | {"puanTuru": "SAY", "ilKodu": 34} for i in range(30)]
+    plan = make_client(settings, _Api(rows)).plan_query(max_rows=10)
+    assert [(q.filters.puan_turu, q.filters.il_kodu, q.total) for q in plan.queries] == [
+        ("SAY", [34], 30)
+    ]
+    assert plan.oversized == plan.queries
+
+
+@pytest.mark.parametrize("sort_by,direction", [("basariSirasi", "ASC"), ("kontenjan", "DESC")])
+def test_search_planned_merges_in_sort_order(
+    settings: Settings, sort_by: str, direction: str
+) -> None:
+    rows = RANKED + UNRANKED
+    api = _Api(rows)
+    client = make_client(settings, api)
+    found = client.search_planned(size=10, max_pages=3, sort_by=sort_by, direction=direction)
+    expected = _codes(rows, sort_by, descending=direction == "DESC")
+    got = [p.kilavuz_kodu for p in found]
+    by_code = {row["kilavuzKodu"]: row for row in rows}
+    assert sorted(got) == sorted(expected)
+    assert [by_code[code][sort_by] for code in got] == [by_code[code][sort_by] for code in expected]
+    # Every sub-query fits in ``max_pages`` pages.
+    assert max(body["page"] for body in api.pages) < 3
+
+
+def test_stored_plan_round_trips(settings: Settings) -> None:
+    client = make_client(settings, _Api(RANKED))
+    plan = client.plan_query({"puan_turu": "EA"}, max_rows=25)
+    stored = QueryPlan.model_validate_json(plan.model_dump_json())
+    found = client.search_planned(plan=stored, size=25)
+    assert [p.kilavuz_kodu for p in found] == _codes([r for r in RANKED if r["puanTuru"] == "EA"])
+    with pytest.raises(ValueError, match="either"):
+        client.search_planned({"puan_turu": "EA"}, plan=stored)
+
+
+def test_plan_steps_and_merge_without_io() -> None:
+    steps = plan_steps(SearchFilters(puan_turu="SAY", max_basari_sirasi=100), max_rows=10)
+    assert next(steps) == [SearchFilters(puan_turu="SAY", max_basari_sirasi=100)]
+    children = steps.send([Probe(15, 100)])
+    assert [(f.min_basari_sirasi, f.max_basari_sirasi) for f in children] == [(1, 50), (51, 100)]
+    with pytest.raises(StopIteration) as done:
+        steps.send([Probe(9, 50), Probe(6, 100)])
+    plan = done.value.value
+    assert [q.total for q in plan.queries] == [9, 6] and plan.probes == 3
+
+    assert (
+        run_plan(plan_steps(SearchFilters(), max_rows=5), lambda batch: [Probe(0, None)]).queries
+        == []
+    )
+    with pytest.raises(ValueError):
+        next(plan_steps(SearchFilters(), max_rows=0))
+
+    parts = [
+        [({"x": 1}, "a"), ({"x": 4}, "d"), ({"x": None}, "n")],
+        [({"x": 2}, "b"), ({"x": 3}, "c")],
+    ]
+    assert merge_sorted(parts, sort_by="x", direction="ASC") == ["a", "b", "c", "d", "n"]
+    desc = [list(reversed(parts[0][:2])) + [parts[0][2]], list(reversed(parts[1]))]
+    assert merge_sorted(desc, sort_by="x", direction="desc") == ["d", "c", "b", "a", "n"]
+
+
+def test_merge_sorted_coerces_mixed_empty_int_and_str_ranks() -> None:
+    key = "basariSirasi"
+    parts = [
+        [({key: 3}, "3"), ({key: "10"}, "10"), ({key: ""}, "empty")],
+        [({key: "9"}, "9"), ({key: 12}, "12"), ({key: None}, "none")],
+    ]
+    assert merge_sorted(parts, sort_by=key, direction="ASC") == [
+        "3",
+        "9",
+        "10",
+        "12",
+        "empty",
+        "none",
+    ]
+    desc = [
+        [({key: "10"}, "10"), ({key: 3}, "3"), ({key: ""}, "empty")],
+        [({key: 12}, "12"), ({key: "9"}, "9")],
+    ]
+    assert merge_sorted(desc, sort_by=key, direction="DESC") == ["12", "10", "9", "3", "empty"]
+
+
+@pytest.mark.asyncio
+async def test_async_search_planned(settings: Settings) -> None:
+    api = _Api(RANKED + UNRANKED)
+    async with make_async_client(settings, api) as client:
+        plan = await client.plan_query({"puan_turu": "TYT"}, max_rows=15)
+        found = await client.search_planned(plan=plan, size=15)
+    expected = [r for r in RANKED + UNRANKED if r["puanTuru"] == "TYT"]
+    assert sum(q.total for q in plan.queries) == len(expected)
+    assert [p.kilavuz_kodu for p in found] == _codes(expected)
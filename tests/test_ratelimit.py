@@ -0,0 +1,151 @@
+"""Tests for the adaptive (AIMD token bucket) rate limiter."""
+
+from __future__ import annotations
+
+import time
+from email.utils import formatdate
+from pathlib import Path
+
+import httpx
+import pytest
+
+import yokatlas_py._ratelimit as mod
+from yokatlas_py._ratelimit import RateLimiter, parse_retry_after
+from yokatlas_py.config import Settings
+from yokatlas_py.exceptions import RateLimitError
+from yokatlas_py.http_client import HttpClient
+
+from .conftest import make_async_http_client, make_http_client
+
+
+@pytest.fixture()
+def clock(monkeypatch: pytest.MonkeyPatch) -> list[float]:
+    now = [1000.0]
+    monkeypatch.setattr(mod._LocalState, "now", staticmethod(lambda: now[0]))
+    monkeypatch.setattr(mod._FileState, "now", staticmethod(lambda: now[0]))
+    return now
+
+
+def test_bucket_allows_burst_then_paces_at_rate(clock: list[float]) -> None:
+    limiter = RateLimiter(rate=4, burst=3)
+    assert [limiter._reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert limiter._reserve() == pytest.approx(0.25)
+    assert limiter._reserve() == pytest.approx(0.5)
+    clock[0] += 10
+    assert limiter.stats.tokens == pytest.approx(3)
+
+
+def test_rate_increases_additively_and_backs_off_multiplicatively(clock: list[float]) -> None:
+    limiter = RateLimiter(rate=4, burst=5, min_rate=1, max_rate=6, increase=2)
+    limiter.on_success()
+    assert limiter.stats.rate == pytest.approx(4.5)
+    for _ in range(50):
+        limiter.on_success()
+    assert limiter.stats.rate == 6
+
+    limiter.on_throttle()
+    assert limiter.stats.rate == 3
+    for _ in range(5):
+        limiter.on_throttle()
+    stats = limiter.stats
+    assert (stats.rate, stats.throttles) == (1, 6)
+
+
+def test_throttle_drains_bucket_and_honors_retry_after(clock: list[float]) -> None:
+    limiter = RateLimiter(rate=10, burst=10)
+    limiter.on_throttle(retry_after=2.0)
+    # rate halves to 5 req/s; the next token is due after the 2 s cool-down
+    assert limiter._reserve() == pytest.approx(2.2)
+    clock[0] += 5
+    assert limiter._reserve() == 0.0
+
+
+def test_shared_file_mode_spans_limiter_instances(tmp_path: Path, clock: list[float]) -> None:
+    path = tmp_path / "bucket.json"
+    a = RateLimiter(rate=2, burst=2, path=path)
+    b = RateLimiter(rate=2, burst=2, path=path)
+    assert a._reserve() == 0.0
+    assert b._reserve() == 0.0
+    assert a._reserve() == pytest.approx(0.5)
+    b.on_throttle()
+    assert a.stats.rate == 1 and a.stats.throttles == 1
+
+
+def test_parse_retry_after() -> None:
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after("soon") is None
+    delay = parse_retry_after(formatdate(timeval=time.time() + 30, usegmt=True))
+    assert delay is not None and 0 < delay <= 30
+
+
+def test_rate_limit_disabled_by_default() -> None:
+    assert RateLimiter.from_settings(Settings()) is None
+    assert HttpClient(settings=Settings()).rate_limiter is None
+
+
+def _throttling_handler(statuses: list[int]):
+    def handler(request: httpx.Request) -> httpx.Response:
+        status = statuses.pop(0)
+        headers = {"Retry-After": "0"} if status == 429 else {}
+        return httpx.Response(status, json={"ok": status == 200}, headers=headers)
+
+    return handler
+
+
+def test_http_client_adapts_rate_on_responses() -> None:
+    settings = Settings(
+        base_url="https://yokatlas.example.test",
+        rate_limit=100,
+        rate_limit_max=200,
+        retry_attempts=0,
+    )
+    http = make_http_client(settings, _throttling_handler([200, 429, 200]))
+    assert http.rate_limiter is not None
+
+    assert http.get_json("/x") == {"ok": True}
+    assert http.rate_limiter.stats.rate == pytest.approx(100.01)
+    with pytest.raises(RateLimitError):
+        http.get_json("/x")
+    assert http.rate_limiter.stats.rate == pytest.approx(50.005)
+    assert http.rate_limiter.stats.throttles == 1
+    assert http.get_json("/x") == {"ok": True}
+
+
+@pytest.mark.asyncio
+async def test_async_http_client_adapts_rate_on_responses() -> None:
+    settings = Settings(base_url="https://yokatlas.example.test", rate_limit=100, retry_attempts=0)
+    http = make_async_http_client(settings, _throttling_handler([418, 200]))
+    with pytest.raises(RateLimitError):
+        await http.get_json("/x")
+    assert await http.get_json("/x") == {"ok": True}
+    assert http.rate_limiter is not None and http.rate_limiter.stats.throttles == 1
+
+
+@pytest.mark.asyncio
+async def test_async_shared_mode_locks_the_file_off_the_event_loop(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    import threading
+
+    threads: list[int] = []
+    transaction = mod._FileState.transaction
+
+    def tracking(self: mod._FileState):  # type: ignore[no-untyped-def]
+        threads.append(threading.get_ident())
+        return transaction(self)
+
+    monkeypatch.setattr(mod._FileState, "transaction", tracking)
+    settings = Settings(
+        base_url="https://yokatlas.example.test",
+        rate_limit=100,
+        rate_limit_path=tmp_path / "bucket.json",
+        retry_attempts=0,
+    )
+    http = make_async_http_client(settings, _throttling_handler([429, 200]))
+    with pytest.raises(RateLimitError):
+        await http.get_json("/x")
+    assert await http.get_json("/x") == {"ok": True}
+    # reserve + throttle, reserve + success
+    assert len(threads) == 4 and threading.get_ident() not in threads
+    assert http.rate_limiter is not None and http.rate_limiter.stats.throttles == 1
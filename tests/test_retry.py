@@ -0,0 +1,122 @@
+"""Tests for the application-level retry policy."""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+import httpx
+import pytest
+
+from yokatlas_py._retry import RetryPolicy
+from yokatlas_py.config import Settings
+from yokatlas_py.exceptions import APIError, RateLimitError
+
+from .conftest import make_async_http_client, make_client, make_http_client, make_paged_handler
+
+
+@pytest.fixture()
+def fast_retries() -> Settings:
+    return Settings(
+        base_url="https://yokatlas.example.test", retry_backoff=0.001, retry_backoff_max=0.01
+    )
+
+
+def _scripted(outcomes: list[Any], seen: list[str] | None = None):
+    """Handler replaying ``outcomes``: an int status, an exception instance, or ``None`` for 200."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if seen is not None:
+            seen.append(request.method)
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        if outcome is None:
+            return httpx.Response(200, json={"ok": True})
+        headers = {"Retry-After": "0"} if outcome == 429 else {}
+        return httpx.Response(outcome, json={"error": outcome}, headers=headers)
+
+    return handler
+
+
+def test_transient_failures_are_retried(fast_retries: Settings) -> None:
+    outcomes: list[Any] = [502, httpx.ReadTimeout("slow"), 429, None]
+    http = make_http_client(fast_retries, _scripted(outcomes))
+    assert http.get_json("/x") == {"ok": True}
+    stats = http.retry_policy.stats
+    assert stats.retries == 3 and stats.exhausted == 0
+    assert stats.reasons == {"502": 1, "ReadTimeout": 1, "429": 1}
+
+
+def test_gives_up_after_retry_count(fast_retries: Settings) -> None:
+    http = make_http_client(fast_retries, _scripted([503] * 4))
+    with pytest.raises(APIError) as info:
+        http.get_json("/x")
+    assert info.value.status_code == 503
+    assert http.retry_policy.stats.retries == 3
+    assert http.retry_policy.stats.exhausted == 1
+
+
+def test_per_call_retry_override_and_non_retryable_status(fast_retries: Settings) -> None:
+    http = make_http_client(fast_retries, _scripted([429, 400]))
+    with pytest.raises(RateLimitError):
+        http.get_json("/x", retries=0)
+    with pytest.raises(APIError):
+        http.get_json("/x")
+    assert http.retry_policy.stats.retries == 0
+
+
+def test_post_is_retried_only_when_idempotent(fast_retries: Settings) -> None:
+    seen: list[str] = []
+    http = make_http_client(
+        fast_retries, _scripted([502, 502, None, httpx.ConnectError("refused"), None], seen)
+    )
+    with pytest.raises(APIError):
+        http.post_json("/x", json_body={})
+    assert http.post_json("/x", json_body={}, idempotent=True) == {"ok": True}
+    # A request that never reached the server is safe to resend either way.
+    assert http.post_json("/x", json_body={}) == {"ok": True}
+    assert seen == ["POST"] * 5
+
+
+def test_retry_after_beyond_budget_gives_up(fast_retries: Settings) -> None:
+    settings = fast_retries.model_copy(update={"retry_budget": 5.0})
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(429, headers={"Retry-After": "60"})
+
+    with pytest.raises(RateLimitError):
+        make_http_client(settings, handler).get_json("/x")
+
+
+def test_full_jitter_stays_within_exponential_cap() -> None:
+    policy = RetryPolicy(backoff=1.0, backoff_max=5.0)
+    for attempt, cap in [(0, 1.0), (1, 2.0), (2, 4.0), (6, 5.0)]:
+        delays = [policy.backoff_delay(attempt) for _ in range(200)]
+        assert all(0 <= d <= cap for d in delays)
+        assert max(delays) > cap / 2
+
+
+def test_search_crawl_survives_a_502(fast_retries: Settings) -> None:
+    paged = make_paged_handler(30)
+    failures = {2: 1}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/api/tercih-kilavuz/search":
+            number = json.loads(request.content)["page"]
+            if failures.get(number):
+                failures[number] -= 1
+                return httpx.Response(502)
+        return paged(request)
+
+    client = make_client(fast_retries, handler)
+    assert len(client.search_all(size=10)) == 30
+    assert client._http.retry_policy.stats.reasons == {"502": 1}
+
+
+@pytest.mark.asyncio
+async def test_async_client_retries(fast_retries: Settings) -> None:
+    outcomes: list[Any] = [500, httpx.RemoteProtocolError("reset"), None]
+    http = make_async_http_client(fast_retries, _scripted(outcomes))
+    assert await http.post_json("/x", json_body={}, idempotent=True) == {"ok": True}
+    assert http.retry_policy.stats.retries == 2
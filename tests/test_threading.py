@@ -0,0 +1,138 @@
+"""Stress tests for sharing one ``YokAtlasClient`` / ``LookupCache`` across threads."""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+import httpx
+
+from yokatlas_py._lookup import LookupCache
+from yokatlas_py.client import YokAtlasClient
+from yokatlas_py.config import Settings
+
+from .conftest import (
+    SAMPLE_CITIES,
+    SAMPLE_PROGRAMS,
+    SAMPLE_UNIVERSITIES,
+    _mock_handler,
+    make_client,
+)
+
+THREADS = 32
+
+
+def _counting_client(
+    settings: Settings, calls: Counter[str], *, delay: float = 0.05
+) -> YokAtlasClient:
+    lock = threading.Lock()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        with lock:
+            calls[path] += 1
+        if not path.endswith("/search"):
+            time.sleep(delay)  # widen the window in which other threads find the cache cold
+        return _mock_handler(request)
+
+    return make_client(settings, handler)
+
+
+def test_cold_cache_is_fetched_by_one_thread(settings: Settings) -> None:
+    calls: Counter[str] = Counter()
+    client = _counting_client(settings, calls)
+    queries = [
+        {"universite": "medeniyet"},
+        {"program": "bilgisayar", "il": "ankara"},
+        {"il": ["istanbul", "izmir"]},
+    ]
+    barrier = threading.Barrier(THREADS)
+
+    def run(i: int) -> int:
+        barrier.wait()
+        return len(client.search(queries[i % len(queries)]).content)
+
+    with ThreadPoolExecutor(THREADS) as pool:
+        assert all(n == 1 for n in pool.map(run, range(THREADS)))
+
+    lookups = {path: n for path, n in calls.items() if not path.endswith("/search")}
+    assert lookups == {
+        "/api/tercih-kilavuz/universiteler": 1,
+        "/api/tercih-kilavuz/universite-programlar": 1,
+        "/api/tercih-kilavuz/universite-iller": 1,
+    }
+    assert calls["/api/tercih-kilavuz/search"] == THREADS
+
+
+def test_refresh_during_smart_searches_never_exposes_partial_tables(settings: Settings) -> None:
+    calls: Counter[str] = Counter()
+    client = _counting_client(settings, calls, delay=0.001)
+    client.list_universities()
+    stop = threading.Event()
+    errors: list[BaseException] = []
+
+    def searcher() -> None:
+        while not stop.is_set():
+            try:
+                client.search({"universite": "boğaziçi", "program": "tıp", "il": "izmir"})
+            except BaseException as exc:  # noqa: BLE001 - collected for the assertion below
+                errors.append(exc)
+                return
+
+    threads = [threading.Thread(target=searcher) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for _ in range(20):
+        client.refresh_lookups()
+    stop.set()
+    for t in threads:
+        t.join()
+    assert errors == []
+    assert calls["/api/tercih-kilavuz/universiteler"] == 21
+
+
+def _tables(offset: int) -> dict[str, list[dict[str, Any]]]:
+    return {
+        "universities": [
+            {**u, "universiteId": u["universiteId"] + offset} for u in SAMPLE_UNIVERSITIES
+        ],
+        "program_groups": [
+            {**p, "birimGrupId": p["birimGrupId"] + offset} for p in SAMPLE_PROGRAMS
+        ],
+        "cities": SAMPLE_CITIES,
+    }
+
+
+def test_resolution_sees_whole_snapshots_while_tables_are_swapped() -> None:
+    cache = LookupCache(ttl=0)
+    generations = [_tables(0), _tables(1_000_000)]
+    cache.populate(**generations[0])
+    stop = threading.Event()
+    seen: set[tuple[int, int]] = set()
+    errors: list[BaseException] = []
+
+    def reader() -> None:
+        while not stop.is_set():
+            try:
+                snap = cache._snapshot
+                uni = cache._memoized(snap, "university", "boğaziçi", 0.6)
+                prog = cache._memoized(snap, "program", "bilgisayar", 0.6)
+                seen.add((uni.universite_id, prog.birim_grup_id))  # type: ignore[attr-defined]
+            except BaseException as exc:  # noqa: BLE001
+                errors.append(exc)
+                return
+
+    threads = [threading.Thread(target=reader) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for i in range(200):
+        cache.populate(**generations[i % 2])
+    stop.set()
+    for t in threads:
+        t.join()
+    assert errors == []
+    # Both names always come from the same generation.
+    assert seen <= {(173500, 4001), (1173500, 1004001)}
@@ -1,34 +1,53 @@
-"""yokatlas-py — Python client for the YÖK Atlas tercih kılavuzu JSON API."""
+"""yokatlas-py — Python client for the YÖK Atlas tercih kılavuzu JSON API.
+
+Public names are imported on first access (PEP 562), so ``import yokatlas_py``
+stays cheap: httpx, pydantic-settings and the models load only when a name
+that needs them is used, and the default :class:`Settings` is read from the
+environment only when first requested.
+"""
 
 from __future__ import annotations
 
-from .client import (
-    AsyncYokAtlasClient,
-    YokAtlasClient,
-    get_program,
-    list_cities,
-    list_program_groups,
-    list_universities,
-    search_programs,
-)
-from .config import Settings, settings
-from .exceptions import (
-    APIError,
-    LookupError,
-    NotFoundError,
-    RateLimitError,
-    YokAtlasError,
-)
-from .models import (
-    City,
-    Program,
-    ProgramGroup,
-    PuanTuru,
-    SearchFilters,
-    SearchPage,
-    University,
-    YearlyStats,
-)
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from ._lookup import normalize
+    from .client import (
+        AsyncYokAtlasClient,
+        YokAtlasClient,
+        get_program,
+        get_programs,
+        list_cities,
+        list_program_groups,
+        list_universities,
+        search_programs,
+    )
+    from .columns import programs_to_columns
+    from .config import Settings, settings
+    from .crawl import CrawlResult, crawl
+    from .exceptions import (
+        APIError,
+        LookupError,
+        NotFoundError,
+        RateLimitError,
+        YokAtlasError,
+    )
+    from .history import HistoryTensor, history_tensor
+    from .local import LocalAtlas, SyncChanges
+    from .metrics import Metrics
+    from .models import (
+        City,
+        LazyProgram,
+        Program,
+        ProgramGroup,
+        PuanTuru,
+        SearchFilters,
+        SearchPage,
+        University,
+        YearlyStats,
+    )
+    from .planner import QueryPlan
 
 __version__ = "0.6.0"
 
@@ -38,12 +57,24 @@ __all__ = [
     "YokAtlasClient",
     # Convenience
     "get_program",
+    "get_programs",
     "list_cities",
     "list_program_groups",
     "list_universities",
     "search_programs",
+    # Offline
+    "LocalAtlas",
+    "SyncChanges",
+    # Bulk extraction
+    "CrawlResult",
+    "crawl",
+    # Export
+    "programs_to_columns",
+    "HistoryTensor",
+    "history_tensor",
     # Models
     "City",
+    "LazyProgram",
     "Program",
     "ProgramGroup",
     "PuanTuru",
@@ -51,7 +82,11 @@ __all__ = [
     "SearchPage",
     "University",
     "YearlyStats",
+    "QueryPlan",
+    # Utilities
+    "normalize",
     # Configuration
+    "Metrics",
     "Settings",
     "settings",
     # Exceptions
@@ -63,3 +98,58 @@ __all__ = [
     # Version
     "__version__",
 ]
+
+_EXPORTS: dict[str, str] = {
+    **dict.fromkeys(
+        [
+            "AsyncYokAtlasClient",
+            "YokAtlasClient",
+            "get_program",
+            "get_programs",
+            "list_cities",
+            "list_program_groups",
+            "list_universities",
+            "search_programs",
+        ],
+        ".client",
+    ),
+    **dict.fromkeys(["LocalAtlas", "SyncChanges"], ".local"),
+    **dict.fromkeys(["CrawlResult", "crawl"], ".crawl"),
+    "programs_to_columns": ".columns",
+    **dict.fromkeys(["HistoryTensor", "history_tensor"], ".history"),
+    **dict.fromkeys(
+        [
+            "City",
+            "LazyProgram",
+            "Program",
+            "ProgramGroup",
+            "PuanTuru",
+            "SearchFilters",
+            "SearchPage",
+            "University",
+            "YearlyStats",
+        ],
+        ".models",
+    ),
+    "QueryPlan": ".planner",
+    "normalize": "._lookup",
+    "Metrics": ".metrics",
+    **dict.fromkeys(["Settings", "settings"], ".config"),
+    **dict.fromkeys(
+        ["APIError", "LookupError", "NotFoundError", "RateLimitError", "YokAtlasError"],
+        ".exceptions",
+    ),
+}
+
+
+def __getattr__(name: str) -> Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(__all__)
@@ -0,0 +1,7 @@
+"""``python -m yokatlas_py`` runs the ``yokatlas`` command-line tool."""
+
+import sys
+
+from .cli import main
+
+sys.exit(main())
@@ -0,0 +1,192 @@
+"""Tiered (memory LRU + optional disk) cache for raw search responses."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import threading
+import time
+import warnings
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+from pydantic import BaseModel
+
+from ._storage import atomic_write_json, read_json
+from .config import Settings
+
+
+def canonical_key(body: dict[str, Any]) -> str:
+    """Stable hash of a request body (key order and whitespace independent)."""
+    encoded = json.dumps(body, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class CacheStats(BaseModel):
+    """Snapshot of :class:`ResponseCache` counters."""
+
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    size: int = 0
+
+    @property
+    def hits(self) -> int:
+        return self.memory_hits + self.disk_hits
+
+
+class ResponseCache:
+    """Two-tier cache of decoded search responses keyed by :func:`canonical_key`.
+
+    The memory tier is an LRU bounded to ``maxsize`` entries; the optional disk
+    tier stores one JSON file per key under ``path``. A TTL of ``0`` disables
+    expiry for that tier. Disk hits are promoted into memory.
+    """
+
+    def __init__(
+        self,
+        *,
+        maxsize: int,
+        ttl: float,
+        path: Path | None = None,
+        disk_ttl: float = 0,
+    ) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.path = path
+        self.disk_ttl = disk_ttl
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._memory_hits = 0
+        self._disk_hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "ResponseCache | None":
+        """Build the cache described by ``settings``, or ``None`` if it is disabled."""
+        if settings.response_cache_size <= 0 and settings.response_cache_path is None:
+            return None
+        return cls(
+            maxsize=settings.response_cache_size,
+            ttl=settings.response_cache_ttl,
+            path=settings.response_cache_path,
+            disk_ttl=settings.response_cache_disk_ttl,
+        )
+
+    @property
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                memory_hits=self._memory_hits,
+                disk_hits=self._disk_hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                size=len(self._entries),
+            )
+
+    def get(self, key: str) -> Any | None:
+        now = time.monotonic()
+        value = self._memory_get(key, now)
+        if value is not None:
+            return value
+        return self._promote(key, self._disk_get(key), now)
+
+    async def aget(self, key: str) -> Any | None:
+        """:meth:`get` for the event loop: the disk tier is read in a worker thread."""
+        now = time.monotonic()
+        value = self._memory_get(key, now)
+        if value is not None:
+            return value
+        if self.path is not None:
+            value = await asyncio.to_thread(self._disk_get, key)
+        return self._promote(key, value, now)
+
+    def set(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._remember(key, value, time.monotonic())
+        if self.path is not None:
+            self._disk_set(key, value)
+
+    async def aset(self, key: str, value: Any) -> None:
+        """:meth:`set` for the event loop: the disk tier is written in a worker thread."""
+        with self._lock:
+            self._remember(key, value, time.monotonic())
+        if self.path is not None:
+            await asyncio.to_thread(self._disk_set, key, value)
+
+    def clear(self) -> None:
+        """Drop every memory entry and disk file; counters are kept."""
+        with self._lock:
+            self._entries.clear()
+        if self.path is not None and self.path.is_dir():
+            for file in self.path.glob("*.json"):
+                file.unlink(missing_ok=True)
+
+    # ---- internals ---------------------------------------------------------
+
+    def _memory_get(self, key: str, now: float) -> Any | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, value = entry
+            if self.ttl <= 0 or now - stored_at < self.ttl:
+                self._entries.move_to_end(key)
+                self._memory_hits += 1
+                return value
+            del self._entries[key]
+            return None
+
+    def _promote(self, key: str, value: Any | None, now: float) -> Any | None:
+        """Count a disk hit (and copy it into memory) or a miss."""
+        with self._lock:
+            if value is None:
+                self._misses += 1
+                return None
+            self._disk_hits += 1
+            self._remember(key, value, now)
+        return value
+
+    def _remember(self, key: str, value: Any, now: float) -> None:
+        if self.maxsize <= 0:
+            return
+        self._entries[key] = (now, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+
+    def _disk_path(self, key: str) -> Path:
+        return self.path / f"{key}.json"  # type: ignore[operator]
+
+    def _disk_set(self, key: str, value: Any) -> None:
+        try:
+            atomic_write_json(self._disk_path(key), {"stored_at": time.time(), "value": value})
+        except OSError as exc:
+            warnings.warn(
+                f"Could not write response cache entry to {self.path}: {exc}",
+                RuntimeWarning,
+                stacklevel=3,
+            )
+
+    def _disk_get(self, key: str) -> Any | None:
+        if self.path is None:
+            return None
+        data = read_json(self._disk_path(key))
+        if not isinstance(data, dict) or "value" not in data:
+            return None
+        try:
+            age = time.time() - float(data["stored_at"])
+        except (KeyError, TypeError, ValueError):
+            return None
+        if self.disk_ttl > 0 and age >= self.disk_ttl:
+            self._disk_path(key).unlink(missing_ok=True)
+            return None
+        return data["value"]
+
+
+__all__ = ["CacheStats", "ResponseCache", "canonical_key"]
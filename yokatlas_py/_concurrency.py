@@ -0,0 +1,103 @@
+"""Bounded-window fan-out helpers shared by the sync and async clients."""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from itertools import islice
+from typing import AsyncIterator, Awaitable, Callable, Iterable, Iterator, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def _check_concurrency(concurrency: int) -> None:
+    if concurrency < 1:
+        raise ValueError(f"concurrency must be >= 1 (got {concurrency!r})")
+
+
+def _submit(pool: ThreadPoolExecutor, fn: Callable[[T], R], item: T) -> Future[R]:
+    # Run in a copy of the caller's context so context variables (e.g. the
+    # active metrics trace) are visible on the worker thread.
+    return pool.submit(contextvars.copy_context().run, fn, item)
+
+
+def iter_bounded(
+    fn: Callable[[T], R],
+    items: Iterable[T],
+    *,
+    concurrency: int,
+    ordered: bool = True,
+) -> Iterator[R]:
+    """Run ``fn`` over ``items`` on a thread pool with at most ``concurrency`` calls in flight.
+
+    With ``ordered=True`` results are yielded in input order; otherwise in
+    completion order. Closing the iterator early cancels calls not yet started.
+    """
+    _check_concurrency(concurrency)
+    source = iter(items)
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="yokatlas") as pool:
+        pending: deque[Future[R]] = deque(
+            _submit(pool, fn, item) for item in islice(source, concurrency)
+        )
+        try:
+            if ordered:
+                while pending:
+                    result = pending.popleft().result()
+                    for item in islice(source, 1):
+                        pending.append(_submit(pool, fn, item))
+                    yield result
+            else:
+                while pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for fut in done:
+                        pending.remove(fut)
+                    for item in islice(source, len(done)):
+                        pending.append(_submit(pool, fn, item))
+                    for fut in done:
+                        yield fut.result()
+        finally:
+            for fut in pending:
+                fut.cancel()
+
+
+async def aiter_bounded(
+    fn: Callable[[T], Awaitable[R]],
+    items: Iterable[T],
+    *,
+    concurrency: int,
+    ordered: bool = True,
+) -> AsyncIterator[R]:
+    """Async counterpart of :func:`iter_bounded` built on :func:`asyncio.create_task`."""
+    _check_concurrency(concurrency)
+    source = iter(items)
+    pending: deque[asyncio.Task[R]] = deque(
+        asyncio.ensure_future(fn(item)) for item in islice(source, concurrency)
+    )
+    try:
+        if ordered:
+            while pending:
+                result = await pending[0]
+                pending.popleft()
+                for item in islice(source, 1):
+                    pending.append(asyncio.ensure_future(fn(item)))
+                yield result
+        else:
+            while pending:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    pending.remove(task)
+                for item in islice(source, len(done)):
+                    pending.append(asyncio.ensure_future(fn(item)))
+                for task in done:
+                    yield task.result()
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+
+__all__ = ["aiter_bounded", "iter_bounded"]
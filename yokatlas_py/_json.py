@@ -0,0 +1,103 @@
+"""Pluggable JSON codecs (orjson / msgspec / stdlib) for the HTTP layer.
+
+Every codec encodes to and decodes from UTF-8 ``bytes``, so response bodies
+are parsed straight from ``response.content`` without an intermediate ``str``.
+"""
+
+from __future__ import annotations
+
+import json
+from functools import cache
+from typing import Any, Callable, Literal
+
+JsonCodecName = Literal["auto", "orjson", "msgspec", "json"]
+
+
+class JsonCodec:
+    """A named pair of ``dumps``/``loads`` functions over ``bytes``.
+
+    ``errors`` lists the exception types ``loads`` raises on malformed input.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        dumps: Callable[[Any], bytes],
+        loads: Callable[[bytes], Any],
+        errors: tuple[type[Exception], ...],
+    ) -> None:
+        self.name = name
+        self.dumps = dumps
+        self.loads = loads
+        self.errors = errors
+
+    def __repr__(self) -> str:
+        return f"JsonCodec({self.name!r})"
+
+
+def _stdlib_codec() -> JsonCodec:
+    def dumps(obj: Any) -> bytes:
+        # Same output as httpx's own ``json=`` encoding.
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), allow_nan=False).encode(
+            "utf-8"
+        )
+
+    return JsonCodec("json", dumps=dumps, loads=json.loads, errors=(ValueError,))
+
+
+def _orjson_codec() -> JsonCodec:
+    import orjson
+
+    return JsonCodec(
+        "orjson", dumps=orjson.dumps, loads=orjson.loads, errors=(orjson.JSONDecodeError,)
+    )
+
+
+def _msgspec_codec() -> JsonCodec:
+    import msgspec
+
+    return JsonCodec(
+        "msgspec",
+        dumps=msgspec.json.encode,
+        loads=msgspec.json.decode,
+        errors=(msgspec.DecodeError,),
+    )
+
+
+_FACTORIES: dict[str, Callable[[], JsonCodec]] = {
+    "orjson": _orjson_codec,
+    "msgspec": _msgspec_codec,
+    "json": _stdlib_codec,
+}
+
+
+@cache
+def get_codec(name: JsonCodecName = "auto") -> JsonCodec:
+    """Return the codec called ``name``.
+
+    ``"auto"`` picks the first installed of orjson, msgspec and the stdlib
+    ``json`` module. Naming an uninstalled library raises :class:`ImportError`.
+    """
+    if name == "auto":
+        for candidate in ("orjson", "msgspec"):
+            try:
+                return _FACTORIES[candidate]()
+            except ImportError:
+                continue
+        return _stdlib_codec()
+    try:
+        factory = _FACTORIES[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown JSON codec {name!r}; expected one of 'auto', 'orjson', 'msgspec', 'json'"
+        ) from None
+    try:
+        return factory()
+    except ImportError as exc:
+        raise ImportError(
+            f"json_codec={name!r} requires {name}: pip install 'yokatlas-py[{name}]'"
+        ) from exc
+
+
+__all__ = ["JsonCodec", "JsonCodecName", "get_codec"]
@@ -2,13 +2,21 @@
 
 from __future__ import annotations
 
+import threading
 import time
+import warnings
+from collections import OrderedDict
 from difflib import get_close_matches
-from typing import Iterable
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterable, Literal
 
+from ._storage import atomic_write_json, read_json
 from .exceptions import LookupError as _LookupError
-from .models import City, ProgramGroup, University
 
+if TYPE_CHECKING:
+    from .models import City, ProgramGroup, University
+
+# fmt: off
 _TR_TRANSLATION = str.maketrans(
     {
         "İ": "I", "ı": "i",
@@ -19,6 +27,7 @@ _TR_TRANSLATION = str.maketrans(
         "Ü": "U", "ü": "u",
     }
 )
+# fmt: on
 
 
 def normalize(text: str) -> str:
@@ -26,25 +35,167 @@ def normalize(text: str) -> str:
     return " ".join(text.translate(_TR_TRANSLATION).lower().split())
 
 
+def _trigrams(text: str) -> set[str]:
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+# How many of the best trigram-overlap candidates are scored with difflib.
+_FUZZY_POOL = 32
+
+
+class _TrigramIndex:
+    """Character-trigram inverted index over normalized lookup keys.
+
+    Narrows the candidates for the substring and fuzzy stages of
+    :meth:`LookupCache._resolve`: substring candidates are still checked in
+    insertion order, and difflib scores the best-overlapping keys first,
+    falling back to every key when none of those is close enough.
+    """
+
+    def __init__(self, keys: Iterable[str]) -> None:
+        self.keys: list[str] = list(keys)
+        self._sizes: list[int] = []
+        self._postings: dict[str, list[int]] = {}
+        self._short: list[int] = []
+        for pos, key in enumerate(self.keys):
+            grams = _trigrams(key)
+            self._sizes.append(len(grams))
+            if not grams:
+                self._short.append(pos)
+            for gram in grams:
+                self._postings.setdefault(gram, []).append(pos)
+
+    def _overlap(self, grams: set[str]) -> dict[int, int]:
+        counts: dict[int, int] = {}
+        for gram in grams:
+            for pos in self._postings.get(gram, ()):
+                counts[pos] = counts.get(pos, 0) + 1
+        return counts
+
+    def substring(self, key: str) -> str | None:
+        """First key (insertion order) that contains ``key`` or is contained in it."""
+        grams = _trigrams(key)
+        if not grams:
+            return next((k for k in self.keys if key in k or k in key), None)
+        counts = self._overlap(grams)
+        wanted = len(grams)
+        # A key containing ``key`` has all of its trigrams; a key contained in
+        # ``key`` has all of *its own* trigrams among them (or has none at all).
+        candidates = [pos for pos, n in counts.items() if n == wanted or n == self._sizes[pos]]
+        candidates.extend(self._short)
+        for pos in sorted(candidates):
+            k = self.keys[pos]
+            if key in k or k in key:
+                return k
+        return None
+
+    def fuzzy_pool(self, key: str) -> list[str]:
+        """Keys worth scoring with difflib, best trigram overlap (Dice) first."""
+        grams = _trigrams(key)
+        if not grams:
+            return self.keys
+        counts = self._overlap(grams)
+        size = len(grams)
+        ranked = sorted(counts, key=lambda pos: -2 * counts[pos] / (size + self._sizes[pos]))
+        return [self.keys[pos] for pos in ranked[:_FUZZY_POOL]]
+
+
+_DISK_FORMAT = 1
+
+# Upper bound on memoized ``normalized name → entry`` resolutions per cache.
+_MEMO_SIZE = 2048
+
+LookupKind = Literal["university", "program", "city"]
+
+
+class _Snapshot:
+    """One immutable generation of the lookup tables, their indexes and resolution memo.
+
+    :class:`LookupCache` publishes a new snapshot with a single attribute
+    assignment, so a reader that grabs ``cache._snapshot`` once sees either
+    the old tables or the new ones, never a mix. The memo belongs to its
+    snapshot and disappears with it.
+    """
+
+    __slots__ = (
+        "fetched_at",
+        "universities",
+        "program_groups",
+        "cities",
+        "tables",
+        "memo",
+        "memo_lock",
+    )
+
+    def __init__(
+        self,
+        *,
+        universities: list[University],
+        program_groups: list[ProgramGroup],
+        cities: list[City],
+        fetched_at: float,
+    ) -> None:
+        self.fetched_at = fetched_at
+        self.universities = universities
+        self.program_groups = program_groups
+        self.cities = cities
+        uni_index = {normalize(u.universite_adi): u for u in universities}
+        prog_index = {normalize(p.birim_grup_adi): p for p in program_groups}
+        city_index = {normalize(c.il_adi): c for c in cities}
+        self.tables: dict[str, tuple[dict[str, object], _TrigramIndex]] = {
+            "university": (uni_index, _TrigramIndex(uni_index)),  # type: ignore[dict-item]
+            "program": (prog_index, _TrigramIndex(prog_index)),  # type: ignore[dict-item]
+            "city": (city_index, _TrigramIndex(city_index)),  # type: ignore[dict-item]
+        }
+        self.memo: OrderedDict[tuple[str, str, float], object] = OrderedDict()
+        self.memo_lock = threading.Lock()
+
+
+_EMPTY = _Snapshot(universities=[], program_groups=[], cities=[], fetched_at=0.0)
+
+
 class LookupCache:
-    """In-process TTL cache holding the three lookup tables."""
+    """In-process TTL cache holding the three lookup tables.
+
+    When ``path`` is given, :meth:`populate` also persists the tables to that
+    file and :meth:`load` restores them in another process, as long as the
+    stored copy is still usable.
 
-    def __init__(self, *, ttl: int) -> None:
+    With ``max_stale > 0`` (stale-while-revalidate) tables older than ``ttl``
+    remain usable for another ``max_stale`` seconds: :meth:`is_fresh` turns
+    false, so callers refresh in the background, while :meth:`is_usable`
+    stays true so they keep resolving against the old tables meanwhile.
+
+    Thread-safe: :meth:`populate`, :meth:`load` and :meth:`invalidate` build
+    a complete new snapshot and swap it in atomically, so concurrent
+    resolutions never observe half-built indexes. Callers that must not
+    fetch the tables twice (see ``YokAtlasClient``) serialize refreshes on
+    :attr:`refresh_lock`.
+    """
+
+    def __init__(self, *, ttl: int, path: Path | None = None, max_stale: int = 0) -> None:
         self.ttl = ttl
-        self._fetched_at: float = 0.0
-        self._universities: list[University] = []
-        self._program_groups: list[ProgramGroup] = []
-        self._cities: list[City] = []
-        self._uni_index: dict[str, University] = {}
-        self._prog_index: dict[str, ProgramGroup] = {}
-        self._city_index: dict[str, City] = {}
+        self.path = path
+        self.max_stale = max_stale
+        self.refresh_lock = threading.Lock()
+        self._snapshot = _EMPTY
 
     def is_fresh(self) -> bool:
-        if not self._universities:
+        snap = self._snapshot
+        if not snap.universities:
+            return False
+        if self.ttl <= 0:
+            return True
+        return (time.monotonic() - snap.fetched_at) < self.ttl
+
+    def is_usable(self) -> bool:
+        """Whether the tables may still be served: fresh, or stale by at most ``max_stale`` seconds."""
+        snap = self._snapshot
+        if not snap.universities:
             return False
         if self.ttl <= 0:
             return True
-        return (time.monotonic() - self._fetched_at) < self.ttl
+        return (time.monotonic() - snap.fetched_at) < self.ttl + self.max_stale
 
     def populate(
         self,
@@ -52,65 +203,163 @@ class LookupCache:
         universities: Iterable[University | dict],
         program_groups: Iterable[ProgramGroup | dict],
         cities: Iterable[City | dict],
+        persist: bool = True,
     ) -> None:
-        self._universities = [u if isinstance(u, University) else University.model_validate(u) for u in universities]
-        self._program_groups = [p if isinstance(p, ProgramGroup) else ProgramGroup.model_validate(p) for p in program_groups]
-        self._cities = [c if isinstance(c, City) else City.model_validate(c) for c in cities]
+        self._snapshot = self._build(
+            universities, program_groups, cities, fetched_at=time.monotonic()
+        )
+        if persist and self.path is not None:
+            try:
+                self._save(fetched_at=time.time())
+            except OSError as exc:
+                warnings.warn(
+                    f"Could not persist lookup cache to {self.path}: {exc}",
+                    RuntimeWarning,
+                    stacklevel=2,
+                )
+
+    @staticmethod
+    def _build(
+        universities: Iterable[University | dict],
+        program_groups: Iterable[ProgramGroup | dict],
+        cities: Iterable[City | dict],
+        *,
+        fetched_at: float,
+    ) -> _Snapshot:
+        from .models import City, ProgramGroup, University
+
+        return _Snapshot(
+            universities=[
+                u if isinstance(u, University) else University.model_validate(u)
+                for u in universities
+            ],
+            program_groups=[
+                p if isinstance(p, ProgramGroup) else ProgramGroup.model_validate(p)
+                for p in program_groups
+            ],
+            cities=[c if isinstance(c, City) else City.model_validate(c) for c in cities],
+            fetched_at=fetched_at,
+        )
+
+    def load(self) -> bool:
+        """Populate from :attr:`path` if it holds a fresh copy. Returns ``True`` on success."""
+        if self.path is None:
+            return False
+        data = read_json(self.path)
+        if not isinstance(data, dict) or data.get("format") != _DISK_FORMAT:
+            return False
+        try:
+            age = max(0.0, time.time() - float(data["fetched_at"]))
+            if self.ttl > 0 and age >= self.ttl + self.max_stale:
+                return False
+            snap = self._build(
+                data["universities"],
+                data["program_groups"],
+                data["cities"],
+                fetched_at=time.monotonic() - age,
+            )
+        except (KeyError, TypeError, ValueError):
+            self.invalidate()
+            return False
+        self._snapshot = snap
+        return bool(snap.universities)
 
-        self._uni_index = {normalize(u.universite_adi): u for u in self._universities}
-        self._prog_index = {normalize(p.birim_grup_adi): p for p in self._program_groups}
-        self._city_index = {normalize(c.il_adi): c for c in self._cities}
-        self._fetched_at = time.monotonic()
+    def _save(self, *, fetched_at: float) -> None:
+        snap = self._snapshot
+        atomic_write_json(
+            self.path,  # type: ignore[arg-type]
+            {
+                "format": _DISK_FORMAT,
+                "fetched_at": fetched_at,
+                "universities": [
+                    u.model_dump(mode="json", by_alias=True) for u in snap.universities
+                ],
+                "program_groups": [
+                    p.model_dump(mode="json", by_alias=True) for p in snap.program_groups
+                ],
+                "cities": [c.model_dump(mode="json", by_alias=True) for c in snap.cities],
+            },
+        )
 
     def invalidate(self) -> None:
-        self._fetched_at = 0.0
-        self._universities = []
-        self._program_groups = []
-        self._cities = []
-        self._uni_index = {}
-        self._prog_index = {}
-        self._city_index = {}
+        self._snapshot = _EMPTY
 
     @property
     def universities(self) -> list[University]:
-        return list(self._universities)
+        return list(self._snapshot.universities)
 
     @property
     def program_groups(self) -> list[ProgramGroup]:
-        return list(self._program_groups)
+        return list(self._snapshot.program_groups)
 
     @property
     def cities(self) -> list[City]:
-        return list(self._cities)
+        return list(self._snapshot.cities)
 
     # --- fuzzy resolution ---------------------------------------------------
 
     def resolve_university(self, name: str, *, cutoff: float = 0.6) -> University:
-        return self._resolve(name, self._uni_index, kind="university", cutoff=cutoff)  # type: ignore[return-value]
+        return self._memoized(self._snapshot, "university", name, cutoff)  # type: ignore[return-value]
 
     def resolve_program(self, name: str, *, cutoff: float = 0.6) -> ProgramGroup:
-        return self._resolve(name, self._prog_index, kind="program", cutoff=cutoff)  # type: ignore[return-value]
+        return self._memoized(self._snapshot, "program", name, cutoff)  # type: ignore[return-value]
 
     def resolve_city(self, name: str, *, cutoff: float = 0.6) -> City:
-        return self._resolve(name, self._city_index, kind="city", cutoff=cutoff)  # type: ignore[return-value]
+        return self._memoized(self._snapshot, "city", name, cutoff)  # type: ignore[return-value]
+
+    def resolve_many(
+        self, kind: LookupKind, names: Iterable[str], *, cutoff: float = 0.6
+    ) -> list[University] | list[ProgramGroup] | list[City]:
+        """Resolve several names of one ``kind`` in input order (raises on the first miss).
+
+        All names are resolved against the same snapshot, even if the tables
+        are refreshed meanwhile.
+        """
+        snap = self._snapshot
+        if kind not in snap.tables:
+            raise ValueError(f"kind must be one of 'university', 'program', 'city' (got {kind!r})")
+        return [self._memoized(snap, kind, name, cutoff) for name in names]  # type: ignore[return-value]
+
+    def _memoized(self, snap: _Snapshot, kind: str, name: str, cutoff: float) -> object:
+        memo_key = (kind, normalize(name) if name else name, cutoff)
+        with snap.memo_lock:
+            hit = snap.memo.get(memo_key)
+            if hit is not None:
+                snap.memo.move_to_end(memo_key)
+                return hit
+        index, trigrams = snap.tables[kind]
+        result = self._resolve(name, index, trigrams, kind=kind, cutoff=cutoff)
+        with snap.memo_lock:
+            snap.memo[memo_key] = result
+            if len(snap.memo) > _MEMO_SIZE:
+                snap.memo.popitem(last=False)
+        return result
 
     @staticmethod
-    def _resolve(name: str, index: dict[str, object], *, kind: str, cutoff: float):  # noqa: ANN401
+    def _resolve(
+        name: str, index: dict[str, object], trigrams: _TrigramIndex, *, kind: str, cutoff: float
+    ):  # noqa: ANN401
         if not name:
             raise _LookupError(name, kind=kind)
         key = normalize(name)
         if key in index:
             return index[key]
         # Substring contains
-        for k, v in index.items():
-            if key in k or k in key:
-                return v
-        # Fuzzy fallback
-        keys = list(index.keys())
-        matches = get_close_matches(key, keys, n=5, cutoff=cutoff)
+        match = trigrams.substring(key)
+        if match is not None:
+            return index[match]
+        # Fuzzy fallback, scored first over the best trigram-overlap candidates.
+        # Short or transposed typos can share no trigram with the right key,
+        # so an empty result falls back to scoring every key.
+        pool = trigrams.fuzzy_pool(key)
+        matches = get_close_matches(key, pool, n=5, cutoff=cutoff) if pool else []
+        if not matches:
+            matches = get_close_matches(key, trigrams.keys, n=5, cutoff=cutoff)
         if matches:
             return index[matches[0]]
-        raise _LookupError(name, kind=kind, suggestions=get_close_matches(key, keys, n=3, cutoff=0.4))
+        raise _LookupError(
+            name, kind=kind, suggestions=get_close_matches(key, trigrams.keys, n=3, cutoff=0.4)
+        )
 
 
 __all__ = ["LookupCache", "normalize"]
@@ -0,0 +1,227 @@
+"""Adaptive client-side rate limiting (token bucket with an AIMD-controlled rate)."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Iterator, TypeVar
+
+from pydantic import BaseModel
+
+from .config import Settings
+
+T = TypeVar("T")
+
+
+class RateLimitStats(BaseModel):
+    """Snapshot of a :class:`RateLimiter`'s state."""
+
+    rate: float
+    tokens: float
+    throttles: int
+
+
+class _LocalState:
+    """Bucket state held in memory and shared by the threads of one process."""
+
+    def __init__(self, initial: dict[str, float]) -> None:
+        self._state = dict(initial)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def now() -> float:
+        return time.monotonic()
+
+    @contextmanager
+    def transaction(self) -> Iterator[dict[str, float]]:
+        with self._lock:
+            yield self._state
+
+
+class _FileState:
+    """Bucket state kept in a JSON file and guarded by an exclusive ``flock``.
+
+    Every process on the host pointing at the same file shares one bucket.
+    """
+
+    def __init__(self, path: Path, initial: dict[str, float]) -> None:
+        try:
+            import fcntl  # noqa: F401
+        except ImportError as exc:  # pragma: no cover - depends on platform
+            raise RuntimeError(
+                "rate_limit_path (shared rate limiting) requires a POSIX platform"
+            ) from exc
+        self.path = path
+        self._initial = dict(initial)
+        self._lock = threading.Lock()
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def now() -> float:
+        return time.time()
+
+    @contextmanager
+    def transaction(self) -> Iterator[dict[str, float]]:
+        import fcntl
+
+        with self._lock, open(self.path, "a+", encoding="utf-8") as fh:
+            fcntl.flock(fh, fcntl.LOCK_EX)
+            try:
+                fh.seek(0)
+                try:
+                    state = {**self._initial, **json.loads(fh.read() or "{}")}
+                except ValueError:
+                    state = dict(self._initial)
+                yield state
+                fh.seek(0)
+                fh.truncate()
+                fh.write(json.dumps(state))
+                fh.flush()
+            finally:
+                fcntl.flock(fh, fcntl.LOCK_UN)
+
+
+class RateLimiter:
+    """Token bucket whose refill rate follows AIMD (additive increase, multiplicative decrease).
+
+    Each request takes one token; the bucket refills at ``rate`` tokens per
+    second up to ``burst``. A success adds ``increase / rate`` to the rate
+    (about ``increase`` req/s per second of sustained traffic), a throttling
+    response multiplies it by ``decrease`` and drains the bucket, also
+    honoring ``Retry-After``. The rate stays within ``[min_rate, max_rate]``.
+
+    With ``path`` the bucket lives in a lock-protected file, so every process
+    on the host using that path shares one budget.
+    """
+
+    def __init__(
+        self,
+        *,
+        rate: float,
+        burst: int = 10,
+        min_rate: float = 0.5,
+        max_rate: float = 50.0,
+        increase: float = 1.0,
+        decrease: float = 0.5,
+        path: Path | None = None,
+    ) -> None:
+        if not 0 < min_rate <= rate <= max_rate:
+            raise ValueError(
+                f"rate limits must satisfy 0 < min_rate <= rate <= max_rate (got {min_rate}, {rate}, {max_rate})"
+            )
+        if not 0 < decrease < 1:
+            raise ValueError(f"decrease must be between 0 and 1 (got {decrease})")
+        self.burst = max(1, burst)
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.path = path
+        self._store: _LocalState | _FileState
+        initial = {"rate": rate, "tokens": float(self.burst), "updated": 0.0, "throttles": 0}
+        self._store = _FileState(path, initial) if path is not None else _LocalState(initial)
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "RateLimiter | None":
+        """Build the limiter described by ``settings``, or ``None`` if it is disabled."""
+        if settings.rate_limit <= 0:
+            return None
+        return cls(
+            rate=settings.rate_limit,
+            burst=settings.rate_limit_burst,
+            min_rate=min(settings.rate_limit_min, settings.rate_limit),
+            max_rate=max(settings.rate_limit_max, settings.rate_limit),
+            increase=settings.rate_limit_increase,
+            decrease=settings.rate_limit_decrease,
+            path=settings.rate_limit_path,
+        )
+
+    @property
+    def stats(self) -> RateLimitStats:
+        with self._store.transaction() as state:
+            self._refill(state, self._store.now())
+            return RateLimitStats(
+                rate=state["rate"], tokens=state["tokens"], throttles=int(state["throttles"])
+            )
+
+    def acquire(self) -> None:
+        """Take a token, sleeping until one is available."""
+        delay = self._reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    async def aacquire(self) -> None:
+        """Async counterpart of :meth:`acquire`.
+
+        In shared (``path``) mode the file lock may be held by another
+        process, so the reservation runs in a worker thread.
+        """
+        delay = await self._run(self._reserve)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def on_success(self) -> None:
+        with self._store.transaction() as state:
+            self._refill(state, self._store.now())
+            state["rate"] = min(self.max_rate, state["rate"] + self.increase / state["rate"])
+
+    def on_throttle(self, retry_after: float | None = None) -> None:
+        with self._store.transaction() as state:
+            self._refill(state, self._store.now())
+            state["rate"] = max(self.min_rate, state["rate"] * self.decrease)
+            # Nobody sends until the server's cool-down (or one token's worth of time) has passed.
+            pause = max(retry_after or 0.0, 1.0 / state["rate"])
+            state["tokens"] = min(state["tokens"], 0.0) - pause * state["rate"]
+            state["throttles"] += 1
+
+    async def aon_success(self) -> None:
+        """Async counterpart of :meth:`on_success`."""
+        await self._run(self.on_success)
+
+    async def aon_throttle(self, retry_after: float | None = None) -> None:
+        """Async counterpart of :meth:`on_throttle`."""
+        await self._run(self.on_throttle, retry_after)
+
+    # ---- internals ---------------------------------------------------------
+
+    def _refill(self, state: dict[str, Any], now: float) -> None:
+        elapsed = max(0.0, now - state["updated"]) if state["updated"] else 0.0
+        state["tokens"] = min(float(self.burst), state["tokens"] + elapsed * state["rate"])
+        state["updated"] = now
+
+    async def _run(self, fn: Callable[..., T], *args: Any) -> T:
+        """Call ``fn`` inline for the in-memory bucket, in a worker thread for the file-backed one."""
+        if isinstance(self._store, _FileState):
+            return await asyncio.to_thread(fn, *args)
+        return fn(*args)
+
+    def _reserve(self) -> float:
+        """Take one token (possibly going into debt) and return how long to wait for it."""
+        with self._store.transaction() as state:
+            self._refill(state, self._store.now())
+            state["tokens"] -= 1.0
+            return 0.0 if state["tokens"] >= 0 else -state["tokens"] / state["rate"]
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Seconds from a ``Retry-After`` header (delta-seconds or HTTP date), if present."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    from email.utils import parsedate_to_datetime
+
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+
+__all__ = ["RateLimitStats", "RateLimiter", "parse_retry_after"]
@@ -0,0 +1,137 @@
+"""Application-level retry policy: exponential backoff, full jitter, ``Retry-After``."""
+
+from __future__ import annotations
+
+import random
+import threading
+from collections import Counter
+
+import httpx
+from pydantic import BaseModel
+
+from ._ratelimit import parse_retry_after
+from .config import Settings
+
+RETRY_STATUSES = frozenset({408, 418, 429, 500, 502, 503, 504})
+
+# Failures where the request never reached the server; safe to retry for any method.
+_NOT_SENT = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+
+class RetryStats(BaseModel):
+    """Snapshot of :class:`RetryPolicy` counters.
+
+    ``reasons`` counts retries by cause: the HTTP status (``"502"``) or the
+    exception name (``"ReadTimeout"``).
+    """
+
+    retries: int = 0
+    exhausted: int = 0
+    reasons: dict[str, int] = {}
+
+
+class RetryPolicy:
+    """Decides whether and when a failed request is retried.
+
+    Retries transient statuses (:data:`RETRY_STATUSES`) and transport errors
+    up to ``retries`` times per call. The wait is ``Retry-After`` when the
+    server sends one, otherwise full jitter: uniform in
+    ``[0, min(backoff_max, backoff * 2**attempt)]``. A call gives up once the
+    next wait would push its total sleep past ``budget`` seconds.
+
+    Non-idempotent requests are only retried when they never reached the server.
+    """
+
+    def __init__(
+        self,
+        *,
+        retries: int = 3,
+        backoff: float = 0.5,
+        backoff_max: float = 30.0,
+        budget: float = 120.0,
+        statuses: frozenset[int] = RETRY_STATUSES,
+    ) -> None:
+        self.retries = retries
+        self.backoff = backoff
+        self.backoff_max = backoff_max
+        self.budget = budget
+        self.statuses = statuses
+        self._lock = threading.Lock()
+        self._retries = 0
+        self._exhausted = 0
+        self._reasons: Counter[str] = Counter()
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "RetryPolicy":
+        return cls(
+            retries=settings.retry_attempts,
+            backoff=settings.retry_backoff,
+            backoff_max=settings.retry_backoff_max,
+            budget=settings.retry_budget,
+        )
+
+    @property
+    def stats(self) -> RetryStats:
+        with self._lock:
+            return RetryStats(
+                retries=self._retries, exhausted=self._exhausted, reasons=dict(self._reasons)
+            )
+
+    def call(self, *, idempotent: bool, retries: int | None = None) -> "RetryCall":
+        """Start tracking one logical call; ``retries`` overrides the policy's count."""
+        return RetryCall(
+            self, idempotent=idempotent, retries=self.retries if retries is None else retries
+        )
+
+    def backoff_delay(self, attempt: int) -> float:
+        return random.uniform(0, min(self.backoff_max, self.backoff * 2**attempt))
+
+    def _record(self, reason: str | None) -> None:
+        with self._lock:
+            if reason is None:
+                self._exhausted += 1
+            else:
+                self._retries += 1
+                self._reasons[reason] += 1
+
+
+class RetryCall:
+    """Per-call retry state (attempts made, time slept) for one :class:`RetryPolicy`."""
+
+    def __init__(self, policy: RetryPolicy, *, idempotent: bool, retries: int) -> None:
+        self.policy = policy
+        self.idempotent = idempotent
+        self.retries = retries
+        self.attempt = 0
+        self.slept = 0.0
+        self.reason: str | None = None
+
+    def delay_for_response(self, response: httpx.Response) -> float | None:
+        """Seconds to wait before retrying ``response``, or ``None`` to return/raise it."""
+        if response.status_code not in self.policy.statuses or not self.idempotent:
+            return None
+        retry_after = parse_retry_after(response.headers.get("Retry-After"))
+        return self._next(str(response.status_code), retry_after)
+
+    def delay_for_error(self, error: Exception) -> float | None:
+        """Seconds to wait before retrying after a transport ``error``, or ``None`` to re-raise."""
+        if not isinstance(error, httpx.TransportError):
+            return None
+        if not self.idempotent and not isinstance(error, _NOT_SENT):
+            return None
+        return self._next(type(error).__name__, None)
+
+    def _next(self, reason: str, retry_after: float | None) -> float | None:
+        delay = retry_after if retry_after is not None else self.policy.backoff_delay(self.attempt)
+        if self.attempt >= self.retries or self.slept + delay > self.policy.budget:
+            if self.retries:
+                self.policy._record(None)
+            return None
+        self.attempt += 1
+        self.slept += delay
+        self.reason = reason
+        self.policy._record(reason)
+        return delay
+
+
+__all__ = ["RETRY_STATUSES", "RetryCall", "RetryPolicy", "RetryStats"]
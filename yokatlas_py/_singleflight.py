@@ -0,0 +1,41 @@
+"""Single-flight coalescing: concurrent callers for one key share one in-flight call."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Awaitable, Callable, Generic, Hashable, TypeVar
+
+R = TypeVar("R")
+
+
+class AsyncSingleFlight(Generic[R]):
+    """Deduplicate concurrent coroutine calls by key.
+
+    The first caller for a key starts ``fn()`` as a task; callers arriving
+    while it runs await the same task. Each caller awaits through
+    :func:`asyncio.shield`, so cancelling one waiter does not cancel the
+    shared call for the others. The key is released once the call finishes.
+    """
+
+    def __init__(self) -> None:
+        self._calls: dict[Hashable, asyncio.Future[R]] = {}
+
+    def in_flight(self, key: Hashable) -> bool:
+        return key in self._calls
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[R]]) -> R:
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda t: self._release(key, t))
+        return await asyncio.shield(task)
+
+    def _release(self, key: Hashable, task: asyncio.Future[R]) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled():
+            task.exception()  # mark retrieved even if every waiter was cancelled
+
+
+__all__ = ["AsyncSingleFlight"]
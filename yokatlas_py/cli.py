@@ -0,0 +1,285 @@
+"""``yokatlas`` command-line tool.
+
+Subcommands map onto the client: ``search`` (one page), ``get`` (programs by
+kılavuz kodu), ``lookups`` (universities / program groups / cities) and
+``export`` (every matching program). Filter options mirror
+:class:`~yokatlas_py.models.SearchFilters` field by field.
+
+``export`` writes each page as soon as it arrives and keeps only the
+prefetch window (``--concurrency`` pages) in memory, so a full-dataset
+export runs in constant memory::
+
+    yokatlas export --puan-turu SAY --format csv -o say.csv
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import os
+import sys
+from typing import IO, Any, Callable, Iterable, Sequence, get_args
+
+from pydantic import BaseModel, ValidationError
+
+from . import __version__
+from ._json import get_codec
+from .client import YokAtlasClient
+from .columns import COLUMN_TYPES, programs_to_columns
+from .exceptions import YokAtlasError
+from .models import PuanTuru, SearchFilters, parse_search_page
+
+# (SearchFilters field, argparse keyword arguments); list fields are repeatable.
+_FILTER_OPTIONS: tuple[tuple[str, dict[str, Any]], ...] = (
+    ("puan_turu", {"choices": get_args(PuanTuru)}),
+    ("universite", {"action": "append", "help": "university name, fuzzy-matched (repeatable)"}),
+    ("program", {"action": "append", "help": "program group name, fuzzy-matched (repeatable)"}),
+    ("il", {"action": "append", "help": "city name, fuzzy-matched (repeatable)"}),
+    ("universite_id", {"type": int, "action": "append"}),
+    ("birim_grup_id", {"type": int, "action": "append"}),
+    ("il_kodu", {"type": int, "action": "append"}),
+    ("birim_turu_id", {"type": int}),
+    ("universite_turu", {"choices": ("DEVLET", "VAKIF")}),
+    ("burs_orani_id", {"type": int}),
+    ("ogrenim_turu_id", {"type": int}),
+    ("kilavuz_kodu", {"type": int}),
+    ("min_basari_sirasi", {"type": int}),
+    ("max_basari_sirasi", {"type": int}),
+)
+
+_LOOKUPS: dict[str, Callable[[YokAtlasClient], list[Any]]] = {
+    "universities": YokAtlasClient.list_universities,
+    "programs": YokAtlasClient.list_program_groups,
+    "cities": YokAtlasClient.list_cities,
+}
+
+
+# ---------------------------------------------------------------------------
+# Output
+# ---------------------------------------------------------------------------
+
+
+def _dumps(obj: Any) -> str:
+    return get_codec().dumps(obj).decode("utf-8")
+
+
+def _write_ndjson(out: IO[str], records: Iterable[Any]) -> int:
+    n = 0
+    for record in records:
+        out.write(
+            _dumps(record.model_dump(mode="json") if isinstance(record, BaseModel) else record)
+        )
+        out.write("\n")
+        n += 1
+    return n
+
+
+class _CsvRows:
+    """CSV writer that emits the header once, before the first row."""
+
+    def __init__(self, out: IO[str], header: Sequence[str]) -> None:
+        self._writer = csv.writer(out)
+        self._header: Sequence[str] | None = header
+
+    def write(self, rows: Iterable[Sequence[Any]]) -> int:
+        if self._header is not None:
+            self._writer.writerow(self._header)
+            self._header = None
+        n = 0
+        for row in rows:
+            self._writer.writerow(row)
+            n += 1
+        return n
+
+
+def _program_rows(rows: list[Any]) -> Iterable[tuple[Any, ...]]:
+    """Flat CSV rows in the :data:`~yokatlas_py.columns.COLUMN_TYPES` layout."""
+    return zip(*programs_to_columns(rows).values())
+
+
+# ---------------------------------------------------------------------------
+# Subcommands
+# ---------------------------------------------------------------------------
+
+
+def _filters(args: argparse.Namespace) -> SearchFilters:
+    data = {
+        name: getattr(args, name) for name, _ in _FILTER_OPTIONS if getattr(args, name) is not None
+    }
+    return SearchFilters.model_validate(data)
+
+
+def _cmd_search(client: YokAtlasClient, args: argparse.Namespace, out: IO[str]) -> int:
+    page = client.search(
+        args.filters,
+        page=args.page,
+        size=args.size,
+        sort_by=args.sort_by,
+        direction=args.direction,
+        smart_search=args.smart,
+    )
+    if args.format == "json":
+        out.write(_dumps(page.model_dump(mode="json")) + "\n")
+    elif args.format == "ndjson":
+        _write_ndjson(out, page.content)
+    else:
+        _CsvRows(out, list(COLUMN_TYPES)).write(_program_rows(page.content))
+    return 0
+
+
+def _cmd_get(client: YokAtlasClient, args: argparse.Namespace, out: IO[str]) -> int:
+    found = client.get_programs(args.codes, concurrency=args.concurrency)
+    _write_ndjson(out, (program for program in found.values() if program is not None))
+    missing = [code for code, program in found.items() if program is None]
+    for code in missing:
+        print(f"yokatlas: not found: {code}", file=sys.stderr)
+    return 1 if missing else 0
+
+
+def _cmd_lookups(client: YokAtlasClient, args: argparse.Namespace, out: IO[str]) -> int:
+    entries = _LOOKUPS[args.table](client)
+    if args.format == "ndjson":
+        _write_ndjson(out, entries)
+    elif entries:
+        header = list(type(entries[0]).model_fields)
+        _CsvRows(out, header).write([getattr(entry, name) for name in header] for entry in entries)
+    return 0
+
+
+def _cmd_export(client: YokAtlasClient, args: argparse.Namespace, out: IO[str]) -> int:
+    filters = client._prepare_filters(args.filters, smart_search=args.smart)
+    pages = client._iter_raw_pages(
+        filters,
+        size=args.size,
+        sort_by=args.sort_by,
+        direction=args.direction,
+        concurrency=args.concurrency,
+        ordered=True,
+    )
+    csv_rows = _CsvRows(out, list(COLUMN_TYPES)) if args.format == "csv" else None
+    for raw in pages:
+        rows = raw["content"]
+        if csv_rows is not None:
+            csv_rows.write(_program_rows(rows))
+        elif args.raw:
+            _write_ndjson(out, rows)
+        else:
+            _write_ndjson(out, parse_search_page(raw).content)
+        out.flush()
+    return 0
+
+
+# ---------------------------------------------------------------------------
+# Parser
+# ---------------------------------------------------------------------------
+
+
+def _positive_int(value: str) -> int:
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: {value!r}") from None
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be >= 1 (got {number})")
+    return number
+
+
+def _add_filter_options(parser: argparse.ArgumentParser) -> None:
+    group = parser.add_argument_group("filters")
+    for name, kwargs in _FILTER_OPTIONS:
+        group.add_argument("--" + name.replace("_", "-"), dest=name, **kwargs)
+    group.add_argument(
+        "--no-smart",
+        dest="smart",
+        action="store_false",
+        help="do not resolve --universite/--program/--il names",
+    )
+
+
+def _add_sort_options(parser: argparse.ArgumentParser, *, size: int) -> None:
+    parser.add_argument("--size", type=int, default=size, help=f"rows per page (default: {size})")
+    parser.add_argument(
+        "--sort-by", default="basariSirasi", help="raw field to sort by (default: basariSirasi)"
+    )
+    parser.add_argument("--direction", type=str.upper, choices=("ASC", "DESC"), default="ASC")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="yokatlas", description="Query the YÖK Atlas tercih kılavuzu API."
+    )
+    parser.add_argument("--version", action="version", version=f"%(prog)s {__version__}")
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("-o", "--output", help="write to this file instead of stdout")
+    commands = parser.add_subparsers(dest="command", required=True, metavar="COMMAND")
+
+    search = commands.add_parser(
+        "search", parents=[common], help="print one page of search results"
+    )
+    _add_filter_options(search)
+    search.add_argument("--page", type=int, default=0)
+    _add_sort_options(search, size=20)
+    search.add_argument("--format", choices=("json", "ndjson", "csv"), default="json")
+    search.set_defaults(run=_cmd_search)
+
+    get = commands.add_parser(
+        "get", parents=[common], help="print programs by kılavuz kodu, one JSON object per line"
+    )
+    get.add_argument("codes", nargs="+", type=int, metavar="KILAVUZ_KODU")
+    get.add_argument("--concurrency", type=_positive_int, default=8)
+    get.set_defaults(run=_cmd_get)
+
+    lookups = commands.add_parser("lookups", parents=[common], help="print a lookup table")
+    lookups.add_argument("table", choices=sorted(_LOOKUPS))
+    lookups.add_argument("--format", choices=("ndjson", "csv"), default="ndjson")
+    lookups.set_defaults(run=_cmd_lookups)
+
+    export = commands.add_parser(
+        "export", parents=[common], help="stream every matching program as NDJSON or CSV"
+    )
+    _add_filter_options(export)
+    _add_sort_options(export, size=100)
+    export.add_argument("--format", choices=("ndjson", "csv"), default="ndjson")
+    export.add_argument(
+        "--concurrency", type=_positive_int, default=4, help="pages in flight (default: 4)"
+    )
+    export.add_argument(
+        "--raw", action="store_true", help="NDJSON: write API rows as returned, without validation"
+    )
+    export.set_defaults(run=_cmd_export)
+    return parser
+
+
+def main(argv: Sequence[str] | None = None, *, client: YokAtlasClient | None = None) -> int:
+    """Entry point of the ``yokatlas`` console script; returns the exit status."""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if "smart" in args:
+        try:
+            args.filters = _filters(args)
+        except ValidationError as exc:
+            parser.error("; ".join(error["msg"] for error in exc.errors()))
+    own_client = client is None
+    out: IO[str] = (
+        open(args.output, "w", encoding="utf-8", newline="") if args.output else sys.stdout
+    )
+    try:
+        if client is None:
+            client = YokAtlasClient()
+        return int(args.run(client, args, out))
+    except YokAtlasError as exc:
+        print(f"yokatlas: error: {exc}", file=sys.stderr)
+        return 1
+    except BrokenPipeError:
+        # The reader went away (e.g. ``| head``): silence the flush at interpreter exit.
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        return 1
+    finally:
+        if own_client and client is not None:
+            client.close()
+        if out is not sys.stdout:
+            out.close()
+
+
+__all__ = ["build_parser", "main"]
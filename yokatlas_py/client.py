@@ -4,18 +4,48 @@ from __future__ import annotations
 
 import asyncio
 import atexit
-from typing import Any
+import threading
+import time
+import warnings
+from typing import Any, AsyncIterator, Iterable, Iterator, Literal, overload
 
+from ._cache import ResponseCache, canonical_key
+from ._concurrency import _check_concurrency, aiter_bounded, iter_bounded
 from ._lookup import LookupCache
-from .config import Settings, settings as default_settings
+from ._singleflight import AsyncSingleFlight
+from .columns import ColumnFormat, programs_to_columns
+from .config import Settings, get_settings
 from .http_client import AsyncHttpClient, HttpClient
-from .models import City, Program, ProgramGroup, SearchFilters, SearchPage, University
+from .metrics import stage, trace_call
+from .planner import (
+    PROBE_DIRECTION,
+    PROBE_SORT_BY,
+    PlannedQuery,
+    Probe,
+    QueryPlan,
+    merge_sorted,
+    plan_steps,
+    run_plan,
+)
+from .models import (
+    City,
+    LazyProgram,
+    Program,
+    ProgramGroup,
+    SearchFilters,
+    SearchPage,
+    University,
+    parse_search_page,
+)
 
 _SEARCH_PATH = "/api/tercih-kilavuz/search"
 _UNIVERSITIES_PATH = "/api/tercih-kilavuz/universiteler"
 _PROGRAMS_PATH = "/api/tercih-kilavuz/universite-programlar"
 _CITIES_PATH = "/api/tercih-kilavuz/universite-iller"
 
+# Seconds to wait after a failed background lookup refresh before trying again.
+_REFRESH_RETRY_COOLDOWN = 30.0
+
 
 # ---------------------------------------------------------------------------
 # Helpers
@@ -47,6 +77,22 @@ def _build_request(
     }
 
 
+def _coerce_code(kilavuz_kodu: int | str) -> int:
+    try:
+        return int(kilavuz_kodu)
+    except (TypeError, ValueError) as exc:
+        raise ValueError(f"kilavuz_kodu must be an int (got {kilavuz_kodu!r})") from exc
+
+
+def _unique_codes(codes: Iterable[int | str]) -> list[int]:
+    """Validated kılavuz kodları with duplicates dropped, in first-seen order."""
+    return list(dict.fromkeys(_coerce_code(code) for code in codes))
+
+
+def _total_pages(raw: dict[str, Any]) -> int:
+    return int(raw.get("totalPages") or raw.get("total_pages") or 0)
+
+
 def _resolve_smart_fields(filters: SearchFilters, cache: LookupCache) -> SearchFilters:
     """Replace string filters (universite/program/il) with their ID counterparts."""
     if not any((filters.universite, filters.program, filters.il)):
@@ -55,15 +101,15 @@ def _resolve_smart_fields(filters: SearchFilters, cache: LookupCache) -> SearchF
     data = filters.model_dump()
     if filters.universite is not None:
         names = filters.universite if isinstance(filters.universite, list) else [filters.universite]
-        data["universite_id"] = [cache.resolve_university(n).universite_id for n in names]
+        data["universite_id"] = [u.universite_id for u in cache.resolve_many("university", names)]  # type: ignore[union-attr]
         data["universite"] = None
     if filters.program is not None:
         names = filters.program if isinstance(filters.program, list) else [filters.program]
-        data["birim_grup_id"] = [cache.resolve_program(n).birim_grup_id for n in names]
+        data["birim_grup_id"] = [p.birim_grup_id for p in cache.resolve_many("program", names)]  # type: ignore[union-attr]
         data["program"] = None
     if filters.il is not None:
         names = filters.il if isinstance(filters.il, list) else [filters.il]
-        data["il_kodu"] = [cache.resolve_city(n).il_kodu for n in names]
+        data["il_kodu"] = [c.il_kodu for c in cache.resolve_many("city", names)]  # type: ignore[union-attr]
         data["il"] = None
     return SearchFilters.model_validate(data)
 
@@ -74,7 +120,12 @@ def _resolve_smart_fields(filters: SearchFilters, cache: LookupCache) -> SearchF
 
 
 class YokAtlasClient:
-    """Synchronous client for the YÖK Atlas tercih-kılavuz JSON API."""
+    """Synchronous client for the YÖK Atlas tercih-kılavuz JSON API.
+
+    Thread-safe: one instance (and its connection pool, lookup tables and
+    caches) can be shared by every thread of a process. Lookup tables are
+    fetched by a single thread and swapped in atomically.
+    """
 
     def __init__(
         self,
@@ -82,9 +133,17 @@ class YokAtlasClient:
         settings: Settings | None = None,
         http: HttpClient | None = None,
     ) -> None:
-        self.settings = settings or default_settings
+        self.settings = settings or get_settings()
         self._http = http or HttpClient(settings=self.settings)
-        self._lookups = LookupCache(ttl=self.settings.lookup_cache_ttl)
+        self._lookups = LookupCache(
+            ttl=self.settings.lookup_cache_ttl,
+            path=self.settings.lookup_cache_path,
+            max_stale=self.settings.lookup_cache_max_stale,
+        )
+        self.response_cache = ResponseCache.from_settings(self.settings)
+        self.metrics = self._http.metrics
+        self._refresher: threading.Thread | None = None
+        self._refresh_failed_at: float | None = None
 
     # ---- context management ------------------------------------------------
 
@@ -95,10 +154,13 @@ class YokAtlasClient:
         self.close()
 
     def close(self) -> None:
+        if self._refresher is not None:
+            self._refresher.join()
         self._http.close()
 
     # ---- public API --------------------------------------------------------
 
+    @overload
     def search(
         self,
         filters: SearchFilters | dict[str, Any] | None = None,
@@ -108,24 +170,281 @@ class YokAtlasClient:
         sort_by: str = "basariSirasi",
         direction: str = "ASC",
         smart_search: bool = True,
-    ) -> SearchPage[Program]:
-        """Search the YÖK Atlas tercih kılavuzu."""
-        f = _coerce_filters(filters)
-        if smart_search and any((f.universite, f.program, f.il)):
-            self._ensure_lookups()
-            f = _resolve_smart_fields(f, self._lookups)
-        body = _build_request(f, page=page, size=size, sort_by=sort_by, direction=direction)
-        raw = self._http.post_json(_SEARCH_PATH, json_body=body)
-        return SearchPage[Program].model_validate(raw)
+        lazy: Literal[False] = ...,
+    ) -> SearchPage[Program]: ...
+
+    @overload
+    def search(
+        self,
+        filters: SearchFilters | dict[str, Any] | None = None,
+        *,
+        page: int = 0,
+        size: int = 20,
+        sort_by: str = "basariSirasi",
+        direction: str = "ASC",
+        smart_search: bool = True,
+        lazy: Literal[True],
+    ) -> SearchPage[LazyProgram]: ...
+
+    def search(
+        self,
+        filters: SearchFilters | dict[str, Any] | None = None,
+        *,
+        page: int = 0,
+        size: int = 20,
+        sort_by: str = "basariSirasi",
+        direction: str = "ASC",
+        smart_search: bool = True,
+        lazy: bool = False,
+    ) -> SearchPage[Program] | SearchPage[LazyProgram]:
+        """Search the YÖK Atlas tercih kılavuzu.
+
+        With ``lazy=True`` the page holds :class:`LazyProgram` rows whose yearly
+        statistics are only built when first read.
+        """
+        with trace_call(self.metrics, "search"):
+            f = self._prepare_filters(filters, smart_search=smart_search)
+            return self._fetch_page(
+                f, page=page, size=size, sort_by=sort_by, direction=direction, lazy=lazy
+            )
+
+    @overload
+    def iter_programs(
+        self,
+        filters: SearchFilters | dict[str, Any] | None = None,
+        *,
+        size: int = 100,
+        sort_by: str = "basariSirasi",
+        direction: str = "ASC",
+        smart_search: bool = True,
+        concurrency: int = 4,
+        ordered: bool = True,
+        lazy: Literal[False] = ...,
+    ) -> Iterator[Program]: ...
+
+    @overload
+    def iter_programs(
+        self,
+        filters: SearchFilters | dict[str, Any] | None = None,
+        *,
+        size: int = 100,
+        sort_by: str = "basariSirasi",
+        direction: str = "ASC",
+        smart_search: bool = True,
+        concurrency: int = 4,
+        ordered: bool = True,
+        lazy: Literal[True],
+    ) -> Iterator[LazyProgram]: ...
+
+    def iter_programs(
+        self,
+        filters: SearchFilters | dict[str, Any] | None = None,
+        *,
+        size: int = 100,
+        sort_by: str = "basariSirasi",
+        direction: str = "ASC",
+        smart_search: bool = True,
+        concurrency: int = 4,
+        ordered: bool = True,
+        lazy: bool = False,
+    ) -> Iterator[Program] | Iterator[LazyProgram]:
+        """Yield every program matching ``filters`` across all result pages.
+
+        The first page is fetched to learn ``total_pages``; the remaining pages
+        are prefetched on a thread pool with at most ``concurrency`` requests in
+        flight. With ``ordered=False`` pages are yielded as soon as they arrive.
+        ``lazy=True`` yields :class:`LazyProgram` rows (see :meth:`search`).
+        An invalid ``concurrency`` raises here, before any request is sent.
+        """
+        _check_concurrency(concurrency)
+        return self._iter_programs(
+            filters,
+            size=size,
+            sort_by=sort_by,
+            direction=direction,
+            smart_search=smart_search,
+            concurrency=concurrency,
+            ordered=ordered,
+            lazy=lazy,
+        )
+
+    def search_all(
+        self,
+        filters: SearchFilters | dict[str, Any] | None = None,
+        *,
+        size: int = 100,
+        sort_by: str = "basariSirasi",
+        direction: str = "ASC",
+        smart_search: bool = True,
+        concurrency: int = 4,
+        ordered: bool = True,
+    ) -> list[Program]:
+        """Collect :meth:`iter_programs` into a list."""
+        with trace_call(self.metrics, "search_all"):
+            return list(
+                self.iter_programs(
+                    filters,
+                    size=size,
+                    sort_by=sort_by,
+                    direction=direction,
+                    smart_search=smart_search,
+                    concurrency=concurrency,
+                    ordered=ordered,
+                )
+            )
+
+    def _iter_programs(
+        self,
+        filters: SearchFilters | dict[str, Any] | None,
+        *,
+        size: int,
+        sort_by: str,
+        direction: str,
+        smart_search: bool,
+        concurrency: int,
+        ordered: bool,
+        lazy: bool,
+    ) -> Iterator[Program] | Iterator[LazyProgram]:
+        f = self._prepare_filters(filters, smart_search=smart_search)
+        for raw in self._iter_raw_pages(
+            f,
+            size=size,
+            sort_by=sort_by,
+            direction=direction,
+            concurrency=concurrency,
+            ordered=ordered,
+        ):
+            with stage("validate"):
+                page = parse_search_page(raw, lazy=lazy)
+            yield from page.content
+
+    def search_columns(
+        self,
+        filters: SearchFilters | dict[str, Any] | None = None,
+        *,
+        size: int = 100,
+        sort_by: str = "basariSirasi",
+        direction: str = "ASC",
+        smart_search: bool = True,
+        concurrency: int = 4,
+        ordered: bool = True,
+        format: ColumnFormat = "python",
+    ) -> Any:
+        """Like :meth:`search_all`, but returns columns built straight from the raw rows.
+
+        No :class:`Program` objects are created; see
+        :func:`yokatlas_py.columns.programs_to_columns` for the layout and formats.
+        """
+        with trace_call(self.metrics, "search_columns"):
+            f = self._prepare_filters(filters, smart_search=smart_search)
+            pages = self._iter_raw_pages(
+                f,
+                size=size,
+                sort_by=sort_by,
+                direction=direction,
+                concurrency=concurrency,
+                ordered=ordered,
+            )
+            return programs_to_columns(
+                (row for raw in pages for row in raw["content"]), format=format
+            )
+
+    def plan_query(
+        self,
+        filters: SearchFilters | dict[str, Any] | None = None,
+        *,
+        max_rows: int = 2000,
+        smart_search: bool = True,
+        concurrency: int = 4,
+    ) -> QueryPlan:
+        """Split ``filters`` into disjoint sub-queries of at most ``max_rows`` rows each.
+
+        Each candidate split is checked with one-row probes, ``concurrency``
+        at a time; see :mod:`yokatlas_py.planner` for the strategy.
+        """
+        with trace_call(self.metrics, "plan_query"):
+            f = self._prepare_filters(filters, smart_search=smart_search)
+            steps = plan_steps(
+                f, max_rows=max_rows, il_kodlari=[c.il_kodu for c in self.list_cities()]
+            )
+            return run_plan(
+                steps, lambda batch: list(iter_bounded(self._probe, batch, concurrency=concurrency))
+            )
+
+    def search_planned(
+        self,
+        filters: SearchFilters | dict[str, Any] | None = None,
+        *,
+        plan: QueryPlan | None = None,
+        size: int = 500,
+        max_pages: int = 4,
+        sort_by: str = "basariSirasi",
+        direction: str = "ASC",
+        smart_search: bool = True,
+        concurrency: int = 4,
+    ) -> list[Program]:
+        """Like :meth:`search_all`, but through a :meth:`plan_query` plan.
+
+        ``filters`` is planned into sub-queries of at most ``size * max_pages``
+        rows (or a stored ``plan`` is executed as is). Up to ``concurrency``
+        sub-queries run at once, each paged in order, and their rows are
+        merged in ``sort_by`` order.
+        """
+        if plan is not None and filters is not None:
+            raise ValueError("pass either filters or plan, not both")
+        with trace_call(self.metrics, "search_planned"):
+            if plan is None:
+                plan = self.plan_query(
+                    filters,
+                    max_rows=size * max_pages,
+                    smart_search=smart_search,
+                    concurrency=concurrency,
+                )
+
+            def fetch(query: PlannedQuery) -> list[tuple[dict[str, Any], Program]]:
+                rows: list[tuple[dict[str, Any], Program]] = []
+                for raw in self._iter_raw_pages(
+                    query.filters,
+                    size=size,
+                    sort_by=sort_by,
+                    direction=direction,
+                    concurrency=1,
+                    ordered=True,
+                ):
+                    with stage("validate"):
+                        page = parse_search_page(raw)
+                    rows.extend(zip(raw["content"], page.content))  # type: ignore[arg-type]
+                return rows
+
+            parts = list(iter_bounded(fetch, plan.queries, concurrency=concurrency))
+            return merge_sorted(parts, sort_by=sort_by, direction=direction)
 
     def get_program(self, kilavuz_kodu: int | str) -> Program | None:
         """Return a single program by its ÖSYM kılavuz kodu, or ``None`` if not found."""
-        try:
-            code = int(kilavuz_kodu)
-        except (TypeError, ValueError) as exc:
-            raise ValueError(f"kilavuz_kodu must be an int (got {kilavuz_kodu!r})") from exc
-        page = self.search(SearchFilters(kilavuz_kodu=code), size=1, smart_search=False)
-        return page.content[0] if page.content else None
+        with trace_call(self.metrics, "get_program"):
+            code = _coerce_code(kilavuz_kodu)
+            page = self.search(SearchFilters(kilavuz_kodu=code), size=1, smart_search=False)
+            return page.content[0] if page.content else None
+
+    def get_programs(
+        self, codes: Iterable[int | str], *, concurrency: int = 8
+    ) -> dict[int, Program | None]:
+        """Fetch several programs by kılavuz kodu, at most ``concurrency`` requests at a time.
+
+        Duplicate codes are fetched once. The result maps each code to its
+        :class:`Program` (``None`` if not found), in input order.
+        """
+        with trace_call(self.metrics, "get_programs"):
+            unique = _unique_codes(codes)
+            found = dict(
+                iter_bounded(
+                    lambda code: (code, self.get_program(code)),
+                    unique,
+                    concurrency=concurrency,
+                    ordered=False,
+                )
+            )
+            return {code: found[code] for code in unique}
 
     def list_universities(self) -> list[University]:
         self._ensure_lookups()
@@ -140,22 +459,139 @@ class YokAtlasClient:
         return self._lookups.cities
 
     def refresh_lookups(self) -> None:
-        """Force a refresh of the universities/programs/cities cache."""
-        self._lookups.invalidate()
-        self._fetch_lookups()
+        """Force a refresh of the universities/programs/cities cache.
+
+        Readers keep using the current tables until the new ones are swapped in.
+        """
+        with self._lookups.refresh_lock:
+            self._fetch_lookups()
 
     # ---- internals ---------------------------------------------------------
 
+    def _prepare_filters(
+        self, filters: SearchFilters | dict[str, Any] | None, *, smart_search: bool
+    ) -> SearchFilters:
+        with stage("coerce"):
+            f = _coerce_filters(filters)
+        if smart_search and any((f.universite, f.program, f.il)):
+            self._ensure_lookups()
+            with stage("resolve"):
+                f = _resolve_smart_fields(f, self._lookups)
+        return f
+
+    def _fetch_page(
+        self,
+        filters: SearchFilters,
+        *,
+        page: int,
+        size: int,
+        sort_by: str,
+        direction: str,
+        lazy: bool = False,
+    ) -> SearchPage[Program] | SearchPage[LazyProgram]:
+        with stage("build"):
+            body = _build_request(
+                filters, page=page, size=size, sort_by=sort_by, direction=direction
+            )
+        raw = self._post_search(body)
+        with stage("validate"):
+            return parse_search_page(raw, lazy=lazy)
+
+    def _iter_raw_pages(
+        self,
+        filters: SearchFilters,
+        *,
+        size: int,
+        sort_by: str,
+        direction: str,
+        concurrency: int,
+        ordered: bool,
+    ) -> Iterator[dict[str, Any]]:
+        def fetch(page: int) -> Any:
+            with stage("build"):
+                body = _build_request(
+                    filters, page=page, size=size, sort_by=sort_by, direction=direction
+                )
+            return self._post_search(body)
+
+        _check_concurrency(concurrency)
+        first = fetch(0)
+        yield first
+        pages = range(1, _total_pages(first))
+        yield from iter_bounded(fetch, pages, concurrency=concurrency, ordered=ordered)
+
+    def _probe(self, filters: SearchFilters) -> Probe:
+        with stage("build"):
+            body = _build_request(
+                filters, page=0, size=1, sort_by=PROBE_SORT_BY, direction=PROBE_DIRECTION
+            )
+        return Probe.from_raw(self._post_search(body))
+
+    def _post_search(self, body: dict[str, Any]) -> Any:
+        cache = self.response_cache
+        if cache is None:
+            return self._http.post_json(_SEARCH_PATH, json_body=body, idempotent=True)
+        key = canonical_key(body)
+        raw = cache.get(key)
+        if self.metrics is not None:
+            self.metrics.record_cache("response", hit=raw is not None)
+        if raw is None:
+            raw = self._http.post_json(_SEARCH_PATH, json_body=body, idempotent=True)
+            cache.set(key, raw)
+        return raw
+
     def _ensure_lookups(self) -> None:
-        if self._lookups.is_fresh():
+        fresh = self._lookups.is_fresh()
+        if self.metrics is not None:
+            self.metrics.record_cache("lookup", hit=fresh)
+        if fresh:
+            return
+        if self._lookups.is_usable():
+            self._refresh_in_background()
+            return
+        # Threads arriving on a cold or too-stale cache wait for the one doing the fetch.
+        with self._lookups.refresh_lock:
+            if self._lookups.is_usable() or self._lookups.load():
+                return
+            self._fetch_lookups()
+
+    def _refresh_in_background(self) -> None:
+        """Start a refresh thread unless one (or a foreground refresh) is already running.
+
+        After a failed refresh no new one starts for ``_REFRESH_RETRY_COOLDOWN`` seconds.
+        """
+        if self._refresh_cooling_down():
             return
-        self._fetch_lookups()
+        lock = self._lookups.refresh_lock
+        if not lock.acquire(blocking=False):
+            return
+
+        def run() -> None:
+            try:
+                if not self._lookups.is_fresh():
+                    self._fetch_lookups()
+                self._refresh_failed_at = None
+            except Exception as exc:  # keep serving the stale tables
+                self._refresh_failed_at = time.monotonic()
+                warnings.warn(
+                    f"Background lookup refresh failed: {exc!r}", RuntimeWarning, stacklevel=1
+                )
+            finally:
+                lock.release()
+
+        self._refresher = threading.Thread(target=run, name="yokatlas-lookup-refresh", daemon=True)
+        self._refresher.start()
+
+    def _refresh_cooling_down(self) -> bool:
+        failed_at = self._refresh_failed_at
+        return failed_at is not None and time.monotonic() - failed_at < _REFRESH_RETRY_COOLDOWN
 
     def _fetch_lookups(self) -> None:
         unis = self._http.get_json(_UNIVERSITIES_PATH)
         progs = self._http.get_json(_PROGRAMS_PATH)
         cities = self._http.get_json(_CITIES_PATH)
-        self._lookups.populate(universities=unis, program_groups=progs, cities=cities)
+        with stage("resolve"):
+            self._lookups.populate(universities=unis, program_groups=progs, cities=cities)
 
 
 # ---------------------------------------------------------------------------
@@ -172,9 +608,18 @@ class AsyncYokAtlasClient:
         settings: Settings | None = None,
         http: AsyncHttpClient | None = None,
     ) -> None:
-        self.settings = settings or default_settings
+        self.settings = settings or get_settings()
         self._http = http or AsyncHttpClient(settings=self.settings)
-        self._lookups = LookupCache(ttl=self.settings.lookup_cache_ttl)
+        self._lookups = LookupCache(
+            ttl=self.settings.lookup_cache_ttl,
+            path=self.settings.lookup_cache_path,
+            max_stale=self.settings.lookup_cache_max_stale,
+        )
+        self.response_cache = ResponseCache.from_settings(self.settings)
+        self.metrics = self._http.metrics
+        self._inflight: AsyncSingleFlight[Any] = AsyncSingleFlight()
+        self._refresher: asyncio.Task[None] | None = None
+        self._refresh_failed_at: float | None = None
 
     async def __aenter__(self) -> "AsyncYokAtlasClient":
         return self
@@ -183,8 +628,11 @@ class AsyncYokAtlasClient:
         await self.aclose()
 
     async def aclose(self) -> None:
+        if self._refresher is not None:
+            await asyncio.gather(self._refresher, return_exceptions=True)
         await self._http.aclose()
 
+    @overload
     async def search(
         self,
         filters: SearchFilters | dict[str, Any] | None = None,
@@ -194,22 +642,260 @@ class AsyncYokAtlasClient:
         sort_by: str = "basariSirasi",
         direction: str = "ASC",
         smart_search: bool = True,
-    ) -> SearchPage[Program]:
-        f = _coerce_filters(filters)
-        if smart_search and any((f.universite, f.program, f.il)):
-            await self._ensure_lookups()
-            f = _resolve_smart_fields(f, self._lookups)
-        body = _build_request(f, page=page, size=size, sort_by=sort_by, direction=direction)
-        raw = await self._http.post_json(_SEARCH_PATH, json_body=body)
-        return SearchPage[Program].model_validate(raw)
+        lazy: Literal[False] = ...,
+    ) -> SearchPage[Program]: ...
+
+    @overload
+    async def search(
+        self,
+        filters: SearchFilters | dict[str, Any] | None = None,
+        *,
+        page: int = 0,
+        size: int = 20,
+        sort_by: str = "basariSirasi",
+        direction: str = "ASC",
+        smart_search: bool = True,
+        lazy: Literal[True],
+    ) -> SearchPage[LazyProgram]: ...
+
+    async def search(
+        self,
+        filters: SearchFilters | dict[str, Any] | None = None,
+        *,
+        page: int = 0,
+        size: int = 20,
+        sort_by: str = "basariSirasi",
+        direction: str = "ASC",
+        smart_search: bool = True,
+        lazy: bool = False,
+    ) -> SearchPage[Program] | SearchPage[LazyProgram]:
+        with trace_call(self.metrics, "search"):
+            f = await self._prepare_filters(filters, smart_search=smart_search)
+            return await self._fetch_page(
+                f, page=page, size=size, sort_by=sort_by, direction=direction, lazy=lazy
+            )
+
+    @overload
+    def iter_programs(
+        self,
+        filters: SearchFilters | dict[str, Any] | None = None,
+        *,
+        size: int = 100,
+        sort_by: str = "basariSirasi",
+        direction: str = "ASC",
+        smart_search: bool = True,
+        concurrency: int = 4,
+        ordered: bool = True,
+        lazy: Literal[False] = ...,
+    ) -> AsyncIterator[Program]: ...
+
+    @overload
+    def iter_programs(
+        self,
+        filters: SearchFilters | dict[str, Any] | None = None,
+        *,
+        size: int = 100,
+        sort_by: str = "basariSirasi",
+        direction: str = "ASC",
+        smart_search: bool = True,
+        concurrency: int = 4,
+        ordered: bool = True,
+        lazy: Literal[True],
+    ) -> AsyncIterator[LazyProgram]: ...
+
+    def iter_programs(
+        self,
+        filters: SearchFilters | dict[str, Any] | None = None,
+        *,
+        size: int = 100,
+        sort_by: str = "basariSirasi",
+        direction: str = "ASC",
+        smart_search: bool = True,
+        concurrency: int = 4,
+        ordered: bool = True,
+        lazy: bool = False,
+    ) -> AsyncIterator[Program] | AsyncIterator[LazyProgram]:
+        """Async counterpart of :meth:`YokAtlasClient.iter_programs`."""
+        _check_concurrency(concurrency)
+        return self._iter_programs(
+            filters,
+            size=size,
+            sort_by=sort_by,
+            direction=direction,
+            smart_search=smart_search,
+            concurrency=concurrency,
+            ordered=ordered,
+            lazy=lazy,
+        )
+
+    async def _iter_programs(
+        self,
+        filters: SearchFilters | dict[str, Any] | None,
+        *,
+        size: int,
+        sort_by: str,
+        direction: str,
+        smart_search: bool,
+        concurrency: int,
+        ordered: bool,
+        lazy: bool,
+    ) -> AsyncIterator[Program] | AsyncIterator[LazyProgram]:
+        f = await self._prepare_filters(filters, smart_search=smart_search)
+        async for raw in self._iter_raw_pages(
+            f,
+            size=size,
+            sort_by=sort_by,
+            direction=direction,
+            concurrency=concurrency,
+            ordered=ordered,
+        ):
+            with stage("validate"):
+                page = parse_search_page(raw, lazy=lazy)
+            for prog in page.content:
+                yield prog
+
+    async def search_all(
+        self,
+        filters: SearchFilters | dict[str, Any] | None = None,
+        *,
+        size: int = 100,
+        sort_by: str = "basariSirasi",
+        direction: str = "ASC",
+        smart_search: bool = True,
+        concurrency: int = 4,
+        ordered: bool = True,
+    ) -> list[Program]:
+        with trace_call(self.metrics, "search_all"):
+            return [
+                prog
+                async for prog in self.iter_programs(
+                    filters,
+                    size=size,
+                    sort_by=sort_by,
+                    direction=direction,
+                    smart_search=smart_search,
+                    concurrency=concurrency,
+                    ordered=ordered,
+                )
+            ]
+
+    async def search_columns(
+        self,
+        filters: SearchFilters | dict[str, Any] | None = None,
+        *,
+        size: int = 100,
+        sort_by: str = "basariSirasi",
+        direction: str = "ASC",
+        smart_search: bool = True,
+        concurrency: int = 4,
+        ordered: bool = True,
+        format: ColumnFormat = "python",
+    ) -> Any:
+        with trace_call(self.metrics, "search_columns"):
+            f = await self._prepare_filters(filters, smart_search=smart_search)
+            rows: list[dict[str, Any]] = []
+            async for raw in self._iter_raw_pages(
+                f,
+                size=size,
+                sort_by=sort_by,
+                direction=direction,
+                concurrency=concurrency,
+                ordered=ordered,
+            ):
+                rows.extend(raw["content"])
+            return programs_to_columns(rows, format=format)
+
+    async def plan_query(
+        self,
+        filters: SearchFilters | dict[str, Any] | None = None,
+        *,
+        max_rows: int = 2000,
+        smart_search: bool = True,
+        concurrency: int = 4,
+    ) -> QueryPlan:
+        """Async counterpart of :meth:`YokAtlasClient.plan_query`."""
+        with trace_call(self.metrics, "plan_query"):
+            f = await self._prepare_filters(filters, smart_search=smart_search)
+            cities = await self.list_cities()
+            steps = plan_steps(f, max_rows=max_rows, il_kodlari=[c.il_kodu for c in cities])
+            batch = next(steps)
+            while True:
+                probes = [
+                    p async for p in aiter_bounded(self._probe, batch, concurrency=concurrency)
+                ]
+                try:
+                    batch = steps.send(probes)
+                except StopIteration as done:
+                    result: QueryPlan = done.value
+                    return result
+
+    async def search_planned(
+        self,
+        filters: SearchFilters | dict[str, Any] | None = None,
+        *,
+        plan: QueryPlan | None = None,
+        size: int = 500,
+        max_pages: int = 4,
+        sort_by: str = "basariSirasi",
+        direction: str = "ASC",
+        smart_search: bool = True,
+        concurrency: int = 4,
+    ) -> list[Program]:
+        """Async counterpart of :meth:`YokAtlasClient.search_planned`."""
+        if plan is not None and filters is not None:
+            raise ValueError("pass either filters or plan, not both")
+        with trace_call(self.metrics, "search_planned"):
+            if plan is None:
+                plan = await self.plan_query(
+                    filters,
+                    max_rows=size * max_pages,
+                    smart_search=smart_search,
+                    concurrency=concurrency,
+                )
+
+            async def fetch(query: PlannedQuery) -> list[tuple[dict[str, Any], Program]]:
+                rows: list[tuple[dict[str, Any], Program]] = []
+                async for raw in self._iter_raw_pages(
+                    query.filters,
+                    size=size,
+                    sort_by=sort_by,
+                    direction=direction,
+                    concurrency=1,
+                    ordered=True,
+                ):
+                    with stage("validate"):
+                        page = parse_search_page(raw)
+                    rows.extend(zip(raw["content"], page.content))  # type: ignore[arg-type]
+                return rows
+
+            parts = [
+                rows async for rows in aiter_bounded(fetch, plan.queries, concurrency=concurrency)
+            ]
+            return merge_sorted(parts, sort_by=sort_by, direction=direction)
 
     async def get_program(self, kilavuz_kodu: int | str) -> Program | None:
-        try:
-            code = int(kilavuz_kodu)
-        except (TypeError, ValueError) as exc:
-            raise ValueError(f"kilavuz_kodu must be an int (got {kilavuz_kodu!r})") from exc
-        page = await self.search(SearchFilters(kilavuz_kodu=code), size=1, smart_search=False)
-        return page.content[0] if page.content else None
+        with trace_call(self.metrics, "get_program"):
+            code = _coerce_code(kilavuz_kodu)
+            page = await self.search(SearchFilters(kilavuz_kodu=code), size=1, smart_search=False)
+            return page.content[0] if page.content else None
+
+    async def get_programs(
+        self, codes: Iterable[int | str], *, concurrency: int = 8
+    ) -> dict[int, Program | None]:
+        """Async counterpart of :meth:`YokAtlasClient.get_programs`."""
+        with trace_call(self.metrics, "get_programs"):
+            unique = _unique_codes(codes)
+
+            async def fetch(code: int) -> tuple[int, Program | None]:
+                return code, await self.get_program(code)
+
+            found = {
+                code: program
+                async for code, program in aiter_bounded(
+                    fetch, unique, concurrency=concurrency, ordered=False
+                )
+            }
+            return {code: found[code] for code in unique}
 
     async def list_universities(self) -> list[University]:
         await self._ensure_lookups()
@@ -224,20 +910,134 @@ class AsyncYokAtlasClient:
         return self._lookups.cities
 
     async def refresh_lookups(self) -> None:
-        self._lookups.invalidate()
-        await self._fetch_lookups()
+        await self._inflight.do("lookups", self._fetch_lookups)
+
+    async def _prepare_filters(
+        self, filters: SearchFilters | dict[str, Any] | None, *, smart_search: bool
+    ) -> SearchFilters:
+        with stage("coerce"):
+            f = _coerce_filters(filters)
+        if smart_search and any((f.universite, f.program, f.il)):
+            await self._ensure_lookups()
+            with stage("resolve"):
+                f = _resolve_smart_fields(f, self._lookups)
+        return f
+
+    async def _fetch_page(
+        self,
+        filters: SearchFilters,
+        *,
+        page: int,
+        size: int,
+        sort_by: str,
+        direction: str,
+        lazy: bool = False,
+    ) -> SearchPage[Program] | SearchPage[LazyProgram]:
+        with stage("build"):
+            body = _build_request(
+                filters, page=page, size=size, sort_by=sort_by, direction=direction
+            )
+        raw = await self._post_search(body)
+        with stage("validate"):
+            return parse_search_page(raw, lazy=lazy)
+
+    async def _iter_raw_pages(
+        self,
+        filters: SearchFilters,
+        *,
+        size: int,
+        sort_by: str,
+        direction: str,
+        concurrency: int,
+        ordered: bool,
+    ) -> AsyncIterator[dict[str, Any]]:
+        async def fetch(page: int) -> Any:
+            with stage("build"):
+                body = _build_request(
+                    filters, page=page, size=size, sort_by=sort_by, direction=direction
+                )
+            return await self._post_search(body)
+
+        _check_concurrency(concurrency)
+        first = await fetch(0)
+        yield first
+        pages = range(1, _total_pages(first))
+        async for raw in aiter_bounded(fetch, pages, concurrency=concurrency, ordered=ordered):
+            yield raw
+
+    async def _probe(self, filters: SearchFilters) -> Probe:
+        with stage("build"):
+            body = _build_request(
+                filters, page=0, size=1, sort_by=PROBE_SORT_BY, direction=PROBE_DIRECTION
+            )
+        return Probe.from_raw(await self._post_search(body))
+
+    async def _post_search(self, body: dict[str, Any]) -> Any:
+        key = canonical_key(body)
+        if self.response_cache is not None:
+            raw = await self.response_cache.aget(key)
+            if self.metrics is not None:
+                self.metrics.record_cache("response", hit=raw is not None)
+            if raw is not None:
+                return raw
+        return await self._inflight.do(
+            ("search", key), lambda: self._post_search_uncached(key, body)
+        )
+
+    async def _post_search_uncached(self, key: str, body: dict[str, Any]) -> Any:
+        raw = await self._http.post_json(_SEARCH_PATH, json_body=body, idempotent=True)
+        if self.response_cache is not None:
+            await self.response_cache.aset(key, raw)
+        return raw
 
     async def _ensure_lookups(self) -> None:
-        if self._lookups.is_fresh():
+        fresh = self._lookups.is_fresh()
+        if self.metrics is not None:
+            self.metrics.record_cache("lookup", hit=fresh)
+        if fresh:
+            return
+        if self._lookups.is_usable():
+            self._refresh_in_background()
+            return
+        if self._lookups.path is not None and await asyncio.to_thread(self._lookups.load):
+            return
+        # Concurrent callers on a cold or too-stale cache share one refresh.
+        await self._inflight.do("lookups", self._fetch_lookups)
+
+    def _refresh_in_background(self) -> None:
+        """Start a refresh task unless one is already in flight or a recent one failed."""
+        if self._inflight.in_flight("lookups") or self._refresh_cooling_down():
             return
-        await self._fetch_lookups()
+
+        async def run() -> None:
+            try:
+                await self._inflight.do("lookups", self._fetch_lookups)
+                self._refresh_failed_at = None
+            except Exception as exc:  # keep serving the stale tables
+                self._refresh_failed_at = time.monotonic()
+                warnings.warn(
+                    f"Background lookup refresh failed: {exc!r}", RuntimeWarning, stacklevel=1
+                )
+
+        self._refresher = asyncio.ensure_future(run())
+
+    def _refresh_cooling_down(self) -> bool:
+        failed_at = self._refresh_failed_at
+        return failed_at is not None and time.monotonic() - failed_at < _REFRESH_RETRY_COOLDOWN
 
     async def _fetch_lookups(self) -> None:
         unis_task = self._http.get_json(_UNIVERSITIES_PATH)
         progs_task = self._http.get_json(_PROGRAMS_PATH)
         cities_task = self._http.get_json(_CITIES_PATH)
         unis, progs, cities = await asyncio.gather(unis_task, progs_task, cities_task)
-        self._lookups.populate(universities=unis, program_groups=progs, cities=cities)
+        with stage("resolve"):
+            if self._lookups.path is None:
+                self._lookups.populate(universities=unis, program_groups=progs, cities=cities)
+            else:
+                # Persisting the tables writes and fsyncs a file; keep it off the event loop.
+                await asyncio.to_thread(
+                    self._lookups.populate, universities=unis, program_groups=progs, cities=cities
+                )
 
 
 # ---------------------------------------------------------------------------
@@ -246,13 +1046,16 @@ class AsyncYokAtlasClient:
 
 
 _default_client: YokAtlasClient | None = None
+_default_client_lock = threading.Lock()
 
 
 def _get_default_client() -> YokAtlasClient:
     global _default_client
     if _default_client is None:
-        _default_client = YokAtlasClient()
-        atexit.register(_default_client.close)
+        with _default_client_lock:
+            if _default_client is None:
+                _default_client = YokAtlasClient()
+                atexit.register(_default_client.close)
     return _default_client
 
 
@@ -280,6 +1083,10 @@ def get_program(kilavuz_kodu: int | str) -> Program | None:
     return _get_default_client().get_program(kilavuz_kodu)
 
 
+def get_programs(codes: Iterable[int | str], *, concurrency: int = 8) -> dict[int, Program | None]:
+    return _get_default_client().get_programs(codes, concurrency=concurrency)
+
+
 def list_universities() -> list[University]:
     return _get_default_client().list_universities()
 
@@ -0,0 +1,166 @@
+"""Column-oriented export of search results.
+
+:func:`programs_to_columns` turns raw search rows (the dicts inside a search
+response's ``content``) straight into one list per column, without building
+:class:`~yokatlas_py.models.Program` / :class:`~yokatlas_py.models.YearlyStats`
+objects. Already-validated :class:`Program` instances are accepted as well.
+
+Columns are the scalar :class:`Program` fields followed by every
+:class:`YearlyStats` metric expanded per year offset: ``min_puan_0`` is the
+current year, ``min_puan_1`` … ``min_puan_3`` the three previous years.
+"""
+
+from __future__ import annotations
+
+import types
+import typing
+from typing import Any, Callable, Iterable, Literal, Union
+
+from .models import (
+    _YEAR_OFFSETS,
+    _YEARLY_KEYS,
+    LazyProgram,
+    Program,
+    _coerce_float,
+    _coerce_int,
+    _ProgramFields,
+)
+
+ColumnFormat = Literal["python", "numpy", "arrow"]
+
+
+def _coerce_str(value: Any) -> str | None:
+    if value is None:
+        return None
+    return value.strip() if isinstance(value, str) else str(value)
+
+
+def _scalar_type(annotation: Any) -> type:
+    origin = typing.get_origin(annotation)
+    args = typing.get_args(annotation) if origin in (Union, types.UnionType) else (annotation,)
+    return int if int in args else str
+
+
+def _program_scalars() -> tuple[tuple[str, str, type, Callable[[Any], Any]], ...]:
+    return tuple(
+        (name, field.alias or name, typ, _coerce_int if typ is int else _coerce_str)
+        for name, field in _ProgramFields.model_fields.items()
+        for typ in (_scalar_type(field.annotation),)
+    )
+
+
+# (column name, raw camelCase key, python type, coercer) for every scalar Program field
+_PROGRAM_SCALARS = _program_scalars()
+
+# (column name, year offset, yearly attribute, raw camelCase key, snake_case key, python type, coercer)
+_YEARLY_COLUMNS: list[tuple[str, int, str, str, str, type, Callable[[Any], Any]]] = [
+    (
+        f"{snake}_{offset}",
+        offset,
+        snake,
+        key_camel,
+        key_snake,
+        float if coerce is _coerce_float else int,
+        coerce,
+    )
+    for offset in _YEAR_OFFSETS
+    for snake, key_camel, key_snake, coerce in _YEARLY_KEYS[offset]
+]
+
+COLUMN_TYPES: dict[str, type] = {
+    **{name: typ for name, _, typ, _ in _PROGRAM_SCALARS},
+    **{name: typ for name, _, _, _, _, typ, _ in _YEARLY_COLUMNS},
+}
+"""Column name → Python type (``int``, ``float`` or ``str``); every column is nullable."""
+
+
+def _raw_value(row: dict[str, Any], camel: str, snake: str) -> Any:
+    if camel in row:
+        return row[camel]
+    return row.get(snake)
+
+
+def _append_raw(columns: dict[str, list[Any]], row: dict[str, Any]) -> None:
+    for name, camel, _, coerce in _PROGRAM_SCALARS:
+        columns[name].append(coerce(_raw_value(row, camel, name)))
+    for name, _, _, camel, snake, _, coerce in _YEARLY_COLUMNS:
+        columns[name].append(coerce(_raw_value(row, camel, snake)))
+
+
+def _append_program(columns: dict[str, list[Any]], program: Program) -> None:
+    for name, *_ in _PROGRAM_SCALARS:
+        columns[name].append(getattr(program, name))
+    years = program.all_years
+    for name, offset, attr, *_ in _YEARLY_COLUMNS:
+        columns[name].append(getattr(years[offset], attr) if offset < len(years) else None)
+
+
+def programs_to_columns(
+    rows: Iterable[dict[str, Any] | Program | LazyProgram],
+    *,
+    format: ColumnFormat = "python",
+) -> Any:
+    """Build a column-oriented table from raw search rows and/or program objects.
+
+    ``format="python"`` returns ``dict[str, list]`` (types per :data:`COLUMN_TYPES`,
+    ``None`` for missing values). ``"numpy"`` returns ``dict[str, numpy.ndarray]``
+    with numeric columns as masked arrays; ``"arrow"`` returns a ``pyarrow.Table``.
+    """
+    if format not in ("python", "numpy", "arrow"):
+        raise ValueError(f"format must be 'python', 'numpy' or 'arrow' (got {format!r})")
+    columns: dict[str, list[Any]] = {name: [] for name in COLUMN_TYPES}
+    for row in rows:
+        if isinstance(row, Program):
+            _append_program(columns, row)
+        elif isinstance(row, LazyProgram):
+            _append_raw(columns, row._raw)
+        else:
+            _append_raw(columns, row)
+    if format == "numpy":
+        return _to_numpy(columns)
+    if format == "arrow":
+        return _to_arrow(columns)
+    return columns
+
+
+def _to_numpy(columns: dict[str, list[Any]]) -> dict[str, Any]:
+    try:
+        import numpy as np
+    except ImportError as exc:  # pragma: no cover - depends on environment
+        raise ImportError(
+            "format='numpy' requires numpy: pip install 'yokatlas-py[numpy]'"
+        ) from exc
+
+    out: dict[str, Any] = {}
+    for name, values in columns.items():
+        typ = COLUMN_TYPES[name]
+        if typ is str:
+            out[name] = np.array(values, dtype=object)
+            continue
+        mask = np.fromiter((v is None for v in values), dtype=bool, count=len(values))
+        dtype = np.int64 if typ is int else np.float64
+        filled = np.fromiter(
+            (0 if v is None else v for v in values), dtype=dtype, count=len(values)
+        )
+        out[name] = np.ma.MaskedArray(filled, mask=mask)
+    return out
+
+
+def _to_arrow(columns: dict[str, list[Any]]) -> Any:
+    try:
+        import pyarrow as pa
+    except ImportError as exc:  # pragma: no cover - depends on environment
+        raise ImportError(
+            "format='arrow' requires pyarrow: pip install 'yokatlas-py[arrow]'"
+        ) from exc
+
+    arrow_types = {int: pa.int64(), float: pa.float64(), str: pa.string()}
+    return pa.table(
+        {
+            name: pa.array(values, type=arrow_types[COLUMN_TYPES[name]])
+            for name, values in columns.items()
+        }
+    )
+
+
+__all__ = ["COLUMN_TYPES", "ColumnFormat", "programs_to_columns"]
@@ -2,6 +2,10 @@
 
 from __future__ import annotations
 
+import threading
+from pathlib import Path
+from typing import Any, Literal
+
 from pydantic import Field, HttpUrl
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -21,8 +25,62 @@ class Settings(BaseSettings):
         description="Base URL for the YÖK Atlas JSON API.",
     )
     timeout: float = Field(default=30.0, gt=0, le=300, description="HTTP timeout in seconds.")
+    connect_timeout: float | None = Field(
+        default=None, gt=0, le=300, description="Connect timeout (seconds); defaults to timeout."
+    )
+    read_timeout: float | None = Field(
+        default=None, gt=0, le=300, description="Read timeout (seconds); defaults to timeout."
+    )
+    write_timeout: float | None = Field(
+        default=None, gt=0, le=300, description="Write timeout (seconds); defaults to timeout."
+    )
+    pool_timeout: float | None = Field(
+        default=None,
+        gt=0,
+        le=300,
+        description="Max wait (seconds) for a free pooled connection; defaults to timeout.",
+    )
+    pool_max_connections: int = Field(
+        default=100, ge=1, description="Max concurrent connections per client."
+    )
+    pool_max_keepalive: int = Field(
+        default=20,
+        ge=0,
+        description=(
+            "Idle connections kept open for reuse. Larger pools slow wide fan-outs down "
+            "(httpcore's pool bookkeeping grows with open connections); measure before raising it."
+        ),
+    )
+    keepalive_expiry: float = Field(
+        default=5.0, ge=0, description="Seconds an idle pooled connection is kept open."
+    )
+    http2: bool = Field(
+        default=False, description="Use HTTP/2 (multiplexed requests). Requires the [http2] extra."
+    )
+    compression: bool = Field(default=True, description="Accept gzip/deflate-compressed responses.")
     verify_ssl: bool = Field(default=True, description="Verify TLS certificates.")
-    max_retries: int = Field(default=3, ge=0, le=10, description="HTTP transport retries.")
+    max_retries: int = Field(
+        default=3, ge=0, le=10, description="HTTP transport retries (connection failures only)."
+    )
+    retry_attempts: int = Field(
+        default=3,
+        ge=0,
+        le=10,
+        description="Retries per call for transient failures (5xx, 408, 418/429, timeouts, dropped connections).",
+    )
+    retry_backoff: float = Field(
+        default=0.5,
+        ge=0,
+        description="Base delay (seconds) for exponential backoff with full jitter.",
+    )
+    retry_backoff_max: float = Field(
+        default=30.0, ge=0, description="Cap (seconds) on a single backoff delay."
+    )
+    retry_budget: float = Field(
+        default=120.0,
+        ge=0,
+        description="Max total seconds one call may spend waiting between retries (Retry-After included).",
+    )
     user_agent: str = Field(
         default="yokatlas-py/0.6",
         description="User-Agent header.",
@@ -32,6 +90,86 @@ class Settings(BaseSettings):
         ge=0,
         description="TTL (seconds) for the in-process universities/programs/cities cache.",
     )
+    lookup_cache_path: Path | None = Field(
+        default=None,
+        description=(
+            "Optional JSON file persisting the lookup tables across processes. "
+            "Entries older than lookup_cache_ttl are ignored."
+        ),
+    )
+    lookup_cache_max_stale: int = Field(
+        default=0,
+        ge=0,
+        description=(
+            "Stale-while-revalidate window (seconds): expired lookup tables keep serving this long past "
+            "lookup_cache_ttl while a background refresh runs. 0 always refreshes in the foreground."
+        ),
+    )
+    response_cache_size: int = Field(
+        default=0,
+        ge=0,
+        description="Max search responses kept in the in-memory LRU cache (0 disables it).",
+    )
+    response_cache_ttl: int = Field(
+        default=3600,
+        ge=0,
+        description="TTL (seconds) for in-memory cached search responses (0 = no expiry).",
+    )
+    response_cache_path: Path | None = Field(
+        default=None,
+        description="Optional directory for the on-disk search response cache tier.",
+    )
+    response_cache_disk_ttl: int = Field(
+        default=86400,
+        ge=0,
+        description="TTL (seconds) for on-disk cached search responses (0 = no expiry).",
+    )
+
+    json_codec: Literal["auto", "orjson", "msgspec", "json"] = Field(
+        default="auto",
+        description=(
+            "JSON library for request bodies and responses. 'auto' prefers orjson, "
+            "then msgspec, and falls back to the stdlib json module."
+        ),
+    )
+
+    rate_limit: float = Field(
+        default=0,
+        ge=0,
+        description=(
+            "Initial client-side request rate (req/s) for the adaptive rate limiter; 0 disables it. "
+            "The rate grows on success and is cut on 418/429 responses."
+        ),
+    )
+    rate_limit_burst: int = Field(
+        default=10, ge=1, description="Token bucket capacity (max requests sent back to back)."
+    )
+    rate_limit_min: float = Field(
+        default=0.5, gt=0, description="Lower bound (req/s) the limiter backs off to."
+    )
+    rate_limit_max: float = Field(
+        default=50.0, gt=0, description="Upper bound (req/s) the limiter ramps up to."
+    )
+    rate_limit_increase: float = Field(
+        default=1.0,
+        ge=0,
+        description="Additive increase: req/s gained per second of successful traffic.",
+    )
+    rate_limit_decrease: float = Field(
+        default=0.5,
+        gt=0,
+        lt=1,
+        description="Multiplicative decrease applied to the rate on each 418/429 response.",
+    )
+    rate_limit_path: Path | None = Field(
+        default=None,
+        description="Optional state file shared by every process on the host, so they draw from one rate budget.",
+    )
+
+    metrics: bool = Field(
+        default=False,
+        description="Record request, cache, retry and per-stage timing metrics on client.metrics (see yokatlas_py.metrics).",
+    )
 
     def headers(self) -> dict[str, str]:
         return {
@@ -41,4 +179,22 @@ class Settings(BaseSettings):
         }
 
 
-settings = Settings()
+_settings: Settings | None = None
+_settings_lock = threading.Lock()
+
+
+def get_settings() -> Settings:
+    """The process-wide default :class:`Settings`, read from the environment and ``.env`` on first use."""
+    global _settings
+    if _settings is None:
+        with _settings_lock:
+            if _settings is None:
+                _settings = Settings()
+    return _settings
+
+
+def __getattr__(name: str) -> Any:
+    # ``config.settings`` is built on first access, not at import time.
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
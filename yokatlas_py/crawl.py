@@ -0,0 +1,246 @@
+"""Multi-process crawl of the whole tercih kılavuzu.
+
+Validating :class:`~yokatlas_py.models.Program` rows is CPU-bound, so one
+process tops out on a single core long before the network is saturated.
+:func:`crawl` splits a search into disjoint partitions along
+:class:`~yokatlas_py.models.SearchFilters` dimensions (``puan_turu``,
+``il_kodu``, ``universite_turu``), fetches them in a process pool with one
+:class:`~yokatlas_py.client.YokAtlasClient` per worker process, and merges
+the rows into one list, deduplicated by kılavuz kodu.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+from multiprocessing.util import Finalize
+from typing import Any, Callable, Iterable, Literal, Sequence, get_args
+
+from pydantic import BaseModel
+
+from .client import YokAtlasClient, _coerce_filters
+from .config import Settings, get_settings
+from .models import Program, PuanTuru, SearchFilters, parse_search_page
+
+Dimension = Literal["puan_turu", "il_kodu", "universite_turu"]
+
+DEFAULT_PARTITION_BY: tuple[Dimension, ...] = ("puan_turu", "il_kodu")
+
+ClientFactory = Callable[[Settings], YokAtlasClient]
+
+_UNIVERSITE_TURLERI: tuple[str, ...] = ("DEVLET", "VAKIF")
+
+
+class CrawlPartition(BaseModel):
+    """One shard of a :func:`crawl`: its filters and what the API reported for it."""
+
+    filters: SearchFilters
+    total: int = 0
+    fetched: int = 0
+    seconds: float = 0.0
+
+
+class CrawlResult(BaseModel):
+    """Merged output of :func:`crawl`.
+
+    ``programs`` holds every row once, ordered by kılavuz kodu. ``expected``
+    is the total the API reports for the unpartitioned search; ``duplicates``
+    counts rows returned by more than one partition.
+    """
+
+    programs: list[Program] = []
+    partitions: list[CrawlPartition] = []
+    expected: int = 0
+    duplicates: int = 0
+    seconds: float = 0.0
+
+    @property
+    def complete(self) -> bool:
+        return len(self.programs) >= self.expected
+
+
+def partition_filters(
+    filters: SearchFilters | dict[str, Any] | None = None,
+    *,
+    by: Sequence[Dimension] = DEFAULT_PARTITION_BY,
+    il_kodlari: Iterable[int] = (),
+) -> list[SearchFilters]:
+    """Split ``filters`` into disjoint filters, one per combination of ``by`` values.
+
+    A dimension already restricted by ``filters`` is split over its own
+    values; otherwise it ranges over every puan türü, both üniversite
+    türleri, or ``il_kodlari``. Smart string fields must be resolved first.
+    """
+    base = _coerce_filters(filters)
+    if any((base.universite, base.program, base.il)):
+        raise ValueError(
+            "partition_filters needs resolved filters; pass universite_id/birim_grup_id/il_kodu instead"
+        )
+    unknown = set(by) - set(get_args(Dimension))
+    if unknown:
+        raise ValueError(
+            f"cannot partition by {sorted(unknown)}; choose from {list(get_args(Dimension))}"
+        )
+    domains: list[list[Any]] = []
+    for dim in dict.fromkeys(by):
+        if dim == "puan_turu":
+            domains.append([base.puan_turu] if base.puan_turu else list(get_args(PuanTuru)))
+        elif dim == "universite_turu":
+            domains.append(
+                [base.universite_turu] if base.universite_turu else list(_UNIVERSITE_TURLERI)
+            )
+        else:
+            codes = base.il_kodu or list(il_kodlari)
+            if not codes:
+                raise ValueError("il_kodlari is required to partition by il_kodu")
+            domains.append([[code] for code in dict.fromkeys(codes)])
+    dims = list(dict.fromkeys(by))
+    return [base.model_copy(update=dict(zip(dims, values))) for values in product(*domains)]
+
+
+# ---------------------------------------------------------------------------
+# Worker side
+# ---------------------------------------------------------------------------
+
+
+_worker_client: YokAtlasClient | None = None
+
+
+def _default_factory(settings: Settings) -> YokAtlasClient:
+    return YokAtlasClient(settings=settings)
+
+
+def _init_worker(factory: ClientFactory, settings: Settings) -> None:
+    global _worker_client
+    _worker_client = factory(settings)
+    # Pool workers leave through ``os._exit``: ``atexit`` would never run.
+    Finalize(_worker_client, _worker_client.close, exitpriority=10)
+
+
+def _fetch_partition(
+    client: YokAtlasClient, filters: SearchFilters, size: int, concurrency: int
+) -> tuple[CrawlPartition, list[Program]]:
+    start = time.perf_counter()
+    total = 0
+    programs: list[Program] = []
+    pages = client._iter_raw_pages(
+        filters,
+        size=size,
+        sort_by="basariSirasi",
+        direction="ASC",
+        concurrency=concurrency,
+        ordered=False,
+    )
+    for raw in pages:
+        page = parse_search_page(raw)
+        total = total or page.total_elements
+        programs.extend(page.content)  # type: ignore[arg-type]
+    part = CrawlPartition(
+        filters=filters, total=total, fetched=len(programs), seconds=time.perf_counter() - start
+    )
+    return part, programs
+
+
+def _crawl_partition(
+    filters: SearchFilters, size: int, concurrency: int
+) -> tuple[CrawlPartition, list[Program]]:
+    if _worker_client is None:
+        raise RuntimeError("crawl worker used before its initializer ran")
+    return _fetch_partition(_worker_client, filters, size, concurrency)
+
+
+# ---------------------------------------------------------------------------
+# Entry point
+# ---------------------------------------------------------------------------
+
+
+def crawl(
+    filters: SearchFilters | dict[str, Any] | None = None,
+    *,
+    partition_by: Sequence[Dimension] = DEFAULT_PARTITION_BY,
+    processes: int | None = None,
+    settings: Settings | None = None,
+    client_factory: ClientFactory = _default_factory,
+    size: int = 100,
+    concurrency: int = 4,
+) -> CrawlResult:
+    """Fetch every program matching ``filters`` across ``processes`` worker processes.
+
+    Smart filters are resolved once in the calling process. Each partition
+    is fetched by one worker (``size`` rows per page, ``concurrency`` pages
+    in flight); ``client_factory`` builds each worker's client and must be
+    picklable. ``processes`` defaults to the CPU count; with ``1`` (or a
+    single partition) everything runs in the calling process.
+
+    Each worker has its own rate limiter; set ``rate_limit_path`` to make
+    them share one budget. Emits a :class:`RuntimeWarning` when the
+    partitions do not add up to the unpartitioned total.
+    """
+    settings = settings or get_settings()
+    started = time.perf_counter()
+    client = client_factory(settings)
+    try:
+        base = client._prepare_filters(filters, smart_search=True)
+        expected = client.search(base, size=1, smart_search=False).total_elements
+        il_kodlari = (
+            [c.il_kodu for c in client.list_cities()]
+            if "il_kodu" in partition_by and not base.il_kodu
+            else []
+        )
+        parts = partition_filters(base, by=partition_by, il_kodlari=il_kodlari)
+        workers = max(1, min(processes or os.cpu_count() or 1, len(parts)))
+        if workers == 1:
+            results = [_fetch_partition(client, f, size, concurrency) for f in parts]
+        else:
+            results = _run_pool(parts, workers, client_factory, settings, size, concurrency)
+    finally:
+        client.close()
+
+    merged: dict[int, Program] = {}
+    duplicates = 0
+    for _, programs in results:
+        for program in programs:
+            if program.kilavuz_kodu in merged:
+                duplicates += 1
+            else:
+                merged[program.kilavuz_kodu] = program
+    covered = sum(part.total for part, _ in results)
+    if covered < expected:
+        warnings.warn(
+            f"Partitions by {list(partition_by)} cover {covered} of {expected} programs; "
+            "rows outside the partitioned values were not fetched",
+            RuntimeWarning,
+            stacklevel=2,
+        )
+    return CrawlResult(
+        programs=[merged[code] for code in sorted(merged)],
+        partitions=[part for part, _ in results],
+        expected=expected,
+        duplicates=duplicates,
+        seconds=time.perf_counter() - started,
+    )
+
+
+def _run_pool(
+    parts: list[SearchFilters],
+    workers: int,
+    factory: ClientFactory,
+    settings: Settings,
+    size: int,
+    concurrency: int,
+) -> list[tuple[CrawlPartition, list[Program]]]:
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(factory, settings)
+    ) as pool:
+        futures = [pool.submit(_crawl_partition, f, size, concurrency) for f in parts]
+        try:
+            return [future.result() for future in futures]
+        except BaseException:
+            pool.shutdown(wait=True, cancel_futures=True)
+            raise
+
+
+__all__ = ["CrawlPartition", "CrawlResult", "DEFAULT_PARTITION_BY", "crawl", "partition_filters"]
@@ -10,7 +10,9 @@ class YokAtlasError(Exception):
 class APIError(YokAtlasError):
     """Raised when the YÖK Atlas API returns an unexpected response."""
 
-    def __init__(self, message: str, *, status_code: int | None = None, body: str | None = None) -> None:
+    def __init__(
+        self, message: str, *, status_code: int | None = None, body: str | None = None
+    ) -> None:
         super().__init__(message)
         self.status_code = status_code
         self.body = body
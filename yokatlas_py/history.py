@@ -0,0 +1,202 @@
+"""Dense multi-year history tensor for trend analytics.
+
+:func:`history_tensor` packs the yearly statistics of many programs into one
+``programs × years × metrics`` NumPy array, so trend metrics are computed
+with array operations instead of Python loops over
+:attr:`Program.all_years <yokatlas_py.models.Program.all_years>`.
+
+The year axis follows :attr:`~yokatlas_py.models.Program.all_years`: index 0
+is the current year, 1 … 3 the three previous years (newest → oldest). The
+metric axis is :data:`METRICS`, the :class:`~yokatlas_py.models.YearlyStats`
+fields. Missing values are ``NaN`` in :attr:`HistoryTensor.values` and
+``True`` in :attr:`HistoryTensor.mask`; the helpers return
+:class:`numpy.ma.MaskedArray` results, like ``programs_to_columns(format="numpy")``.
+
+Requires NumPy (``pip install 'yokatlas-py[numpy]'``).
+"""
+
+from __future__ import annotations
+
+from typing import Any, Iterable
+
+from .models import _YEAR_OFFSETS, _YEARLY_KEYS, LazyProgram, Program, _coerce_int, _current_year
+
+METRICS: tuple[str, ...] = tuple(snake for snake, *_ in _YEARLY_KEYS[0])
+"""Metric axis: the :class:`~yokatlas_py.models.YearlyStats` fields, in declaration order."""
+
+YEARS = len(_YEAR_OFFSETS)
+
+
+def _numpy() -> Any:
+    try:
+        import numpy as np
+    except ImportError as exc:  # pragma: no cover - depends on environment
+        raise ImportError(
+            "history_tensor requires numpy: pip install 'yokatlas-py[numpy]'"
+        ) from exc
+    return np
+
+
+def _raw_column(
+    np: Any, rows: list[dict[str, Any]], key_camel: str, key_snake: str, coerce: Any
+) -> Any:
+    values = [row[key_camel] if key_camel in row else row.get(key_snake) for row in rows]
+    try:
+        # NumPy parses numeric strings itself; only odd values need the per-value coercer.
+        column = np.array([np.nan if v is None or v == "" else v for v in values], dtype=np.float64)
+    except (TypeError, ValueError):
+        return np.array(
+            [np.nan if (c := coerce(v)) is None else c for v in values], dtype=np.float64
+        )
+    return np.trunc(column) if coerce is _coerce_int else column
+
+
+def _raw_block(np: Any, rows: list[dict[str, Any]]) -> Any:
+    """``(len(rows), YEARS, len(METRICS))`` values read column by column from raw rows."""
+    columns = [_raw_column(np, rows, *key[1:]) for keys in _YEARLY_KEYS for key in keys]
+    return np.stack(columns, axis=1).reshape(len(rows), YEARS, len(METRICS))
+
+
+def _program_values(program: Program) -> Iterable[Any]:
+    years = program.all_years
+    for offset in _YEAR_OFFSETS:
+        if offset < len(years):
+            stats = years[offset]
+            for name in METRICS:
+                yield getattr(stats, name)
+        else:
+            yield from [None] * len(METRICS)
+
+
+class HistoryTensor:
+    """Yearly statistics of ``n`` programs as a ``(n, YEARS, len(METRICS))`` float array.
+
+    ``values`` holds ``NaN`` where a value is missing and ``mask`` is ``True``
+    there. ``codes`` (kılavuz kodları) and ``current_year`` are per program;
+    ``index`` maps a kılavuz kodu to its row and ``metric_index`` a metric
+    name to its position on the last axis.
+    """
+
+    __slots__ = ("values", "mask", "codes", "current_year", "index", "metric_index")
+
+    def __init__(self, values: Any, codes: Any, current_year: Any) -> None:
+        np = _numpy()
+        self.values = values
+        self.mask = np.isnan(values)
+        self.codes = codes
+        self.current_year = current_year
+        self.index: dict[int, int] = {int(code): i for i, code in enumerate(codes.tolist())}
+        if len(self.index) != len(codes):
+            raise ValueError("history_tensor needs unique kilavuz_kodu values")
+        self.metric_index: dict[str, int] = {name: i for i, name in enumerate(METRICS)}
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __repr__(self) -> str:
+        return f"HistoryTensor(programs={len(self)}, years={YEARS}, metrics={len(METRICS)})"
+
+    @property
+    def years(self) -> Any:
+        """Calendar year of every ``(program, year)`` cell, shape ``(n, YEARS)``."""
+        np = _numpy()
+        return self.current_year[:, None] - np.arange(YEARS)
+
+    def masked(self) -> Any:
+        """The whole tensor as a masked array."""
+        return _numpy().ma.MaskedArray(self.values, mask=self.mask)
+
+    def metric(self, name: str) -> Any:
+        """One metric for every program and year, shape ``(n, YEARS)``, masked where missing."""
+        try:
+            i = self.metric_index[name]
+        except KeyError:
+            raise ValueError(f"unknown metric {name!r}; choose from {list(METRICS)}") from None
+        return _numpy().ma.MaskedArray(self.values[:, :, i], mask=self.mask[:, :, i])
+
+    def row(self, kilavuz_kodu: int) -> Any:
+        """One program's ``(YEARS, len(METRICS))`` slice, masked where missing."""
+        i = self.index[int(kilavuz_kodu)]
+        return _numpy().ma.MaskedArray(self.values[i], mask=self.mask[i])
+
+    # ---- vectorized trend metrics -------------------------------------------
+
+    def yoy_delta(self, name: str, *, relative: bool = False) -> Any:
+        """Change of ``name`` against the previous year, shape ``(n, YEARS - 1)``.
+
+        Column ``k`` is ``year[k] - year[k + 1]`` (column 0: current year vs
+        last year); with ``relative=True`` it is divided by ``year[k + 1]``.
+        Masked where either year is missing (or the base is zero).
+        """
+        m = self.metric(name)
+        newer, older = m[:, :-1], m[:, 1:]
+        delta = newer - older
+        if not relative:
+            return delta
+        return delta / _numpy().ma.masked_equal(older, 0)
+
+    def rank_volatility(
+        self, name: str = "basari_sirasi", *, relative: bool = False, min_years: int = 2
+    ) -> Any:
+        """Standard deviation of ``name`` across the available years, shape ``(n,)``.
+
+        With ``relative=True`` it is divided by the mean (coefficient of
+        variation), which makes top and bottom ranks comparable. Masked for
+        programs with fewer than ``min_years`` values.
+        """
+        np = _numpy()
+        m = self.metric(name)
+        std = m.std(axis=1)
+        if relative:
+            std = std / np.ma.masked_equal(m.mean(axis=1), 0)
+        return np.ma.masked_where(m.count(axis=1) < min_years, std)
+
+    def fill_rate(self) -> Any:
+        """``yerlesen / kontenjan`` per program and year, shape ``(n, YEARS)``.
+
+        Masked where either is missing or the kontenjan is zero.
+        """
+        np = _numpy()
+        return self.metric("yerlesen") / np.ma.masked_equal(self.metric("kontenjan"), 0)
+
+
+def history_tensor(rows: Iterable[dict[str, Any] | Program | LazyProgram]) -> HistoryTensor:
+    """Build a :class:`HistoryTensor` from raw search rows and/or program objects.
+
+    Raw rows (and :class:`LazyProgram`) are read column by column, without
+    building :class:`~yokatlas_py.models.YearlyStats` objects; values are
+    coerced like :class:`Program` fields. Kılavuz kodları must be unique.
+    """
+    np = _numpy()
+    items = list(rows)
+    values = np.empty((len(items), YEARS, len(METRICS)), dtype=np.float64)
+    codes: list[int | None] = []
+    current_years: list[int] = []
+    raw_pos: list[int] = []
+    raw_rows: list[dict[str, Any]] = []
+    for pos, item in enumerate(items):
+        if isinstance(item, Program):
+            codes.append(item.kilavuz_kodu)
+            current_years.append(item.current.year)
+            flat = np.fromiter(
+                (np.nan if v is None else v for v in _program_values(item)), dtype=np.float64
+            )
+            values[pos] = flat.reshape(YEARS, len(METRICS))
+            continue
+        raw = item._raw if isinstance(item, LazyProgram) else item
+        codes.append(
+            _coerce_int(raw["kilavuzKodu"] if "kilavuzKodu" in raw else raw.get("kilavuz_kodu"))
+        )
+        current_years.append(_current_year(raw))
+        raw_pos.append(pos)
+        raw_rows.append(raw)
+    if raw_rows:
+        values[raw_pos] = _raw_block(np, raw_rows)
+    if None in codes:
+        raise ValueError("every row needs a kilavuz_kodu")
+    return HistoryTensor(
+        values, np.array(codes, dtype=np.int64), np.array(current_years, dtype=np.int64)
+    )
+
+
+__all__ = ["METRICS", "YEARS", "HistoryTensor", "history_tensor"]
@@ -1,22 +1,66 @@
 """HTTP transport layer for the YÖK Atlas JSON API.
 
-Provides a thin wrapper around ``httpx`` with retries, JSON serialization,
+Provides a thin wrapper around ``httpx`` with retries, JSON serialization
+through a pluggable codec (see ``Settings.json_codec``), retries of transient
+failures (see ``Settings.retry_attempts``), optional adaptive rate limiting
+(see ``Settings.rate_limit``), opt-in metrics (see :mod:`yokatlas_py.metrics`),
 and unified error handling for both sync and async use.
 """
 
 from __future__ import annotations
 
-import json
+import asyncio
+import time
 from typing import Any
 
 import httpx
 
-from .config import Settings, settings as default_settings
+from ._json import JsonCodec, get_codec
+from ._ratelimit import RateLimiter, parse_retry_after
+from ._retry import RetryPolicy
+from .config import Settings, get_settings
 from .exceptions import APIError, NotFoundError, RateLimitError
+from .metrics import Metrics, stage
 
+_JSON_HEADERS = {"Content-Type": "application/json"}
+_THROTTLE_STATUSES = (418, 429)
 
-def _build_limits() -> httpx.Limits:
-    return httpx.Limits(max_connections=100, max_keepalive_connections=20)
+
+def _build_limits(settings: Settings) -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=settings.pool_max_connections,
+        max_keepalive_connections=settings.pool_max_keepalive,
+        keepalive_expiry=settings.keepalive_expiry,
+    )
+
+
+def _build_timeout(settings: Settings) -> httpx.Timeout:
+    def pick(value: float | None) -> float:
+        return settings.timeout if value is None else value
+
+    return httpx.Timeout(
+        connect=pick(settings.connect_timeout),
+        read=pick(settings.read_timeout),
+        write=pick(settings.write_timeout),
+        pool=pick(settings.pool_timeout),
+    )
+
+
+def _build_headers(settings: Settings) -> dict[str, str]:
+    headers = settings.headers()
+    if not settings.compression:
+        headers["Accept-Encoding"] = "identity"
+    return headers
+
+
+def _check_http2(settings: Settings) -> bool:
+    if not settings.http2:
+        return False
+    try:
+        import h2  # noqa: F401
+    except ImportError as exc:
+        raise ImportError("http2=True requires h2: pip install 'yokatlas-py[http2]'") from exc
+    return True
 
 
 def _raise_for_response(response: httpx.Response) -> None:
@@ -30,15 +74,58 @@ def _raise_for_response(response: httpx.Response) -> None:
     msg = f"YÖK Atlas API error {response.status_code} for {response.request.url}"
     if response.status_code == 404:
         raise NotFoundError(msg, status_code=response.status_code, body=body)
-    if response.status_code in (418, 429):
+    if response.status_code in _THROTTLE_STATUSES:
         raise RateLimitError(msg, status_code=response.status_code, body=body)
     raise APIError(msg, status_code=response.status_code, body=body)
 
 
-def _decode_json(response: httpx.Response) -> Any:
+def _record_outcome(limiter: RateLimiter | None, response: httpx.Response) -> None:
+    if limiter is None:
+        return
+    if response.status_code in _THROTTLE_STATUSES:
+        limiter.on_throttle(parse_retry_after(response.headers.get("Retry-After")))
+    elif response.is_success:
+        limiter.on_success()
+
+
+async def _arecord_outcome(limiter: RateLimiter | None, response: httpx.Response) -> None:
+    if limiter is None:
+        return
+    if response.status_code in _THROTTLE_STATUSES:
+        await limiter.aon_throttle(parse_retry_after(response.headers.get("Retry-After")))
+    elif response.is_success:
+        await limiter.aon_success()
+
+
+def _observe(
+    metrics: Metrics,
+    method: str,
+    path: str,
+    started: float,
+    sent: Any,
+    outcome: httpx.Response | Exception,
+) -> None:
+    if isinstance(outcome, httpx.Response):
+        # Wire (possibly compressed) bytes; responses built in memory report none.
+        status, received = str(outcome.status_code), outcome.num_bytes_downloaded or len(
+            outcome.content
+        )
+    else:
+        status, received = type(outcome).__name__, 0
+    metrics.observe_request(
+        endpoint=path,
+        method=method,
+        status=status,
+        seconds=time.perf_counter() - started,
+        sent_bytes=len(sent) if sent else 0,
+        received_bytes=received,
+    )
+
+
+def _decode_json(response: httpx.Response, codec: JsonCodec) -> Any:
     try:
-        return response.json()
-    except json.JSONDecodeError as exc:
+        return codec.loads(response.content)
+    except codec.errors as exc:
         raise APIError(
             f"Failed to decode JSON from {response.request.url}: {exc}",
             status_code=response.status_code,
@@ -49,15 +136,26 @@ def _decode_json(response: httpx.Response) -> Any:
 class HttpClient:
     """Synchronous JSON HTTP client over :class:`httpx.Client`."""
 
-    def __init__(self, *, settings: Settings | None = None, client: httpx.Client | None = None) -> None:
-        self.settings = settings or default_settings
+    def __init__(
+        self,
+        *,
+        settings: Settings | None = None,
+        client: httpx.Client | None = None,
+        metrics: Metrics | None = None,
+    ) -> None:
+        self.settings = settings or get_settings()
         if client is None:
-            transport = httpx.HTTPTransport(retries=self.settings.max_retries, verify=self.settings.verify_ssl)
+            # Pool limits and HTTP/2 belong on the transport: httpx ignores them on a client given one.
+            transport = httpx.HTTPTransport(
+                retries=self.settings.max_retries,
+                verify=self.settings.verify_ssl,
+                limits=_build_limits(self.settings),
+                http2=_check_http2(self.settings),
+            )
             client = httpx.Client(
                 base_url=str(self.settings.base_url).rstrip("/"),
-                timeout=self.settings.timeout,
-                headers=self.settings.headers(),
-                limits=_build_limits(),
+                timeout=_build_timeout(self.settings),
+                headers=_build_headers(self.settings),
                 transport=transport,
                 follow_redirects=True,
             )
@@ -65,20 +163,70 @@ class HttpClient:
         else:
             self._owns_client = False
         self._client = client
+        self.codec = get_codec(self.settings.json_codec)
+        self.rate_limiter = RateLimiter.from_settings(self.settings)
+        self.retry_policy = RetryPolicy.from_settings(self.settings)
+        self.metrics = metrics or Metrics.from_settings(self.settings)
 
     @property
     def client(self) -> httpx.Client:
         return self._client
 
-    def get_json(self, path: str, *, params: dict[str, Any] | None = None) -> Any:
-        response = self._client.get(path, params=params)
-        _raise_for_response(response)
-        return _decode_json(response)
+    def get_json(
+        self, path: str, *, params: dict[str, Any] | None = None, retries: int | None = None
+    ) -> Any:
+        return self._request("GET", path, idempotent=True, retries=retries, params=params)
+
+    def post_json(
+        self,
+        path: str,
+        *,
+        json_body: dict[str, Any],
+        idempotent: bool = False,
+        retries: int | None = None,
+    ) -> Any:
+        """POST ``json_body``. Transient failures are retried only if ``idempotent``."""
+        content = self.codec.dumps(json_body)
+        return self._request(
+            "POST",
+            path,
+            idempotent=idempotent,
+            retries=retries,
+            content=content,
+            headers=_JSON_HEADERS,
+        )
 
-    def post_json(self, path: str, *, json_body: dict[str, Any]) -> Any:
-        response = self._client.post(path, json=json_body)
-        _raise_for_response(response)
-        return _decode_json(response)
+    def _request(
+        self, method: str, path: str, *, idempotent: bool, retries: int | None, **kwargs: Any
+    ) -> Any:
+        call = self.retry_policy.call(idempotent=idempotent, retries=retries)
+        metrics = self.metrics
+        while True:
+            if self.rate_limiter is not None:
+                with stage("wait"):
+                    self.rate_limiter.acquire()
+            started = time.perf_counter()
+            try:
+                response = self._client.request(method, path, **kwargs)
+            except httpx.TransportError as exc:
+                if metrics is not None:
+                    _observe(metrics, method, path, started, kwargs.get("content"), exc)
+                delay = call.delay_for_error(exc)
+                if delay is None:
+                    raise
+            else:
+                if metrics is not None:
+                    _observe(metrics, method, path, started, kwargs.get("content"), response)
+                _record_outcome(self.rate_limiter, response)
+                delay = call.delay_for_response(response)
+                if delay is None:
+                    _raise_for_response(response)
+                    with stage("decode"):
+                        return _decode_json(response, self.codec)
+            if metrics is not None:
+                metrics.record_retry(endpoint=path, method=method, reason=call.reason or "unknown")
+            with stage("wait"):
+                time.sleep(delay)
 
     def close(self) -> None:
         if self._owns_client and not self._client.is_closed:
@@ -94,15 +242,25 @@ class HttpClient:
 class AsyncHttpClient:
     """Asynchronous JSON HTTP client over :class:`httpx.AsyncClient`."""
 
-    def __init__(self, *, settings: Settings | None = None, client: httpx.AsyncClient | None = None) -> None:
-        self.settings = settings or default_settings
+    def __init__(
+        self,
+        *,
+        settings: Settings | None = None,
+        client: httpx.AsyncClient | None = None,
+        metrics: Metrics | None = None,
+    ) -> None:
+        self.settings = settings or get_settings()
         if client is None:
-            transport = httpx.AsyncHTTPTransport(retries=self.settings.max_retries, verify=self.settings.verify_ssl)
+            transport = httpx.AsyncHTTPTransport(
+                retries=self.settings.max_retries,
+                verify=self.settings.verify_ssl,
+                limits=_build_limits(self.settings),
+                http2=_check_http2(self.settings),
+            )
             client = httpx.AsyncClient(
                 base_url=str(self.settings.base_url).rstrip("/"),
-                timeout=self.settings.timeout,
-                headers=self.settings.headers(),
-                limits=_build_limits(),
+                timeout=_build_timeout(self.settings),
+                headers=_build_headers(self.settings),
                 transport=transport,
                 follow_redirects=True,
             )
@@ -110,20 +268,70 @@ class AsyncHttpClient:
         else:
             self._owns_client = False
         self._client = client
+        self.codec = get_codec(self.settings.json_codec)
+        self.rate_limiter = RateLimiter.from_settings(self.settings)
+        self.retry_policy = RetryPolicy.from_settings(self.settings)
+        self.metrics = metrics or Metrics.from_settings(self.settings)
 
     @property
     def client(self) -> httpx.AsyncClient:
         return self._client
 
-    async def get_json(self, path: str, *, params: dict[str, Any] | None = None) -> Any:
-        response = await self._client.get(path, params=params)
-        _raise_for_response(response)
-        return _decode_json(response)
+    async def get_json(
+        self, path: str, *, params: dict[str, Any] | None = None, retries: int | None = None
+    ) -> Any:
+        return await self._request("GET", path, idempotent=True, retries=retries, params=params)
+
+    async def post_json(
+        self,
+        path: str,
+        *,
+        json_body: dict[str, Any],
+        idempotent: bool = False,
+        retries: int | None = None,
+    ) -> Any:
+        """POST ``json_body``. Transient failures are retried only if ``idempotent``."""
+        content = self.codec.dumps(json_body)
+        return await self._request(
+            "POST",
+            path,
+            idempotent=idempotent,
+            retries=retries,
+            content=content,
+            headers=_JSON_HEADERS,
+        )
 
-    async def post_json(self, path: str, *, json_body: dict[str, Any]) -> Any:
-        response = await self._client.post(path, json=json_body)
-        _raise_for_response(response)
-        return _decode_json(response)
+    async def _request(
+        self, method: str, path: str, *, idempotent: bool, retries: int | None, **kwargs: Any
+    ) -> Any:
+        call = self.retry_policy.call(idempotent=idempotent, retries=retries)
+        metrics = self.metrics
+        while True:
+            if self.rate_limiter is not None:
+                with stage("wait"):
+                    await self.rate_limiter.aacquire()
+            started = time.perf_counter()
+            try:
+                response = await self._client.request(method, path, **kwargs)
+            except httpx.TransportError as exc:
+                if metrics is not None:
+                    _observe(metrics, method, path, started, kwargs.get("content"), exc)
+                delay = call.delay_for_error(exc)
+                if delay is None:
+                    raise
+            else:
+                if metrics is not None:
+                    _observe(metrics, method, path, started, kwargs.get("content"), response)
+                await _arecord_outcome(self.rate_limiter, response)
+                delay = call.delay_for_response(response)
+                if delay is None:
+                    _raise_for_response(response)
+                    with stage("decode"):
+                        return _decode_json(response, self.codec)
+            if metrics is not None:
+                metrics.record_retry(endpoint=path, method=method, reason=call.reason or "unknown")
+            with stage("wait"):
+                await asyncio.sleep(delay)
 
     async def aclose(self) -> None:
         if self._owns_client and not self._client.is_closed:
@@ -0,0 +1,550 @@
+"""Offline query engine over a downloaded tercih kılavuzu snapshot.
+
+:class:`LocalAtlas` keeps every program in a local SQLite file, with indexed
+columns for each :class:`~yokatlas_py.models.SearchFilters` field. After a
+one-off :meth:`LocalAtlas.sync`, :meth:`LocalAtlas.search` serves the same
+``search(filters, page, size, sort_by, direction)`` contract as
+:class:`~yokatlas_py.client.YokAtlasClient` without touching the network.
+
+Later syncs are incremental: every row is fingerprinted by ``kilavuz_kodu``
+and a content hash, and only inserted, changed or removed rows are written.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Literal, overload
+
+from pydantic import BaseModel
+
+from ._cache import canonical_key
+from ._json import get_codec
+from ._lookup import LookupCache
+from .client import (
+    YokAtlasClient,
+    _coerce_code,
+    _coerce_filters,
+    _resolve_smart_fields,
+    _unique_codes,
+)
+from .config import Settings, get_settings
+from .models import (
+    City,
+    LazyProgram,
+    Program,
+    ProgramGroup,
+    SearchFilters,
+    SearchPage,
+    University,
+    _coerce_int,
+    parse_search_page,
+)
+
+_SCHEMA_VERSION = 2
+
+# (column, raw camelCase key, SQL type) for every indexed program field
+_INDEXED: tuple[tuple[str, str, str], ...] = (
+    ("kilavuz_kodu", "kilavuzKodu", "INTEGER PRIMARY KEY"),
+    ("puan_turu", "puanTuru", "TEXT"),
+    ("universite_id", "universiteId", "INTEGER"),
+    ("birim_grup_id", "birimGrupId", "INTEGER"),
+    ("il_kodu", "ilKodu", "INTEGER"),
+    ("birim_turu_id", "birimTuruId", "INTEGER"),
+    ("universite_turu", "universiteTuru", "TEXT"),
+    ("burs_orani_id", "bursOraniId", "INTEGER"),
+    ("ogrenim_turu_id", "ogrenimTuruId", "INTEGER"),
+    ("basari_sirasi", "basariSirasi", "INTEGER"),
+)
+_COLUMNS = tuple(column for column, _, _ in _INDEXED)
+_SORT_COLUMNS = {camel: column for column, camel, _ in _INDEXED}
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS programs (
+    {", ".join(f"{column} {sql_type}" for column, _, sql_type in _INDEXED)},
+    raw TEXT NOT NULL,
+    fingerprint TEXT NOT NULL
+);
+{"".join(f"CREATE INDEX IF NOT EXISTS ix_programs_{column} ON programs ({column});" for column in _COLUMNS[1:])}
+CREATE INDEX IF NOT EXISTS ix_programs_puan_turu_basari_sirasi ON programs (puan_turu, basari_sirasi);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS sync_pages (page INTEGER PRIMARY KEY, size INTEGER NOT NULL, fingerprint TEXT NOT NULL);
+"""
+_TABLES = ("programs", "meta", "sync_pages")
+
+_SORT_KEY = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+# SearchFilters.to_payload() key -> (column, SQL operator)
+_FILTER_SQL: dict[str, tuple[str, str]] = {
+    "puanTuru": ("puan_turu", "="),
+    "universiteId": ("universite_id", "IN"),
+    "birimGrupId": ("birim_grup_id", "IN"),
+    "ilKodu": ("il_kodu", "IN"),
+    "birimTuruId": ("birim_turu_id", "="),
+    "universiteTuru": ("universite_turu", "="),
+    "bursOraniId": ("burs_orani_id", "="),
+    "ogrenimTuruId": ("ogrenim_turu_id", "="),
+    "kilavuzKodu": ("kilavuz_kodu", "="),
+    "minBasariSirasi": ("basari_sirasi", ">="),
+    "maxBasariSirasi": ("basari_sirasi", "<="),
+}
+
+
+def _where(filters: SearchFilters) -> tuple[str, list[Any]]:
+    clauses: list[str] = []
+    params: list[Any] = []
+    for key, value in filters.to_payload().items():
+        if value is None or value == []:
+            continue
+        column, op = _FILTER_SQL[key]
+        if op == "IN":
+            clauses.append(f"{column} IN ({', '.join('?' * len(value))})")
+            params.extend(value)
+        else:
+            clauses.append(f"{column} {op} ?")
+            params.append(value)
+    return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+
+def _order_by(sort_by: str, direction: str) -> tuple[str, list[Any]]:
+    order = direction.upper()
+    if order not in ("ASC", "DESC"):
+        raise ValueError(f"direction must be 'ASC' or 'DESC' (got {direction!r})")
+    column = _SORT_COLUMNS.get(sort_by)
+    if column is not None:
+        expr, params = column, []
+    elif _SORT_KEY.match(sort_by):
+        expr, params = "json_extract(raw, ?)", [f"$.{sort_by}"]
+    else:
+        raise ValueError(f"Invalid sort_by {sort_by!r}")
+    # Nulls last in both directions; kılavuz kodu keeps paging stable on ties.
+    return f" ORDER BY ({expr}) IS NULL, {expr} {order}, kilavuz_kodu", params * 2
+
+
+def _row_values(row: dict[str, Any]) -> tuple[Any, ...]:
+    values: list[Any] = []
+    for column, camel, sql_type in _INDEXED:
+        value = row.get(camel)
+        if sql_type == "TEXT":
+            values.append(value.strip() if isinstance(value, str) else value)
+        else:
+            values.append(_coerce_int(value))
+    return tuple(values)
+
+
+def _chunks(codes: list[int], size: int = 500) -> Iterator[list[int]]:
+    """Split ``codes`` so ``IN (...)`` lists stay under SQLite's parameter limit."""
+    for start in range(0, len(codes), size):
+        yield codes[start : start + size]
+
+
+def _fingerprinted(content: list[dict[str, Any]]) -> list[tuple[dict[str, Any], int, str]]:
+    """``(row, kilavuz_kodu, content hash)`` for every row that has a kılavuz kodu."""
+    rows = []
+    for row in content:
+        code = _coerce_int(row.get("kilavuzKodu"))
+        if code is not None:
+            rows.append((row, code, canonical_key(row)))
+    return rows
+
+
+def _page_fingerprint(fingerprints: Iterable[tuple[int, str]]) -> str:
+    digest = hashlib.sha256()
+    for code, fingerprint in fingerprints:
+        digest.update(f"{code}:{fingerprint};".encode("ascii"))
+    return digest.hexdigest()
+
+
+class SyncChanges(BaseModel):
+    """Change feed of one :meth:`LocalAtlas.sync`: kılavuz kodları per kind of change.
+
+    ``complete`` is ``False`` when the crawl did not see every program the API
+    reported (a short page, or fewer rows than ``totalElements``); removals are
+    not applied in that case.
+    """
+
+    added: list[int] = []
+    changed: list[int] = []
+    removed: list[int] = []
+    unchanged: int = 0
+    pages: int = 0
+    pages_skipped: int = 0
+    total: int = 0
+    complete: bool = True
+
+    @property
+    def has_changes(self) -> bool:
+        return bool(self.added or self.changed or self.removed)
+
+
+class LocalAtlas:
+    """Search a local SQLite snapshot of the tercih kılavuzu.
+
+    The store at ``path`` is created on first use and filled by :meth:`sync`.
+    Smart filters (``universite``, ``program``, ``il``) resolve against lookup
+    tables saved with the snapshot. Instances are safe to share across threads.
+    """
+
+    def __init__(self, path: str | os.PathLike[str], *, settings: Settings | None = None) -> None:
+        self.path = Path(path)
+        self.settings = settings or get_settings()
+        self._codec = get_codec(self.settings.json_codec)
+        self._lock = threading.RLock()
+        self._lookups = LookupCache(ttl=0)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = self._open(self.path)
+        self._load_meta()
+
+    # ---- context management ------------------------------------------------
+
+    def __enter__(self) -> "LocalAtlas":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    # ---- snapshot ----------------------------------------------------------
+
+    @property
+    def synced_at(self) -> float | None:
+        """Unix time of the last completed :meth:`sync`, or ``None`` if never synced."""
+        return self._synced_at
+
+    def count(
+        self, filters: SearchFilters | dict[str, Any] | None = None, *, smart_search: bool = True
+    ) -> int:
+        """Number of stored programs matching ``filters``."""
+        where, params = _where(self._prepare_filters(filters, smart_search=smart_search))
+        with self._lock:
+            return int(
+                self._conn.execute(f"SELECT COUNT(*) FROM programs{where}", params).fetchone()[0]
+            )
+
+    def sync(
+        self, client: YokAtlasClient | None = None, *, size: int = 500, concurrency: int = 4
+    ) -> SyncChanges:
+        """Bring the store up to date with the API and return what changed.
+
+        Pages are crawled in ``kilavuzKodu`` order. A page whose fingerprint
+        matches the previous sync (same ``size``) is skipped as a whole;
+        otherwise each row's content hash is compared with the stored one and
+        only added or changed rows are written. Programs no longer served are
+        deleted, but only when the crawl saw as many programs as the API
+        reported; otherwise stored rows are kept and the result is marked
+        incomplete, since offset pagination over a changing upstream can skip
+        rows without failing. All writes happen in one transaction, so concurrent readers
+        see either the old or the new snapshot.
+        """
+        owned = client is None
+        client = client or YokAtlasClient(settings=self.settings)
+        try:
+            pages = list(
+                client._iter_raw_pages(
+                    SearchFilters(),
+                    size=size,
+                    sort_by="kilavuzKodu",
+                    direction="ASC",
+                    concurrency=concurrency,
+                    ordered=True,
+                )
+            )
+            lookups = {
+                "universities": [
+                    u.model_dump(mode="json", by_alias=True) for u in client.list_universities()
+                ],
+                "program_groups": [
+                    p.model_dump(mode="json", by_alias=True) for p in client.list_program_groups()
+                ],
+                "cities": [c.model_dump(mode="json", by_alias=True) for c in client.list_cities()],
+            }
+        finally:
+            if owned:
+                client.close()
+
+        changes = SyncChanges(pages=len(pages))
+        with self._lock, self._conn:
+            previous = {
+                page: fingerprint
+                for page, fingerprint in self._conn.execute(
+                    "SELECT page, fingerprint FROM sync_pages WHERE size = ?", (size,)
+                )
+            }
+            stored = {code for (code,) in self._conn.execute("SELECT kilavuz_kodu FROM programs")}
+            seen: set[int] = set()
+            page_rows: list[tuple[int, int, str]] = []
+            for number, raw in enumerate(pages):
+                rows = _fingerprinted(raw["content"])
+                fingerprint = _page_fingerprint((code, fp) for _, code, fp in rows)
+                page_rows.append((number, size, fingerprint))
+                seen.update(code for _, code, _ in rows)
+                if previous.get(number) == fingerprint:
+                    changes.pages_skipped += 1
+                    changes.unchanged += len(rows)
+                    continue
+                self._apply_page(rows, stored, changes)
+            expected = int(pages[0].get("totalElements") or 0) if pages else 0
+            short = any(len(raw["content"]) < size for raw in pages[:-1])
+            changes.complete = not short and len(seen) == expected
+            if changes.complete:
+                changes.removed = sorted(stored - seen)
+            for codes in _chunks(changes.removed):
+                self._conn.execute(
+                    f"DELETE FROM programs WHERE kilavuz_kodu IN ({', '.join('?' * len(codes))})",
+                    codes,
+                )
+            self._conn.execute("DELETE FROM sync_pages")
+            self._conn.executemany(
+                "INSERT INTO sync_pages (page, size, fingerprint) VALUES (?, ?, ?)", page_rows
+            )
+            yil = next((row.get("yil") for raw in pages for row in raw["content"]), None)
+            self._write_meta(self._conn, lookups=lookups, yil=yil)
+            changes.total = int(self._conn.execute("SELECT COUNT(*) FROM programs").fetchone()[0])
+            self._load_meta()
+        changes.added.sort()
+        changes.changed.sort()
+        return changes
+
+    # ---- queries -----------------------------------------------------------
+
+    @overload
+    def search(
+        self,
+        filters: SearchFilters | dict[str, Any] | None = None,
+        *,
+        page: int = 0,
+        size: int = 20,
+        sort_by: str = "basariSirasi",
+        direction: str = "ASC",
+        smart_search: bool = True,
+        lazy: Literal[False] = ...,
+    ) -> SearchPage[Program]: ...
+
+    @overload
+    def search(
+        self,
+        filters: SearchFilters | dict[str, Any] | None = None,
+        *,
+        page: int = 0,
+        size: int = 20,
+        sort_by: str = "basariSirasi",
+        direction: str = "ASC",
+        smart_search: bool = True,
+        lazy: Literal[True],
+    ) -> SearchPage[LazyProgram]: ...
+
+    def search(
+        self,
+        filters: SearchFilters | dict[str, Any] | None = None,
+        *,
+        page: int = 0,
+        size: int = 20,
+        sort_by: str = "basariSirasi",
+        direction: str = "ASC",
+        smart_search: bool = True,
+        lazy: bool = False,
+    ) -> SearchPage[Program] | SearchPage[LazyProgram]:
+        """Same contract as :meth:`YokAtlasClient.search`, served from the local store."""
+        if page < 0 or size < 1:
+            raise ValueError(f"page must be >= 0 and size >= 1 (got page={page}, size={size})")
+        f = self._prepare_filters(filters, smart_search=smart_search)
+        where, params = _where(f)
+        order, order_params = _order_by(sort_by, direction)
+        with self._lock:
+            total = int(
+                self._conn.execute(f"SELECT COUNT(*) FROM programs{where}", params).fetchone()[0]
+            )
+            rows = self._conn.execute(
+                f"SELECT raw FROM programs{where}{order} LIMIT ? OFFSET ?",
+                [*params, *order_params, size, page * size],
+            ).fetchall()
+        content = [self._codec.loads(raw) for (raw,) in rows]
+        total_pages = max(1, -(-total // size))
+        return parse_search_page(
+            {
+                "content": content,
+                "totalElements": total,
+                "totalPages": total_pages,
+                "size": size,
+                "number": page,
+                "first": page == 0,
+                "last": page >= total_pages - 1,
+                "numberOfElements": len(content),
+                "empty": not content,
+                "yil": self._yil,
+            },
+            lazy=lazy,
+        )
+
+    @overload
+    def iter_programs(
+        self,
+        filters: SearchFilters | dict[str, Any] | None = None,
+        *,
+        sort_by: str = "basariSirasi",
+        direction: str = "ASC",
+        smart_search: bool = True,
+        lazy: Literal[False] = ...,
+    ) -> Iterator[Program]: ...
+
+    @overload
+    def iter_programs(
+        self,
+        filters: SearchFilters | dict[str, Any] | None = None,
+        *,
+        sort_by: str = "basariSirasi",
+        direction: str = "ASC",
+        smart_search: bool = True,
+        lazy: Literal[True],
+    ) -> Iterator[LazyProgram]: ...
+
+    def iter_programs(
+        self,
+        filters: SearchFilters | dict[str, Any] | None = None,
+        *,
+        sort_by: str = "basariSirasi",
+        direction: str = "ASC",
+        smart_search: bool = True,
+        lazy: bool = False,
+    ) -> Iterator[Program] | Iterator[LazyProgram]:
+        """Yield every stored program matching ``filters`` in sort order."""
+        cls = LazyProgram if lazy else Program
+        for raw in self._iter_raw(
+            filters, sort_by=sort_by, direction=direction, smart_search=smart_search
+        ):
+            yield cls.model_validate(raw)
+
+    def get_program(self, kilavuz_kodu: int | str) -> Program | None:
+        """Return a stored program by its ÖSYM kılavuz kodu, or ``None`` if absent."""
+        code = _coerce_code(kilavuz_kodu)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT raw FROM programs WHERE kilavuz_kodu = ?", (code,)
+            ).fetchone()
+        return Program.model_validate(self._codec.loads(row[0])) if row else None
+
+    def get_programs(self, codes: Iterable[int | str]) -> dict[int, Program | None]:
+        """Like :meth:`YokAtlasClient.get_programs`, answered with one query per 500 codes."""
+        unique = _unique_codes(codes)
+        found: dict[int, Program | None] = {}
+        with self._lock:
+            for chunk in _chunks(unique):
+                query = f"SELECT kilavuz_kodu, raw FROM programs WHERE kilavuz_kodu IN ({', '.join('?' * len(chunk))})"
+                for code, raw in self._conn.execute(query, chunk).fetchall():
+                    found[code] = Program.model_validate(self._codec.loads(raw))
+        return {code: found.get(code) for code in unique}
+
+    def list_universities(self) -> list[University]:
+        return self._lookups.universities
+
+    def list_program_groups(self) -> list[ProgramGroup]:
+        return self._lookups.program_groups
+
+    def list_cities(self) -> list[City]:
+        return self._lookups.cities
+
+    # ---- internals ---------------------------------------------------------
+
+    @staticmethod
+    def _open(path: Path) -> sqlite3.Connection:
+        conn = sqlite3.connect(path, check_same_thread=False)
+        version = None
+        if conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'meta'"
+        ).fetchone():
+            row = conn.execute("SELECT value FROM meta WHERE key = 'schema_version'").fetchone()
+            version = int(row[0]) if row else None
+        if version is not None and version != _SCHEMA_VERSION:
+            # Written by another yokatlas-py version: start over, the next sync() refills it.
+            with conn:
+                for table in _TABLES:
+                    conn.execute(f"DROP TABLE IF EXISTS {table}")
+        conn.executescript(_SCHEMA)
+        return conn
+
+    def _load_meta(self) -> None:
+        meta = dict(self._conn.execute("SELECT key, value FROM meta").fetchall())
+        self._synced_at = float(meta["synced_at"]) if "synced_at" in meta else None
+        self._yil = int(meta["yil"]) if meta.get("yil") else None
+        lookups = self._codec.loads(meta["lookups"]) if "lookups" in meta else {}
+        self._lookups.populate(
+            universities=lookups.get("universities", []),
+            program_groups=lookups.get("program_groups", []),
+            cities=lookups.get("cities", []),
+            persist=False,
+        )
+
+    def _apply_page(
+        self, rows: list[tuple[dict[str, Any], int, str]], stored: set[int], changes: SyncChanges
+    ) -> None:
+        """Upsert the added/changed rows of one page and record them in ``changes``."""
+        existing: dict[int, str] = {}
+        for codes in _chunks([code for _, code, _ in rows]):
+            query = f"SELECT kilavuz_kodu, fingerprint FROM programs WHERE kilavuz_kodu IN ({', '.join('?' * len(codes))})"
+            existing.update(self._conn.execute(query, codes).fetchall())
+        dirty: list[tuple[dict[str, Any], str]] = []
+        for row, code, fingerprint in rows:
+            if existing.get(code) == fingerprint:
+                changes.unchanged += 1
+                continue
+            (changes.changed if code in stored else changes.added).append(code)
+            stored.add(code)
+            dirty.append((row, fingerprint))
+        self._write_rows(self._conn, dirty)
+
+    def _write_rows(
+        self, conn: sqlite3.Connection, rows: Iterable[tuple[dict[str, Any], str]]
+    ) -> None:
+        placeholders = ", ".join("?" * (len(_COLUMNS) + 2))
+        conn.executemany(
+            f"INSERT OR REPLACE INTO programs ({', '.join(_COLUMNS)}, raw, fingerprint) VALUES ({placeholders})",
+            (
+                (*_row_values(row), self._codec.dumps(row).decode("utf-8"), fingerprint)
+                for row, fingerprint in rows
+            ),
+        )
+
+    def _write_meta(self, conn: sqlite3.Connection, *, lookups: dict[str, Any], yil: Any) -> None:
+        meta = {
+            "schema_version": str(_SCHEMA_VERSION),
+            "synced_at": repr(time.time()),
+            "yil": "" if yil is None else str(yil),
+            "lookups": self._codec.dumps(lookups).decode("utf-8"),
+        }
+        conn.executemany("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", meta.items())
+
+    def _prepare_filters(
+        self, filters: SearchFilters | dict[str, Any] | None, *, smart_search: bool
+    ) -> SearchFilters:
+        f = _coerce_filters(filters)
+        if smart_search and any((f.universite, f.program, f.il)):
+            f = _resolve_smart_fields(f, self._lookups)
+        return f
+
+    def _iter_raw(
+        self,
+        filters: SearchFilters | dict[str, Any] | None,
+        *,
+        sort_by: str,
+        direction: str,
+        smart_search: bool,
+    ) -> Iterator[Any]:
+        where, params = _where(self._prepare_filters(filters, smart_search=smart_search))
+        order, order_params = _order_by(sort_by, direction)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT raw FROM programs{where}{order}", [*params, *order_params]
+            ).fetchall()
+        for (raw,) in rows:
+            yield self._codec.loads(raw)
+
+
+__all__ = ["LocalAtlas", "SyncChanges"]
@@ -0,0 +1,404 @@
+"""Opt-in client instrumentation: request metrics, per-call stage timings, Prometheus export.
+
+Enable with ``Settings.metrics`` (or pass a :class:`Metrics` to ``HttpClient``)
+and read ``client.metrics``. When disabled the clients hold ``None`` and each
+instrumented step costs one context-variable read.
+
+A *call* is one public client method (``search``, ``search_all``,
+``get_programs``, ...). Its wall time is split into stages:
+
+``coerce`` → ``resolve`` → ``build`` → ``wait`` → ``http`` → ``decode`` → ``validate``
+
+``wait`` is time spent in the rate limiter and retry backoff. Stages of
+concurrent page fetches are summed, so a fanned-out call can report more
+stage time than wall time. Nested calls (``get_programs`` → ``get_program``)
+fold into the outermost one.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from contextvars import ContextVar
+from typing import Any, Callable, Iterator
+
+from pydantic import BaseModel
+
+from .config import Settings
+
+DEFAULT_BUCKETS: tuple[float, ...] = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+STAGES: tuple[str, ...] = ("coerce", "resolve", "build", "wait", "http", "decode", "validate")
+
+
+class CallTiming(BaseModel):
+    """Stage breakdown of one public client call, passed to :meth:`Metrics.add_hook` hooks."""
+
+    operation: str
+    seconds: float
+    stages: dict[str, float]
+
+
+class RequestEvent(BaseModel):
+    """One HTTP attempt, passed to :meth:`Metrics.add_hook` hooks.
+
+    ``status`` is the HTTP status code, or the exception name for transport errors.
+    """
+
+    endpoint: str
+    method: str
+    status: str
+    seconds: float
+    sent_bytes: int
+    received_bytes: int
+
+
+class EndpointStats(BaseModel):
+    """Aggregated HTTP attempts for one ``(endpoint, method)`` pair."""
+
+    endpoint: str
+    method: str
+    requests: int = 0
+    statuses: dict[str, int] = {}
+    seconds: float = 0.0
+    sent_bytes: int = 0
+    received_bytes: int = 0
+    retries: dict[str, int] = {}
+
+
+class StageStats(BaseModel):
+    """Total time spent in one stage of one operation."""
+
+    operation: str
+    stage: str
+    count: int
+    seconds: float
+
+
+class MetricsSnapshot(BaseModel):
+    """Point-in-time copy of a :class:`Metrics` registry.
+
+    ``calls`` counts public calls per operation; ``cache`` maps a cache name
+    (``"response"``, ``"lookup"``) to ``{"hit": n, "miss": n}``.
+    """
+
+    endpoints: list[EndpointStats]
+    stages: list[StageStats]
+    calls: dict[str, int]
+    cache: dict[str, dict[str, int]]
+
+
+class _Histogram:
+    """Fixed-bucket histogram; ``counts[i]`` holds observations ``<= buckets[i]`` (last slot: ``+Inf``)."""
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: tuple[float, ...]) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class CallTrace:
+    """Stage timings accumulated for the call currently in progress."""
+
+    __slots__ = ("operation", "stages", "_lock")
+
+    def __init__(self, operation: str) -> None:
+        self.operation = operation
+        self.stages: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def add(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+
+    def stage(self, name: str) -> "_StageTimer":
+        return _StageTimer(self, name)
+
+
+class _StageTimer:
+    __slots__ = ("trace", "name", "start")
+
+    def __init__(self, trace: CallTrace, name: str) -> None:
+        self.trace = trace
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self) -> None:
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.trace.add(self.name, time.perf_counter() - self.start)
+
+
+_current: ContextVar[CallTrace | None] = ContextVar("yokatlas_trace", default=None)
+_DISABLED: AbstractContextManager[Any] = nullcontext()
+
+
+def stage(name: str) -> AbstractContextManager[Any]:
+    """Time the enclosed block as stage ``name`` of the current call (no-op outside a traced call)."""
+    trace = _current.get()
+    return _DISABLED if trace is None else _StageTimer(trace, name)
+
+
+def trace_call(metrics: "Metrics | None", operation: str) -> AbstractContextManager[Any]:
+    """``metrics.trace(operation)``, or a no-op when metrics are disabled."""
+    return _DISABLED if metrics is None else metrics.trace(operation)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels: str) -> str:
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items()) + "}"
+
+
+def _number(value: float) -> str:
+    return str(value) if isinstance(value, int) else repr(float(value))
+
+
+class Metrics:
+    """Thread-safe in-process metrics registry shared by an HTTP client and its high-level client.
+
+    Records, per endpoint: attempts by status, a latency histogram, bytes sent
+    and received, and retries by reason. It also records cache hits and
+    misses, and a stage histogram for every traced call. Hooks registered with
+    :meth:`add_hook` receive each :class:`RequestEvent` and :class:`CallTiming`
+    as they happen, e.g. to forward them to StatsD or OpenTelemetry.
+    """
+
+    def __init__(self, *, buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        self._hooks: list[Callable[[CallTiming | RequestEvent], None]] = []
+        self.reset()
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "Metrics | None":
+        """A registry when ``settings.metrics`` is on, else ``None``."""
+        return cls() if settings.metrics else None
+
+    def reset(self) -> None:
+        """Drop every recorded value (hooks are kept)."""
+        with self._lock:
+            self._endpoints: dict[tuple[str, str], EndpointStats] = {}
+            self._latency: dict[tuple[str, str], _Histogram] = {}
+            self._calls: dict[str, _Histogram] = {}
+            self._stages: dict[tuple[str, str], _Histogram] = {}
+            self._cache: Counter[tuple[str, str]] = Counter()
+
+    def add_hook(self, hook: Callable[[CallTiming | RequestEvent], None]) -> None:
+        self._hooks.append(hook)
+
+    def remove_hook(self, hook: Callable[[CallTiming | RequestEvent], None]) -> None:
+        self._hooks.remove(hook)
+
+    # ---- recording ---------------------------------------------------------
+
+    @contextmanager
+    def trace(self, operation: str) -> Iterator[CallTrace]:
+        """Trace one call; stages recorded via :func:`stage` inside the block are attributed to it."""
+        outer = _current.get()
+        if outer is not None:
+            yield outer
+            return
+        trace = CallTrace(operation)
+        token = _current.set(trace)
+        start = time.perf_counter()
+        try:
+            yield trace
+        finally:
+            _current.reset(token)
+            self._finish(trace, time.perf_counter() - start)
+
+    def observe_request(
+        self,
+        *,
+        endpoint: str,
+        method: str,
+        status: str,
+        seconds: float,
+        sent_bytes: int,
+        received_bytes: int,
+    ) -> None:
+        """Record one HTTP attempt; also counted as the current call's ``http`` stage."""
+        trace = _current.get()
+        if trace is not None:
+            trace.add("http", seconds)
+        key = (endpoint, method)
+        with self._lock:
+            stats = self._endpoints.get(key)
+            if stats is None:
+                stats = self._endpoints[key] = EndpointStats(endpoint=endpoint, method=method)
+                self._latency[key] = _Histogram(self.buckets)
+            stats.requests += 1
+            stats.statuses[status] = stats.statuses.get(status, 0) + 1
+            stats.seconds += seconds
+            stats.sent_bytes += sent_bytes
+            stats.received_bytes += received_bytes
+            self._latency[key].observe(seconds)
+        if self._hooks:
+            event = RequestEvent(
+                endpoint=endpoint,
+                method=method,
+                status=status,
+                seconds=seconds,
+                sent_bytes=sent_bytes,
+                received_bytes=received_bytes,
+            )
+            for hook in self._hooks:
+                hook(event)
+
+    def record_retry(self, *, endpoint: str, method: str, reason: str) -> None:
+        with self._lock:
+            stats = self._endpoints.get((endpoint, method))
+            if stats is not None:
+                stats.retries[reason] = stats.retries.get(reason, 0) + 1
+
+    def record_cache(self, cache: str, *, hit: bool) -> None:
+        with self._lock:
+            self._cache[(cache, "hit" if hit else "miss")] += 1
+
+    def _finish(self, trace: CallTrace, seconds: float) -> None:
+        with self._lock:
+            calls = self._calls.get(trace.operation)
+            if calls is None:
+                calls = self._calls[trace.operation] = _Histogram(self.buckets)
+            calls.observe(seconds)
+            for name, spent in trace.stages.items():
+                key = (trace.operation, name)
+                hist = self._stages.get(key)
+                if hist is None:
+                    hist = self._stages[key] = _Histogram(self.buckets)
+                hist.observe(spent)
+        if self._hooks:
+            timing = CallTiming(
+                operation=trace.operation, seconds=seconds, stages=dict(trace.stages)
+            )
+            for hook in self._hooks:
+                hook(timing)
+
+    # ---- reading -----------------------------------------------------------
+
+    def snapshot(self) -> MetricsSnapshot:
+        with self._lock:
+            endpoints = [stats.model_copy(deep=True) for stats in self._endpoints.values()]
+            stages = [
+                StageStats(operation=op, stage=name, count=hist.count, seconds=hist.sum)
+                for (op, name), hist in self._stages.items()
+            ]
+            calls = {op: hist.count for op, hist in self._calls.items()}
+            cache: dict[str, dict[str, int]] = {}
+            for (name, result), count in self._cache.items():
+                cache.setdefault(name, {"hit": 0, "miss": 0})[result] = count
+        return MetricsSnapshot(endpoints=endpoints, stages=stages, calls=calls, cache=cache)
+
+    def to_prometheus(self) -> str:
+        """Render every metric in the Prometheus text exposition format (version 0.0.4)."""
+        lines: list[str] = []
+
+        def header(name: str, kind: str, help_text: str) -> None:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        def histogram(name: str, hist: _Histogram, labels: dict[str, str]) -> None:
+            cumulative = 0
+            for le, count in zip([*map(_number, hist.buckets), "+Inf"], hist.counts):
+                cumulative += count
+                lines.append(f"{name}_bucket{_labels(**labels, le=le)} {cumulative}")
+            lines.append(f"{name}_sum{_labels(**labels)} {_number(hist.sum)}")
+            lines.append(f"{name}_count{_labels(**labels)} {hist.count}")
+
+        with self._lock:
+            endpoints = list(self._endpoints.items())
+            header(
+                "yokatlas_requests_total",
+                "counter",
+                "HTTP attempts by endpoint, method and status.",
+            )
+            for (endpoint, method), stats in endpoints:
+                for status, count in sorted(stats.statuses.items()):
+                    lines.append(
+                        f"yokatlas_requests_total{_labels(endpoint=endpoint, method=method, status=status)} {count}"
+                    )
+            header("yokatlas_request_duration_seconds", "histogram", "HTTP attempt latency.")
+            for key, hist in self._latency.items():
+                histogram(
+                    "yokatlas_request_duration_seconds",
+                    hist,
+                    {"endpoint": key[0], "method": key[1]},
+                )
+            header("yokatlas_request_sent_bytes_total", "counter", "Request body bytes sent.")
+            for (endpoint, method), stats in endpoints:
+                lines.append(
+                    f"yokatlas_request_sent_bytes_total{_labels(endpoint=endpoint, method=method)} {stats.sent_bytes}"
+                )
+            header(
+                "yokatlas_response_received_bytes_total",
+                "counter",
+                "Response bytes received on the wire.",
+            )
+            for (endpoint, method), stats in endpoints:
+                lines.append(
+                    f"yokatlas_response_received_bytes_total{_labels(endpoint=endpoint, method=method)} {stats.received_bytes}"
+                )
+            header("yokatlas_retries_total", "counter", "Retried HTTP attempts by reason.")
+            for (endpoint, method), stats in endpoints:
+                for reason, count in sorted(stats.retries.items()):
+                    lines.append(
+                        f"yokatlas_retries_total{_labels(endpoint=endpoint, method=method, reason=reason)} {count}"
+                    )
+            header("yokatlas_cache_requests_total", "counter", "Cache lookups by cache and result.")
+            for (name, result), count in sorted(self._cache.items()):
+                lines.append(
+                    f"yokatlas_cache_requests_total{_labels(cache=name, result=result)} {count}"
+                )
+            header(
+                "yokatlas_call_duration_seconds", "histogram", "Wall time of public client calls."
+            )
+            for op, hist in self._calls.items():
+                histogram("yokatlas_call_duration_seconds", hist, {"operation": op})
+            header(
+                "yokatlas_stage_duration_seconds", "histogram", "Time per call spent in each stage."
+            )
+            for (op, name), hist in self._stages.items():
+                histogram("yokatlas_stage_duration_seconds", hist, {"operation": op, "stage": name})
+        return "\n".join(lines) + "\n"
+
+
+__all__ = [
+    "DEFAULT_BUCKETS",
+    "STAGES",
+    "CallTiming",
+    "CallTrace",
+    "EndpointStats",
+    "Metrics",
+    "MetricsSnapshot",
+    "RequestEvent",
+    "StageStats",
+    "stage",
+    "trace_call",
+]
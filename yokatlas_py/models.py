@@ -2,9 +2,11 @@
 
 from __future__ import annotations
 
-from typing import Any, Generic, Literal, TypeVar
+from functools import cache, cached_property
+from typing import Any, Callable, Generic, Literal, TypeVar
 
-from pydantic import BaseModel, ConfigDict, Field, model_validator
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr, TypeAdapter, model_validator
+from pydantic_core.core_schema import ValidatorFunctionWrapHandler
 
 from ._serialization import to_camel
 
@@ -91,6 +93,8 @@ _FLAT_TO_YEARLY = {
 
 
 def _coerce_int(value: Any) -> int | None:
+    if type(value) is int:
+        return value
     if value is None or value == "":
         return None
     try:
@@ -103,6 +107,8 @@ def _coerce_int(value: Any) -> int | None:
 
 
 def _coerce_float(value: Any) -> float | None:
+    if type(value) is float:
+        return value
     if value is None or value == "":
         return None
     try:
@@ -128,25 +134,91 @@ _YEARLY_FIELD_TYPES = {
 }
 
 
-def _build_yearly_stats(data: dict[str, Any], suffix: str, year: int) -> YearlyStats:
-    raw: dict[str, Any] = {"year": year}
-    for camel, snake in _FLAT_TO_YEARLY.items():
-        key_camel = f"{camel}{suffix}"
-        key_snake = f"{snake}{('_' + suffix) if suffix else ''}"
-        if key_camel in data:
-            raw[snake] = _YEARLY_FIELD_TYPES[snake](data[key_camel])
-        elif key_snake in data:
-            raw[snake] = _YEARLY_FIELD_TYPES[snake](data[key_snake])
-    return YearlyStats.model_validate(raw)
+def _make_constructor(cls: type[BaseModel]) -> Callable[..., Any]:
+    """Return a faster ``cls.model_construct(**values)`` for already-coerced values.
 
+    ``model_construct`` resolves every field default on each call; here the
+    defaults are resolved once into a template (in field order) and instances
+    are assembled the same way ``model_construct`` does. Missing required
+    fields are left as ``None``.
+    """
+    template: dict[str, Any] = {}
+    factories: dict[str, Callable[[], Any]] = {}
+    for name, field in cls.model_fields.items():
+        if field.default_factory is not None:
+            factories[name] = field.default_factory  # type: ignore[assignment]
+            template[name] = None
+        else:
+            template[name] = None if field.is_required() else field.default
+    new = cls.__new__
+    setattr_ = object.__setattr__
+
+    def construct(values: dict[str, Any], private: dict[str, Any] | None = None) -> Any:
+        obj = new(cls)
+        data = template.copy()
+        data.update(values)
+        for name, factory in factories.items():
+            if name not in values:
+                data[name] = factory()
+        setattr_(obj, "__dict__", data)
+        setattr_(obj, "__pydantic_fields_set__", set(values))
+        setattr_(obj, "__pydantic_extra__", None)
+        setattr_(obj, "__pydantic_private__", private)
+        return obj
+
+    return construct
+
+
+_construct_yearly = _make_constructor(YearlyStats)
+
+_YEAR_OFFSETS = (0, 1, 2, 3)
+_MISSING: Any = object()
+
+# Per year offset: (field, camelCase key, snake_case key, coercer) for every metric,
+# e.g. offset 2 → ("min_puan", "minPuan2", "min_puan_2", _coerce_float).
+_YEARLY_KEYS: tuple[tuple[tuple[str, str, str, Callable[[Any], Any]], ...], ...] = tuple(
+    tuple(
+        (
+            snake,
+            f"{camel}{offset or ''}",
+            f"{snake}_{offset}" if offset else snake,
+            _YEARLY_FIELD_TYPES[snake],
+        )
+        for camel, snake in _FLAT_TO_YEARLY.items()
+    )
+    for offset in _YEAR_OFFSETS
+)
+
+
+def _build_yearly_stats(data: dict[str, Any], offset: int, year: int) -> YearlyStats:
+    values: dict[str, Any] = {"year": year}
+    for snake, key_camel, key_snake, coerce in _YEARLY_KEYS[offset]:
+        value = data.get(key_camel, _MISSING)
+        if value is _MISSING:
+            value = data.get(key_snake, _MISSING)
+            if value is _MISSING:
+                continue
+        values[snake] = coerce(value)
+    # Every value is already coerced to int/float/None, so validation would be a no-op.
+    return _construct_yearly(values)  # type: ignore[no-any-return]
+
+
+def _current_year(data: dict[str, Any]) -> int:
+    year = data.get("yil") or data.get("year") or 0
+    try:
+        return int(year)
+    except (TypeError, ValueError):
+        return 0
 
-class Program(BaseModel):
-    """A single program entry returned by the search endpoint.
 
-    Yearly statistics (kontenjan, kadro, min puan, başarı sırası, KPSS) are
-    grouped into :attr:`current` and :attr:`history` (3 previous years,
-    newest → oldest).
-    """
+def _build_history(data: dict[str, Any], current_year: int) -> list[YearlyStats]:
+    return [
+        _build_yearly_stats(data, offset, current_year - offset) for offset in _YEAR_OFFSETS[1:]
+    ]
+
+
+class _ProgramFields(BaseModel):
+    """Scalar fields shared by :class:`Program` and :class:`LazyProgram`."""
 
     model_config = _model_config()
 
@@ -199,6 +271,15 @@ class Program(BaseModel):
     ilce_adi: str | None = None
     universite_turu: Literal["DEVLET", "VAKIF"]
 
+
+class Program(_ProgramFields):
+    """A single program entry returned by the search endpoint.
+
+    Yearly statistics (kontenjan, kadro, min puan, başarı sırası, KPSS) are
+    grouped into :attr:`current` and :attr:`history` (3 previous years,
+    newest → oldest).
+    """
+
     # Yearly snapshots
     current: YearlyStats
     history: list[YearlyStats] = Field(default_factory=list)
@@ -211,19 +292,10 @@ class Program(BaseModel):
         if "current" in data and "history" in data:
             return data  # already structured
 
-        current_year = data.get("yil") or data.get("year") or 0
-        try:
-            current_year = int(current_year)
-        except (TypeError, ValueError):
-            current_year = 0
-
+        current_year = _current_year(data)
         data = dict(data)
-        data["current"] = _build_yearly_stats(data, "", current_year)
-        history: list[YearlyStats] = []
-        for offset in (1, 2, 3):
-            stats = _build_yearly_stats(data, str(offset), current_year - offset)
-            history.append(stats)
-        data["history"] = history
+        data["current"] = _build_yearly_stats(data, 0, current_year)
+        data["history"] = _build_history(data, current_year)
         return data
 
     @property
@@ -232,6 +304,54 @@ class Program(BaseModel):
         return [self.current, *self.history]
 
 
+class LazyProgram(_ProgramFields):
+    """A :class:`Program` whose yearly statistics are built on first access.
+
+    Only the scalar fields are validated up front; :attr:`current`,
+    :attr:`history` and :attr:`all_years` are derived from the raw row the
+    first time they are read. Returned by ``search(..., lazy=True)``. Because
+    the yearly data are not model fields, :meth:`model_dump` omits them; use
+    :meth:`to_program` for a fully materialized :class:`Program`.
+    """
+
+    _raw: dict[str, Any] = PrivateAttr(default_factory=dict)
+
+    @model_validator(mode="wrap")
+    @classmethod
+    def _keep_raw(cls, data: Any, handler: ValidatorFunctionWrapHandler) -> Any:
+        obj = handler(data)
+        if isinstance(data, dict):
+            obj._raw = data
+        return obj
+
+    @cached_property
+    def current(self) -> YearlyStats:
+        if self._structured:
+            return YearlyStats.model_validate(self._raw["current"])
+        return _build_yearly_stats(self._raw, 0, _current_year(self._raw))
+
+    @cached_property
+    def history(self) -> list[YearlyStats]:
+        if self._structured:
+            return [YearlyStats.model_validate(year) for year in self._raw["history"]]
+        return _build_history(self._raw, _current_year(self._raw))
+
+    @property
+    def _structured(self) -> bool:
+        # Same check as Program._group_yearly: e.g. the output of Program.model_dump().
+        return "current" in self._raw and "history" in self._raw
+
+    @property
+    def all_years(self) -> list[YearlyStats]:
+        """Current year first, followed by historical years (newest → oldest)."""
+        return [self.current, *self.history]
+
+    def to_program(self) -> Program:
+        return Program.model_validate(
+            {**self.model_dump(), "current": self.current, "history": self.history}
+        )
+
+
 # ---------------------------------------------------------------------------
 # Spring-style Page<T> wrapper
 # ---------------------------------------------------------------------------
@@ -253,6 +373,34 @@ class SearchPage(BaseModel, Generic[T]):
     empty: bool
     yil: int | None = None
 
+    def to_columns(self, *, format: Literal["python", "numpy", "arrow"] = "python") -> Any:
+        """Column-oriented view of :attr:`content`; see :func:`yokatlas_py.columns.programs_to_columns`."""
+        from .columns import programs_to_columns
+
+        return programs_to_columns(self.content, format=format)  # type: ignore[arg-type]
+
+
+# ---------------------------------------------------------------------------
+# Fast page parsing
+# ---------------------------------------------------------------------------
+
+
+@cache
+def _page_adapter(lazy: bool) -> TypeAdapter[Any]:
+    return TypeAdapter(SearchPage[LazyProgram] if lazy else SearchPage[Program])
+
+
+def parse_search_page(
+    raw: Any, *, lazy: bool = False
+) -> SearchPage[Program] | SearchPage[LazyProgram]:
+    """Validate a raw search response into ``SearchPage[Program]`` (or ``[LazyProgram]``).
+
+    Equivalent to ``SearchPage[Program].model_validate(raw)``, through a
+    cached :class:`~pydantic.TypeAdapter` so the generic specialization is
+    looked up once.
+    """
+    return _page_adapter(lazy).validate_python(raw)  # type: ignore[no-any-return]
+
 
 # ---------------------------------------------------------------------------
 # Filters
@@ -328,6 +476,7 @@ class SearchFilters(BaseModel):
 
 __all__ = [
     "City",
+    "LazyProgram",
     "Program",
     "ProgramGroup",
     "PuanTuru",
@@ -0,0 +1,191 @@
+"""Query planner: split a broad search into disjoint sub-queries of bounded size.
+
+Deep pagination through a broad search is slow and fragile: every page is a
+fresh sorted query upstream, and a failure midway loses the position.
+:meth:`YokAtlasClient.plan_query <yokatlas_py.client.YokAtlasClient.plan_query>`
+instead probes ``total_elements`` with a one-row request and bisects the
+filters until every sub-query fits in ``max_rows`` rows, trying in turn
+
+1. ``puan_turu`` (one sub-query per puan türü, when unset),
+2. ``min_basari_sirasi`` / ``max_basari_sirasi`` rank bands (bisected),
+3. ``il_kodu`` (the city list bisected).
+
+A split is only taken when its children's totals add up to the parent's, so
+rows the split cannot reach (e.g. programs without a başarı sırası fall
+outside every rank band) are never lost; a query that cannot be split
+losslessly stays whole and is paged as usual.
+
+The planner is written without I/O: :func:`plan_steps` yields batches of
+filters to probe and receives their :class:`Probe` results, so the sync and
+async clients share it. :func:`merge_sorted` merges the sub-query results
+back into the requested ``sort_by`` order.
+"""
+
+from __future__ import annotations
+
+import heapq
+from typing import Any, Callable, Generator, Iterator, NamedTuple, Sequence, TypeVar, get_args
+
+from pydantic import BaseModel
+
+from .models import PuanTuru, SearchFilters, _coerce_float, _coerce_int
+
+T = TypeVar("T")
+
+# A probe asks for one row, highest başarı sırası first, so its single row
+# also gives the upper bound for rank bands.
+PROBE_SORT_BY = "basariSirasi"
+PROBE_DIRECTION = "DESC"
+
+PlanSteps = Generator[list[SearchFilters], list["Probe"], "QueryPlan"]
+
+
+class Probe(NamedTuple):
+    """What a one-row probe tells about a query: its size and highest başarı sırası."""
+
+    total: int
+    max_rank: int | None
+
+    @classmethod
+    def from_raw(cls, raw: dict[str, Any]) -> Probe:
+        content = raw.get("content") or []
+        rank = _coerce_int(content[0].get("basariSirasi")) if content else None
+        return cls(int(raw.get("totalElements") or 0), rank)
+
+
+class PlannedQuery(BaseModel):
+    """One sub-query of a :class:`QueryPlan` and its probed size."""
+
+    filters: SearchFilters
+    total: int
+
+
+class QueryPlan(BaseModel):
+    """Disjoint sub-queries that together return exactly the rows of ``filters``.
+
+    Plans are plain models: they can be stored (``model_dump_json``) and
+    executed later, or sub-query by sub-query, with ``search_planned(plan=...)``.
+    """
+
+    filters: SearchFilters
+    total: int
+    max_rows: int
+    queries: list[PlannedQuery] = []
+    probes: int = 0
+
+    @property
+    def oversized(self) -> list[PlannedQuery]:
+        """Sub-queries still above ``max_rows`` because no lossless split was found."""
+        return [q for q in self.queries if q.total > self.max_rows]
+
+
+def _splits(
+    filters: SearchFilters, probe: Probe, il_kodlari: Sequence[int]
+) -> Iterator[list[SearchFilters]]:
+    """Candidate splits of ``filters``, in the order they are tried."""
+    if filters.puan_turu is None:
+        yield [filters.model_copy(update={"puan_turu": p}) for p in get_args(PuanTuru)]
+    lo = filters.min_basari_sirasi or 1
+    hi = filters.max_basari_sirasi or probe.max_rank
+    if hi is not None and lo < hi:
+        mid = (lo + hi) // 2
+        yield [
+            filters.model_copy(update={"min_basari_sirasi": lo, "max_basari_sirasi": mid}),
+            filters.model_copy(update={"min_basari_sirasi": mid + 1, "max_basari_sirasi": hi}),
+        ]
+    codes = filters.il_kodu or il_kodlari
+    if len(codes) > 1:
+        half = len(codes) // 2
+        yield [
+            filters.model_copy(update={"il_kodu": list(codes[:half])}),
+            filters.model_copy(update={"il_kodu": list(codes[half:])}),
+        ]
+
+
+def plan_steps(
+    filters: SearchFilters, *, max_rows: int, il_kodlari: Sequence[int] = ()
+) -> PlanSteps:
+    """Plan ``filters`` (already resolved), yielding each batch of filters to probe.
+
+    Send back one :class:`Probe` per yielded filter, in order; the generator
+    returns the finished :class:`QueryPlan`. ``il_kodlari`` is the city list
+    bisected when ``filters`` does not restrict ``il_kodu``.
+    """
+    if max_rows < 1:
+        raise ValueError(f"max_rows must be >= 1 (got {max_rows})")
+    (root,) = yield [filters]
+    probes = 1
+    queries: list[PlannedQuery] = []
+    stack = [(filters, root)]
+    while stack:
+        f, probe = stack.pop()
+        if probe.total <= max_rows:
+            if probe.total:
+                queries.append(PlannedQuery(filters=f, total=probe.total))
+            continue
+        for children in _splits(f, probe, il_kodlari):
+            results = yield children
+            probes += len(children)
+            if sum(r.total for r in results) == probe.total:
+                stack.extend(reversed(list(zip(children, results))))
+                break
+        else:
+            queries.append(PlannedQuery(filters=f, total=probe.total))
+    return QueryPlan(
+        filters=filters, total=root.total, max_rows=max_rows, queries=queries, probes=probes
+    )
+
+
+def run_plan(steps: PlanSteps, probe: Callable[[list[SearchFilters]], list[Probe]]) -> QueryPlan:
+    """Drive :func:`plan_steps` with a synchronous batch ``probe`` function."""
+    batch = next(steps)
+    while True:
+        try:
+            batch = steps.send(probe(batch))
+        except StopIteration as done:
+            return done.value  # type: ignore[no-any-return]
+
+
+def _sort_value(value: Any) -> tuple[int, Any] | None:
+    """Comparable form of a raw ``sort_by`` value; ``None`` when it is missing.
+
+    ``""`` counts as missing, as in :func:`~yokatlas_py.models._coerce_int`,
+    and numeric strings compare as numbers, so ``"10"`` sorts after ``"9"``.
+    Numbers order before any non-numeric text.
+    """
+    if value is None or value == "":
+        return None
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return (0, value)
+    number = _coerce_float(value)
+    if number is not None:
+        return (0, number)
+    return (1, str(value))
+
+
+def merge_sorted(
+    parts: Sequence[Sequence[tuple[dict[str, Any], T]]], *, sort_by: str, direction: str
+) -> list[T]:
+    """Merge per-sub-query ``(raw row, item)`` lists, each sorted by ``sort_by``, into one.
+
+    Rows are compared on the coerced ``sort_by`` value (see :func:`_sort_value`);
+    missing values sort last in both directions.
+    """
+    if direction.upper() == "DESC":
+
+        def key(pair: tuple[dict[str, Any], T]) -> tuple[int, Any]:
+            value = _sort_value(pair[0].get(sort_by))
+            return (0, (0, 0)) if value is None else (1, value)
+
+        merged = heapq.merge(*parts, key=key, reverse=True)
+    else:
+
+        def key(pair: tuple[dict[str, Any], T]) -> tuple[int, Any]:
+            value = _sort_value(pair[0].get(sort_by))
+            return (1, (0, 0)) if value is None else (0, value)
+
+        merged = heapq.merge(*parts, key=key)
+    return [item for _, item in merged]
+
+
+__all__ = ["PlannedQuery", "Probe", "QueryPlan", "merge_sorted", "plan_steps", "run_plan"]